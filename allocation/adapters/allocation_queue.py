@@ -0,0 +1,120 @@
+"""
+Очередь заявок на размещение товарных позиций в таблице AllocationTicketDB.
+Заявки создаются запросом POST /v1/allocate/queue и обрабатываются пакетами по материалу
+функцией services.allocate_queued, которую периодически вызывает команда process_allocation_queue.
+Заявки пакета, обработка которого завершилась ошибкой, обрабатываются повторно по одной,
+после MAX_ATTEMPTS неудачных попыток заявка получает состояние FAILED и больше не обрабатывается.
+"""
+import uuid
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db.models import F, Subquery
+from django.utils import timezone
+
+from allocation import models as django_models
+from allocation.domain import domain_logic
+from allocation.exceptions import exceptions
+
+
+PENDING = 'pending'
+ALLOCATED = 'allocated'
+OUT_OF_STOCK = 'out_of_stock'
+NOT_FOUND = 'not_found'
+FAILED = 'failed'
+
+# Наибольшее количество заявок в пакете
+QUEUE_BATCH_SIZE = 100
+# Количество неудачных попыток обработки заявки, после которого она получает состояние FAILED
+MAX_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class Ticket:
+    """Заявка на размещение товарной позиции."""
+    ticket: str
+    order_id: str
+    line_item: str
+    product_id: str
+    status: str = PENDING
+    # Идентификатор бухты, в которой размещена товарная позиция
+    reference: str = ''
+    attempts: int = 0
+
+
+def _record_to_ticket(record: django_models.AllocationTicketDB) -> Ticket:
+    return Ticket(str(record.ticket), record.order_id, record.line_item, record.product_id,
+                  record.status, record.reference, record.attempts)
+
+
+def enqueue(line: domain_logic.OrderLine) -> Ticket:
+    """Принимает экземпляр товарной позиции, создает заявку на ее размещение и возвращает ее."""
+    record = django_models.AllocationTicketDB.objects.create(order_id=line.order_id, line_item=line.line_item,
+                                                             product_id=line.product_id)
+    return _record_to_ticket(record)
+
+
+def get(ticket: str) -> Ticket:
+    """
+    Принимает идентификатор заявки, возвращает заявку.
+    Вызывает исключение при отсутствии заявки или некорректном идентификаторе.
+    """
+    try:
+        record = django_models.AllocationTicketDB.objects.get(ticket=uuid.UUID(ticket))
+    except (ValueError, django_models.AllocationTicketDB.DoesNotExist):
+        raise exceptions.AllocationTicketDoesNotExist(ticket)
+    return _record_to_ticket(record)
+
+
+def has_pending() -> bool:
+    """Возвращает True, если в очереди есть ожидающие заявки."""
+    return django_models.AllocationTicketDB.objects.filter(status=PENDING).exists()
+
+
+def claim_batch(limit: int) -> list[Ticket]:
+    """
+    Отбирает не более limit ожидающих заявок с материалом самой ранней ожидающей заявки
+    в порядке их создания и возвращает их.
+
+    Заявки отмечаются идентификатором пакета одним запросом UPDATE, поэтому при выполнении
+    в транзакции запрос сразу получает блокировку записи SQLite, и обработчики, работающие
+    одновременно, получают разные пакеты.
+
+    Если в пакет попала заявка с неудачными попытками обработки, возвращается только она,
+    поэтому заявка, обработка которой вызывает ошибку, не мешает обработке остальных заявок.
+    """
+    pending_records = django_models.AllocationTicketDB.objects.filter(status=PENDING)
+    oldest_product_id = pending_records.order_by('id').values('product_id')[:1]
+    batch_ids = pending_records.filter(product_id=Subquery(oldest_product_id)).order_by('id').values('id')[:limit]
+    batch = uuid.uuid4()
+    django_models.AllocationTicketDB.objects.filter(id__in=Subquery(batch_ids)).update(batch=batch)
+    records = list(django_models.AllocationTicketDB.objects.filter(batch=batch).order_by('id'))
+    retried_records = [record for record in records if record.attempts]
+    if retried_records:
+        records = retried_records[:1]
+    return [_record_to_ticket(record) for record in records]
+
+
+def complete(tickets: Iterable[Ticket]) -> None:
+    """
+    Принимает обработанные заявки, сохраняет их состояние и идентификатор бухты.
+    Заявки с одинаковым результатом обновляются одним запросом.
+    """
+    tickets_by_result: dict[tuple[str, str], list[uuid.UUID]] = {}
+    for ticket in tickets:
+        tickets_by_result.setdefault((ticket.status, ticket.reference), []).append(uuid.UUID(ticket.ticket))
+    processed_at = timezone.now()
+    for (status, reference), ticket_ids in tickets_by_result.items():
+        django_models.AllocationTicketDB.objects.filter(ticket__in=ticket_ids).update(
+            status=status, reference=reference, processed_at=processed_at)
+
+
+def record_failure(tickets: Iterable[Ticket]) -> None:
+    """
+    Принимает заявки пакета, обработка которого завершилась ошибкой, увеличивает количество
+    их неудачных попыток обработки. Заявки с MAX_ATTEMPTS неудачными попытками получают состояние FAILED.
+    """
+    ticket_ids = [uuid.UUID(ticket.ticket) for ticket in tickets]
+    records = django_models.AllocationTicketDB.objects.filter(ticket__in=ticket_ids, status=PENDING)
+    records.update(attempts=F('attempts') + 1)
+    records.filter(attempts__gte=MAX_ATTEMPTS).update(status=FAILED, processed_at=timezone.now())
@@ -0,0 +1,38 @@
+"""
+Кэш пулов бухт в памяти процесса для запроса бухт для размещения (GET /v1/stock/<product_id>/feasible).
+
+Кэш сбрасывается при фиксации изменений в этом же процессе. Изменения, зафиксированные другими процессами
+(другими процессами-обработчиками gunicorn, обработчиками очереди, командами управления), становятся
+видны не позднее чем через settings.COIL_POOL_CACHE_TTL секунд после загрузки пула, при COIL_POOL_CACHE_TTL=0
+пул загружается при каждом запросе. При чтении из реплики к этому добавляется отставание реплики.
+"""
+import time
+from typing import Callable
+
+from django.conf import settings
+
+from allocation.domain.coil_pool import CoilPool
+
+# Загруженные пулы бухт и время их загрузки по идентификаторам материала
+_coil_pools: dict[str, tuple[float, CoilPool]] = {}
+
+
+def get_or_load(product_id: str, load: Callable[[str], CoilPool]) -> CoilPool:
+    """
+    Принимает идентификатор материала и функцию загрузки пула бухт из базы данных.
+    Возвращает закэшированный пул бухт с материалом product_id или загружает его, если пул
+    отсутствует в кэше или загружен более settings.COIL_POOL_CACHE_TTL секунд назад.
+    Возвращаемый пул используется совместно и не должен изменяться.
+    """
+    now = time.monotonic()
+    cached = _coil_pools.get(product_id)
+    if cached is not None and now - cached[0] < settings.COIL_POOL_CACHE_TTL:
+        return cached[1]
+    pool = load(product_id)
+    _coil_pools[product_id] = (now, pool)
+    return pool
+
+
+def invalidate() -> None:
+    """Удаляет из кэша все пулы бухт. Вызывается после фиксации изменений в базе данных."""
+    _coil_pools.clear()
@@ -0,0 +1,52 @@
+"""
+Маршрутизация запросов к базам данных: запись выполняется в основную базу данных (default),
+чтение - в реплику с псевдонимом DATABASE_REPLICA_ALIAS, если она настроена и чтение выполняется
+внутри блока replica_reads(). Остальные запросы на чтение выполняются в основной базе данных,
+чтобы операции в транзакции Unit of Work видели собственные изменения.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Признак чтения из реплики в текущем контексте (потоке или задаче asyncio)
+_read_from_replica: ContextVar[bool] = ContextVar('read_from_replica', default=False)
+
+
+def replica_alias(databases: Mapping[str, Any] | None = None) -> str:
+    """
+    Возвращает псевдоним реплики или псевдоним основной базы данных, если реплика не настроена
+    в настройках баз данных databases (по умолчанию settings.DATABASES).
+    """
+    alias = settings.DATABASE_REPLICA_ALIAS
+    return alias if alias in (settings.DATABASES if databases is None else databases) else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def replica_reads() -> Iterator[str]:
+    """
+    Менеджер контекста, внутри которого запросы на чтение выполняются в реплике.
+    Возвращает псевдоним базы данных, используемой для чтения.
+    """
+    token = _read_from_replica.set(True)
+    try:
+        yield replica_alias()
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model: Any, **hints: Any) -> str:
+        return replica_alias() if _read_from_replica.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        # Реплика является копией основной базы данных, см. команду sync_replica
+        return db != settings.DATABASE_REPLICA_ALIAS
@@ -0,0 +1,50 @@
+"""
+Таблица исходящих событий (transactional outbox). События доменной модели записываются в таблицу
+OutboxEventDB в одной транзакции с изменениями, которые их вызвали, и доставляются обработчикам
+отдельно, см. модуль services.messagebus и команду dispatch_events.
+"""
+from typing import Iterable
+
+from django.utils import timezone
+
+from allocation import models as django_models
+from allocation.domain import events
+
+
+def add(new_events: Iterable[events.Event]) -> None:
+    """Принимает события доменной модели, создает соответствующие им записи в таблице OutboxEventDB."""
+    records = []
+    for event in new_events:
+        payload = events.to_dict(event)
+        records.append(django_models.OutboxEventDB(event_type=payload['type'], payload=payload))
+    django_models.OutboxEventDB.objects.bulk_create(records)
+
+
+def pending(limit: int) -> list[tuple[int, events.Event]]:
+    """Возвращает не более limit недоставленных событий с идентификаторами их записей в порядке создания."""
+    rows = django_models.OutboxEventDB.objects.filter(
+        dispatched_at__isnull=True,
+    ).order_by('id').values_list('id', 'payload')[:limit]
+    return [(record_id, events.from_dict(payload)) for record_id, payload in rows]
+
+
+def after(last_id: int, limit: int) -> list[tuple[int, events.Event]]:
+    """
+    Возвращает не более limit событий с идентификаторами записей больше last_id
+    в порядке создания, независимо от их доставки.
+    """
+    rows = django_models.OutboxEventDB.objects.filter(
+        id__gt=last_id,
+    ).order_by('id').values_list('id', 'payload')[:limit]
+    return [(record_id, events.from_dict(payload)) for record_id, payload in rows]
+
+
+def last_id() -> int:
+    """Возвращает идентификатор последней записи таблицы OutboxEventDB или 0, если таблица пуста."""
+    record_id = django_models.OutboxEventDB.objects.order_by('-id').values_list('id', flat=True).first()
+    return record_id or 0
+
+
+def mark_dispatched(record_ids: Iterable[int]) -> None:
+    """Отмечает записи событий с идентификаторами record_ids как доставленные."""
+    django_models.OutboxEventDB.objects.filter(id__in=list(record_ids)).update(dispatched_at=timezone.now())
@@ -0,0 +1,92 @@
+"""
+Запросы на чтение для API, которые не создают экземпляры классов доменной модели.
+Записи таблиц читаются с помощью values_list() и возвращаются в виде словарей, поля которых
+соответствуют полям CoilBaseModel и OrderLineBaseModel.
+Изменение данных выполняется только через Unit of Work и доменную модель.
+"""
+from typing import Any
+
+from allocation import models as django_models
+from allocation.exceptions import exceptions
+
+
+# Поля записей таблиц в порядке полей CoilBaseModel и OrderLineBaseModel
+COIL_FIELDS = ('reference', 'product_id', 'quantity', 'recommended_balance', 'acceptable_loss')
+ORDERLINE_FIELDS = ('order_id', 'line_item', 'product_id', 'quantity')
+
+# "Поддельная" бухта, которая возвращается, если товарная позиция не размещена,
+# см. функцию services.get_an_allocation_coil
+FAKE_COIL = {'reference': 'fake', 'product_id': 'fake', 'quantity': 1,
+             'recommended_balance': 1, 'acceptable_loss': 1, 'allocations': []}
+
+
+def coil(reference: str) -> dict[str, Any]:
+    """
+    Принимает идентификатор бухты, возвращает словарь с полями бухты и списком
+    словарей с полями размещенных в ней товарных позиций (allocations).
+
+    Вызывает исключение при отсутствии подходящей записи.
+    """
+    coil_row = _coil_row(reference=reference)
+    if coil_row is None:
+        raise exceptions.DBCoilRecordDoesNotExist(reference)
+    return coil_row
+
+
+def order_line(order_id: str, line_item: str) -> dict[str, Any]:
+    """
+    Принимает идентификаторы товарной позиции, возвращает словарь с ее полями.
+
+    Вызывает исключение при отсутствии подходящей записи.
+    """
+    orderline_row = django_models.OrderLineDB.objects.filter(
+        order_id=order_id, line_item=line_item,
+    ).values_list(*ORDERLINE_FIELDS).first()
+    if orderline_row is None:
+        raise exceptions.DBOrderLineRecordDoesNotExist(order_id, line_item)
+    return dict(zip(ORDERLINE_FIELDS, orderline_row))
+
+
+def allocation_coil(order_id: str, line_item: str) -> dict[str, Any]:
+    """
+    Принимает идентификаторы товарной позиции, возвращает словарь с полями бухты, в которой
+    она размещена, и списком словарей с полями размещенных в бухте товарных позиций (allocations).
+    Если товарная позиция не размещена, то возвращает "поддельную" бухту FAKE_COIL.
+
+    Вызывает исключение при отсутствии записи товарной позиции.
+    """
+    allocation_row = django_models.OrderLineDB.objects.filter(
+        order_id=order_id, line_item=line_item,
+    ).values_list('allocationdb__coil_record_id').first()
+    if allocation_row is None:
+        raise exceptions.DBOrderLineRecordDoesNotExist(order_id, line_item)
+    coil_id = allocation_row[0]
+    coil_row = _coil_row(id=coil_id) if coil_id is not None else None
+    return dict(FAKE_COIL, allocations=[]) if coil_row is None else coil_row
+
+
+def _coil_row(**filters: Any) -> dict[str, Any] | None:
+    """
+    Принимает условия отбора записи таблицы CoilDB, одним запросом получает первую подходящую запись
+    вместе с записями размещенных в ней товарных позиций. Возвращает словарь с полями бухты
+    или None при отсутствии подходящей записи.
+    """
+    orderline_lookups = [f'allocationdb__orderline_record__{field}' for field in ORDERLINE_FIELDS]
+    rows = django_models.CoilDB.objects.filter(**filters).order_by(
+        'id', 'allocationdb__orderline_record__id',
+    ).values_list('id', *COIL_FIELDS, *orderline_lookups)
+    coil_row: dict[str, Any] | None = None
+    coil_id = None
+    for row in rows:
+        if coil_row is None:
+            coil_id = row[0]
+            coil_row = dict(zip(COIL_FIELDS, row[1:len(COIL_FIELDS) + 1]))
+            coil_row['allocations'] = []
+        elif row[0] != coil_id:
+            # Записи других бухт с тем же идентификатором не учитываются
+            break
+        orderline_row = row[len(COIL_FIELDS) + 1:]
+        # Для бухты без размещенных товарных позиций поля товарной позиции равны None
+        if orderline_row[0] is not None:
+            coil_row['allocations'].append(dict(zip(ORDERLINE_FIELDS, orderline_row)))
+    return coil_row
@@ -1,8 +1,13 @@
-from typing import Protocol
+from typing import Iterable, Protocol
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
 
 from allocation import models as django_models
-from allocation.adapters import mapper
-from allocation.domain import domain_logic
+from allocation.adapters import allocation_queue, coil_pool_cache, mapper
+from allocation.domain import domain_logic, events, simulation
+from allocation.domain.coil_pool import CoilPool
 from allocation.exceptions import exceptions
 
 
@@ -15,7 +20,15 @@ class AbstractCoilRepository(Protocol):
 
     def delete(self, reference: str) -> None: ...
 
-    def coils_list(self) -> list[domain_logic.Coil]: ...
+    def coils_list(self, product_ids: Iterable[str] | None = None) -> list[domain_logic.Coil]: ...
+
+    def candidate_coils(self, line: domain_logic.OrderLine, limit: int = ...) -> list[domain_logic.Coil]: ...
+
+    def snapshot(self, product_ids: Iterable[str], order_ids: Iterable[str]) -> simulation.WarehouseSnapshot: ...
+
+    def coil_pool(self, product_id: str) -> CoilPool: ...
+
+    def collect_events(self) -> list[events.Event]: ...
 
 
 class AbstractOrderLineRepository(Protocol):
@@ -27,10 +40,69 @@ class AbstractOrderLineRepository(Protocol):
 
     def delete(self, order_id: str, line_item: str) -> None: ...
 
-    def order_lines_list(self) -> list[domain_logic.OrderLine]: ...
+    def order_lines_list(self, order_id: str | None = None) -> list[domain_logic.OrderLine]: ...
+
+    def order_lines_by_keys(self, keys: set[tuple[str, str]]) -> dict[tuple[str, str], domain_logic.OrderLine]: ...
+
+
+class AbstractAsyncCoilRepository(Protocol):
+    async def get(self, reference: str) -> domain_logic.Coil: ...
+
+    async def add(self, coil_domain: domain_logic.Coil) -> None: ...
+
+    async def update(self, coil_domain: domain_logic.Coil) -> None: ...
+
+    async def delete(self, reference: str) -> None: ...
+
+    async def coils_list(self, product_ids: Iterable[str] | None = None) -> list[domain_logic.Coil]: ...
+
+    async def candidate_coils(self, line: domain_logic.OrderLine, limit: int = ...) -> list[domain_logic.Coil]: ...
+
+    async def snapshot(self, product_ids: Iterable[str],
+                       order_ids: Iterable[str]) -> simulation.WarehouseSnapshot: ...
+
+    async def coil_pool(self, product_id: str) -> CoilPool: ...
+
+    def collect_events(self) -> list[events.Event]: ...
+
+
+class AbstractAsyncOrderLineRepository(Protocol):
+    async def get(self, order_id: str, line_item: str) -> domain_logic.OrderLine: ...
+
+    async def add(self, orderline_domain: domain_logic.OrderLine) -> None: ...
+
+    async def update(self, orderline_domain: domain_logic.OrderLine) -> None: ...
+
+    async def delete(self, order_id: str, line_item: str) -> None: ...
+
+    async def order_lines_list(self, order_id: str | None = None) -> list[domain_logic.OrderLine]: ...
+
+
+class AbstractTicketRepository(Protocol):
+    def get(self, ticket: str) -> allocation_queue.Ticket: ...
+
+    def add(self, line: domain_logic.OrderLine) -> allocation_queue.Ticket: ...
+
+    def has_pending(self) -> bool: ...
+
+    def claim_batch(self, limit: int) -> list[allocation_queue.Ticket]: ...
+
+    def complete(self, tickets: Iterable[allocation_queue.Ticket]) -> None: ...
+
+    def record_failure(self, tickets: Iterable[allocation_queue.Ticket]) -> None: ...
+
+
+# Количество бухт-кандидатов, возвращаемых методом candidate_coils: наилучшая бухта и запасные бухты,
+# которые будут использованы, если размещение в наилучшей бухте окажется невозможным
+CANDIDATE_COILS_LIMIT = 5
 
 
 class DjangoCoilRepository:
+    def __init__(self) -> None:
+        # Бухты, полученные из репозитория или переданные в него, события которых
+        # сохраняются при фиксации изменений, см. метод collect_events
+        self.seen: list[domain_logic.Coil] = []
+
     def get(self, reference: str) -> domain_logic.Coil:
         """
         Принимает идентификатор экземпляра класса Coil доменной модели,
@@ -42,6 +114,7 @@ class DjangoCoilRepository:
         # Получение записи таблицы CoilDB или вызов исключения
         coil_record = DjangoCoilRepository._get_coil_record_from_db(reference)
         coil_domain = mapper.coil_record_to_domain(coil_record)
+        self.seen.append(coil_domain)
         return coil_domain
 
     def add(self, coil_domain: domain_logic.Coil) -> None:
@@ -55,6 +128,7 @@ class DjangoCoilRepository:
         if django_models.CoilDB.objects.filter(reference=coil_domain.reference):
             raise exceptions.DBCoilRecordAlreadyExist(coil_domain.reference)
         else:
+            self.seen.append(coil_domain)
             django_models.CoilDB.objects.create(reference=coil_domain.reference,
                                                 product_id=coil_domain.product_id,
                                                 quantity=coil_domain.initial_quantity,
@@ -71,18 +145,31 @@ class DjangoCoilRepository:
         Связывает обновляемую запись с записями таблицы OrderLine, в соответствии
         с атрибутом allocations экземпляра класса Coil доменной модели,
         путем создания записей промежуточной таблицы AllocationDB.
+        Создаются и удаляются только записи измененных размещений, записи новых размещений
+        создаются одним запросом, поэтому количество запросов не зависит от количества товарных позиций.
         """
         # Получение записи таблицы CoilDB или вызов исключения
         coil_record = DjangoCoilRepository._get_coil_record_from_db(coil_domain.reference)
+        self.seen.append(coil_domain)
         django_models.CoilDB.objects.filter(reference=coil_domain.reference).update(
             product_id=coil_domain.product_id,
             quantity=coil_domain.initial_quantity,
             recommended_balance=coil_domain.recommended_balance,
             acceptable_loss=coil_domain.acceptable_loss,
         )
-        django_models.AllocationDB.objects.filter(coil_record=coil_record).delete()
-        coil_record.allocationdb_set.set(DjangoCoilRepository._get_or_create_allocation_record(
-            coil_record, orderline_domain) for orderline_domain in coil_domain.allocations)
+        # Записи размещений бухты по идентификаторам товарных позиций
+        allocation_ids = {(order_id, line_item): allocation_id for allocation_id, order_id, line_item
+                          in django_models.AllocationDB.objects.filter(coil_record=coil_record).values_list(
+                              'id', 'orderline_record__order_id', 'orderline_record__line_item')}
+        line_keys = {(line.order_id, line.line_item) for line in coil_domain.allocations}
+        removed_ids = [allocation_id for key, allocation_id in allocation_ids.items() if key not in line_keys]
+        if removed_ids:
+            django_models.AllocationDB.objects.filter(id__in=removed_ids).delete()
+        new_keys = line_keys - allocation_ids.keys()
+        if new_keys:
+            django_models.AllocationDB.objects.bulk_create(
+                django_models.AllocationDB(coil_record=coil_record, orderline_record=orderline_record)
+                for orderline_record in DjangoOrderLineRepository._get_orderline_records_from_db(new_keys))
 
     def delete(self, reference: str) -> None:
         """
@@ -95,8 +182,135 @@ class DjangoCoilRepository:
         DjangoCoilRepository._get_coil_record_from_db(reference)
         django_models.CoilDB.objects.filter(reference=reference).delete()
 
-    def coils_list(self) -> list[domain_logic.Coil]:
-        return [mapper.coil_record_to_domain(coil) for coil in django_models.CoilDB.objects.all()]
+    def coils_list(self, product_ids: Iterable[str] | None = None) -> list[domain_logic.Coil]:
+        """
+        Возвращает список экземпляров класса Coil доменной модели, полученных из записей таблицы CoilDB.
+        Если передан product_ids, то возвращает только бухты с материалами из product_ids.
+
+        Размещенные товарные позиции загружаются для всех бухт одновременно,
+        поэтому количество запросов к базе данных не зависит от количества бухт.
+        """
+        coil_records = django_models.CoilDB.objects.all()
+        if product_ids is not None:
+            coil_records = coil_records.filter(product_id__in=list(product_ids))
+        coil_records = coil_records.order_by('id').prefetch_related('allocationdb_set__orderline_record')
+        return [mapper.coil_record_to_domain(coil) for coil in coil_records]
+
+    def candidate_coils(self, line: domain_logic.OrderLine,
+                        limit: int = CANDIDATE_COILS_LIMIT) -> list[domain_logic.Coil]:
+        """
+        Принимает экземпляр класса OrderLine доменной модели, возвращает список не более чем из limit
+        экземпляров класса Coil доменной модели, в которых может быть размещена товарная позиция.
+        Список упорядочен так же, как при размещении функцией allocate_to_list_of_coils:
+        по возрастанию доступного количества материала. Первая бухта списка - наилучший кандидат,
+        остальные - запасные.
+
+        Если товарная позиция уже размещена в одной из бухт, то возвращает список из этой бухты.
+        Отбор и упорядочивание бухт выполняются на стороне базы данных, поэтому время выполнения
+        не зависит от количества бухт с материалом product_id.
+        """
+        # Бухта, в которой уже размещена товарная позиция
+        allocation_records = django_models.CoilDB.objects.filter(
+            allocationdb__orderline_record__order_id=line.order_id,
+            allocationdb__orderline_record__line_item=line.line_item,
+        ).prefetch_related('allocationdb_set__orderline_record')[:1]
+        if allocation_records:
+            return [mapper.coil_record_to_domain(coil) for coil in allocation_records]
+        # Доступное количество материала - разность изначального количества материала
+        # и суммарного количества материала размещенных товарных позиций
+        available_quantity = F('quantity') - Coalesce(Sum('allocationdb__orderline_record__quantity'), 0)
+        # Условия, совпадающие с условиями метода Coil.can_allocate
+        balance_bigger_recommended_balance = Q(available_quantity__gte=F('recommended_balance') + line.quantity)
+        balance_smaller_acceptable_loss_and_bigger_zero = Q(
+            available_quantity__gte=line.quantity,
+            available_quantity__lte=F('acceptable_loss') + line.quantity,
+        )
+        coil_records = django_models.CoilDB.objects.filter(
+            product_id=line.product_id,
+        ).annotate(
+            available_quantity=available_quantity,
+        ).filter(
+            balance_bigger_recommended_balance | balance_smaller_acceptable_loss_and_bigger_zero,
+        ).order_by(
+            'available_quantity', 'id',
+        ).prefetch_related('allocationdb_set__orderline_record')[:limit]
+        return [mapper.coil_record_to_domain(coil) for coil in coil_records]
+
+    def snapshot(self, product_ids: Iterable[str], order_ids: Iterable[str]) -> simulation.WarehouseSnapshot:
+        """
+        Принимает идентификаторы материалов и заказов, возвращает снимок состояния склада -
+        экземпляр класса WarehouseSnapshot с бухтами, содержащими материалы product_ids, и размещениями
+        товарных позиций заказов order_ids.
+
+        Снимок загружается двумя запросами, которые только читают записи таблиц и не создают
+        экземпляры классов доменной модели.
+        """
+        warehouse_snapshot = simulation.WarehouseSnapshot()
+        coil_rows = django_models.CoilDB.objects.filter(
+            product_id__in=list(product_ids),
+        ).annotate(
+            available_quantity=F('quantity') - Coalesce(Sum('allocationdb__orderline_record__quantity'), 0),
+        ).order_by('id').values_list('reference', 'product_id', 'available_quantity',
+                                     'recommended_balance', 'acceptable_loss')
+        for row in coil_rows:
+            warehouse_snapshot.add_coil(*row)
+        allocation_rows = django_models.AllocationDB.objects.filter(
+            orderline_record__order_id__in=list(order_ids),
+        ).values_list('orderline_record__order_id', 'orderline_record__line_item', 'coil_record__reference')
+        for order_id, line_item, reference in allocation_rows:
+            warehouse_snapshot.allocations[(order_id, line_item)] = reference
+        return warehouse_snapshot
+
+    def coil_pool(self, product_id: str) -> CoilPool:
+        """
+        Принимает идентификатор материала, возвращает экземпляр класса CoilPool с бухтами,
+        содержащими материал product_id, без размещенных товарных позиций.
+
+        Пул загружается одним запросом и кэшируется в пределах процесса, поэтому изменения, зафиксированные
+        другими процессами, учитываются не позднее чем через settings.COIL_POOL_CACHE_TTL секунд,
+        см. модуль coil_pool_cache. Возвращаемый пул используется совместно и не должен изменяться.
+        """
+        return coil_pool_cache.get_or_load(product_id, DjangoCoilRepository._load_coil_pool)
+
+    def collect_events(self) -> list[events.Event]:
+        """
+        Возвращает события бухт, полученных из репозитория или переданных в него,
+        и удаляет их из бухт, чтобы каждое событие было сохранено однократно.
+        """
+        collected_events = []
+        for coil in {id(coil): coil for coil in self.seen}.values():
+            collected_events.extend(coil.events)
+            coil.events.clear()
+        return collected_events
+
+    def events_snapshot(self) -> dict[int, int]:
+        """
+        Возвращает количество несохраненных событий бухт, полученных из репозитория или переданных в него,
+        по идентификаторам экземпляров бухт. Используется при создании точки сохранения, см. rollback_events.
+        """
+        return {id(coil): len(coil.events) for coil in self.seen}
+
+    def rollback_events(self, snapshot: dict[int, int]) -> None:
+        """
+        Принимает результат метода events_snapshot, удаляет события бухт, возникшие после его получения.
+        События бухт, полученных из репозитория или переданных в него после получения snapshot, удаляются полностью.
+        """
+        for coil in self.seen:
+            del coil.events[snapshot.get(id(coil), 0):]
+
+    @staticmethod
+    def _load_coil_pool(product_id: str) -> CoilPool:
+        """Принимает идентификатор материала, загружает из базы данных пул бухт с материалом product_id."""
+        pool = CoilPool(product_id)
+        coil_rows = django_models.CoilDB.objects.filter(
+            product_id=product_id,
+        ).annotate(
+            allocated_quantity=Coalesce(Sum('allocationdb__orderline_record__quantity'), 0),
+        ).order_by('id').values_list('reference', 'quantity', 'allocated_quantity',
+                                     'recommended_balance', 'acceptable_loss')
+        for row in coil_rows:
+            pool.add_coil(*row)
+        return pool
 
     @staticmethod
     def _get_coil_record_from_db(reference: str) -> django_models.CoilDB:
@@ -112,26 +326,6 @@ class DjangoCoilRepository:
             raise exceptions.DBCoilRecordDoesNotExist(reference)
         return coil_record
 
-    @staticmethod
-    def _get_or_create_allocation_record(coil_record: django_models.CoilDB,
-                                         orderline_domain: domain_logic.OrderLine) -> django_models.AllocationDB:
-        """
-        Принимает запись таблицы CoilDB и экземпляр класса OrderLine доменной модели,
-        возвращает существующую или создает новую запись промежуточной таблицы AllocationDB,
-        которая связывает соответствующие записи таблиц CoilDB и OrderLineDB.
-
-        Вызывает исключение при отсутствии записи таблицы OrderLineDB,
-        соответствующей экземпляру OrderLine доменной модели.
-        """
-        # Получение записи таблицы OrderLineDB или вызов исключения
-        orderline_record = DjangoOrderLineRepository._get_orderline_record_from_db(
-            order_id=orderline_domain.order_id,
-            line_item=orderline_domain.line_item,
-        )
-        allo, _ = django_models.AllocationDB.objects.get_or_create(coil_record=coil_record,
-                                                                   orderline_record=orderline_record)
-        return allo
-
 
 class DjangoOrderLineRepository:
     def get(self, order_id: str, line_item: str) -> domain_logic.OrderLine:
@@ -191,8 +385,44 @@ class DjangoOrderLineRepository:
         DjangoOrderLineRepository._get_orderline_record_from_db(order_id, line_item)
         django_models.OrderLineDB.objects.filter(order_id=order_id, line_item=line_item).delete()
 
-    def order_lines_list(self) -> list[domain_logic.OrderLine]:
-        return [mapper.orderline_record_to_domain(line) for line in django_models.OrderLineDB.objects.all()]
+    def order_lines_list(self, order_id: str | None = None) -> list[domain_logic.OrderLine]:
+        """
+        Возвращает список экземпляров класса OrderLine доменной модели, полученных из записей таблицы OrderLineDB.
+        Если передан order_id, то возвращает только товарные позиции заказа order_id.
+        """
+        orderline_records = django_models.OrderLineDB.objects.all()
+        if order_id is not None:
+            orderline_records = orderline_records.filter(order_id=order_id)
+        return [mapper.orderline_record_to_domain(line) for line in orderline_records.order_by('id')]
+
+    def order_lines_by_keys(self, keys: set[tuple[str, str]]) -> dict[tuple[str, str], domain_logic.OrderLine]:
+        """
+        Принимает идентификаторы (order_id, line_item) экземпляров класса OrderLine доменной модели,
+        возвращает словарь найденных экземпляров по их идентификаторам, полученных одним запросом.
+        Идентификаторы отсутствующих записей в словарь не включаются.
+        """
+        # Условие по спискам order_id и line_item использует индекс allocation_orderline_idx и, в отличие
+        # от условия OR по парам, не ограничено глубиной выражений SQLite. Лишние пары отбрасываются ниже
+        orderline_records = django_models.OrderLineDB.objects.filter(order_id__in={key[0] for key in keys},
+                                                                     line_item__in={key[1] for key in keys})
+        lines = {(record.order_id, record.line_item): mapper.orderline_record_to_domain(record)
+                 for record in orderline_records}
+        return {key: line for key, line in lines.items() if key in keys}
+
+    @staticmethod
+    def _get_orderline_records_from_db(keys: set[tuple[str, str]]) -> list[django_models.OrderLineDB]:
+        """
+        Принимает идентификаторы (order_id, line_item) экземпляров класса OrderLine доменной модели,
+        возвращает соответствующие им записи таблицы OrderLineDB, полученные одним запросом.
+
+        Вызывает исключение при отсутствии записи для любого из идентификаторов.
+        """
+        orderline_records = {(record.order_id, record.line_item): record for record in
+                             django_models.OrderLineDB.objects.filter(order_id__in={key[0] for key in keys})}
+        missing_keys = sorted(keys - orderline_records.keys())
+        if missing_keys:
+            raise exceptions.DBOrderLineRecordDoesNotExist(*missing_keys[0])
+        return [orderline_records[key] for key in sorted(keys)]
 
     @staticmethod
     def _get_orderline_record_from_db(order_id: str, line_item: str) -> django_models.OrderLineDB:
@@ -207,3 +437,138 @@ class DjangoOrderLineRepository:
         except django_models.OrderLineDB.DoesNotExist:
             raise exceptions.DBOrderLineRecordDoesNotExist(order_id, line_item)
         return orderline_record
+
+
+class ReadOnlyDjangoCoilRepository(DjangoCoilRepository):
+    """Версия DjangoCoilRepository для ReadOnlyUnitOfWork: методы изменения записей вызывают исключение."""
+    def add(self, coil_domain: domain_logic.Coil) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('coil_repo.add')
+
+    def update(self, coil_domain: domain_logic.Coil) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('coil_repo.update')
+
+    def delete(self, reference: str) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('coil_repo.delete')
+
+
+class ReadOnlyDjangoOrderLineRepository(DjangoOrderLineRepository):
+    """Версия DjangoOrderLineRepository для ReadOnlyUnitOfWork: методы изменения записей вызывают исключение."""
+    def add(self, orderline_domain: domain_logic.OrderLine) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('line_repo.add')
+
+    def update(self, orderline_domain: domain_logic.OrderLine) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('line_repo.update')
+
+    def delete(self, order_id: str, line_item: str) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('line_repo.delete')
+
+
+class DjangoTicketRepository:
+    """Заявки на размещение товарных позиций в очереди таблицы AllocationTicketDB, см. модуль allocation_queue."""
+    def get(self, ticket: str) -> allocation_queue.Ticket:
+        """
+        Принимает идентификатор заявки, возвращает заявку.
+
+        Вызывает исключение при отсутствии заявки или некорректном идентификаторе.
+        """
+        return allocation_queue.get(ticket)
+
+    def add(self, line: domain_logic.OrderLine) -> allocation_queue.Ticket:
+        """Принимает экземпляр класса OrderLine доменной модели, создает заявку на его размещение и возвращает ее."""
+        return allocation_queue.enqueue(line)
+
+    def has_pending(self) -> bool:
+        """Возвращает True, если в очереди есть ожидающие заявки."""
+        return allocation_queue.has_pending()
+
+    def claim_batch(self, limit: int) -> list[allocation_queue.Ticket]:
+        """
+        Отбирает не более limit ожидающих заявок с одним материалом и возвращает их,
+        см. allocation_queue.claim_batch.
+        """
+        return allocation_queue.claim_batch(limit)
+
+    def complete(self, tickets: Iterable[allocation_queue.Ticket]) -> None:
+        """Принимает обработанные заявки, сохраняет их состояние и идентификатор бухты."""
+        allocation_queue.complete(tickets)
+
+    def record_failure(self, tickets: Iterable[allocation_queue.Ticket]) -> None:
+        """
+        Принимает заявки пакета, обработка которого завершилась ошибкой, сохраняет неудачную попытку
+        их обработки, см. allocation_queue.record_failure.
+        """
+        allocation_queue.record_failure(tickets)
+
+
+class ReadOnlyDjangoTicketRepository(DjangoTicketRepository):
+    """Версия DjangoTicketRepository для ReadOnlyUnitOfWork: методы изменения записей вызывают исключение."""
+    def add(self, line: domain_logic.OrderLine) -> allocation_queue.Ticket:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('ticket_repo.add')
+
+    def claim_batch(self, limit: int) -> list[allocation_queue.Ticket]:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('ticket_repo.claim_batch')
+
+    def complete(self, tickets: Iterable[allocation_queue.Ticket]) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('ticket_repo.complete')
+
+    def record_failure(self, tickets: Iterable[allocation_queue.Ticket]) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('ticket_repo.record_failure')
+
+
+class AsyncDjangoCoilRepository:
+    """
+    Асинхронная версия DjangoCoilRepository. Django 4.0 не имеет асинхронного API ORM, поэтому
+    методы синхронного репозитория выполняются с помощью sync_to_async в одном потоке
+    с остальными операциями AsyncDjangoUnitOfWork и, следовательно, в одной транзакции.
+    """
+    def __init__(self) -> None:
+        self._repo = DjangoCoilRepository()
+
+    async def get(self, reference: str) -> domain_logic.Coil:
+        return await sync_to_async(self._repo.get)(reference)
+
+    async def add(self, coil_domain: domain_logic.Coil) -> None:
+        await sync_to_async(self._repo.add)(coil_domain)
+
+    async def update(self, coil_domain: domain_logic.Coil) -> None:
+        await sync_to_async(self._repo.update)(coil_domain)
+
+    async def delete(self, reference: str) -> None:
+        await sync_to_async(self._repo.delete)(reference)
+
+    async def coils_list(self, product_ids: Iterable[str] | None = None) -> list[domain_logic.Coil]:
+        return await sync_to_async(self._repo.coils_list)(product_ids)
+
+    async def candidate_coils(self, line: domain_logic.OrderLine,
+                              limit: int = CANDIDATE_COILS_LIMIT) -> list[domain_logic.Coil]:
+        return await sync_to_async(self._repo.candidate_coils)(line, limit)
+
+    async def snapshot(self, product_ids: Iterable[str], order_ids: Iterable[str]) -> simulation.WarehouseSnapshot:
+        return await sync_to_async(self._repo.snapshot)(product_ids, order_ids)
+
+    async def coil_pool(self, product_id: str) -> CoilPool:
+        return await sync_to_async(self._repo.coil_pool)(product_id)
+
+    def collect_events(self) -> list[events.Event]:
+        return self._repo.collect_events()
+
+
+class AsyncDjangoOrderLineRepository:
+    """Асинхронная версия DjangoOrderLineRepository, см. AsyncDjangoCoilRepository."""
+    def __init__(self) -> None:
+        self._repo = DjangoOrderLineRepository()
+
+    async def get(self, order_id: str, line_item: str) -> domain_logic.OrderLine:
+        return await sync_to_async(self._repo.get)(order_id, line_item)
+
+    async def add(self, orderline_domain: domain_logic.OrderLine) -> None:
+        await sync_to_async(self._repo.add)(orderline_domain)
+
+    async def update(self, orderline_domain: domain_logic.OrderLine) -> None:
+        await sync_to_async(self._repo.update)(orderline_domain)
+
+    async def delete(self, order_id: str, line_item: str) -> None:
+        await sync_to_async(self._repo.delete)(order_id, line_item)
+
+    async def order_lines_list(self, order_id: str | None = None) -> list[domain_logic.OrderLine]:
+        return await sync_to_async(self._repo.order_lines_list)(order_id)
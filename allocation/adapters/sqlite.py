@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def set_sqlite_pragmas(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """
+    Обработчик сигнала connection_created. Выполняет для нового соединения с базой данных SQLite
+    инструкции PRAGMA из настройки SQLITE_PRAGMAS. Инструкции с пустым значением не выполняются.
+
+    Режим журнала WAL позволяет читать базу данных во время записи, а synchronous=NORMAL
+    в режиме WAL не требует синхронизации файла с диском при фиксации каждой транзакции.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            if value not in (None, ''):
+                cursor.execute(f'PRAGMA {pragma} = {value}')
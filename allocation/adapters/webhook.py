@@ -0,0 +1,32 @@
+import json
+import urllib.request
+
+from allocation.domain import events
+
+
+# Время ожидания (в секундах) ответа на запрос доставки событий
+WEBHOOK_TIMEOUT = 5.0
+
+
+class WebhookHandler:
+    """
+    Обработчик событий, отправляющий пакет событий запросом POST на адрес url
+    в виде списка JSON, полученного функцией events.to_dict.
+    Ответ с кодом ошибки вызывает исключение urllib.error.HTTPError, и пакет будет доставлен повторно.
+    """
+    def __init__(self, url: str, timeout: float = WEBHOOK_TIMEOUT) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, batch: list[events.Event]) -> None:
+        body = json.dumps([events.to_dict(event) for event in batch], ensure_ascii=False).encode()
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, WebhookHandler) and self.url == other.url
+
+    def __hash__(self) -> int:
+        return hash(self.url)
@@ -1,26 +1,19 @@
 import json
 from typing import Any
 
-from drf_spectacular.utils import OpenApiParameter, extend_schema
-from pydantic import ValidationError
+from pydantic import ValidationError, parse_obj_as
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from allocation.adapters import db_router, queries
 from allocation.api import serializers
+from allocation.domain import domain_logic
 from allocation.exceptions import exceptions
 from allocation.services import services, unit_of_work
-from coils_and_wires import drf_spectacular
 
 
 class CoilView(APIView):
-    @extend_schema(
-        tags=['Бухты'],
-        description=drf_spectacular.coils_descriptions['post'],
-        responses=drf_spectacular.coils_responses['post'],
-        request=serializers.CoilBaseModel,
-        examples=drf_spectacular.coils_request_examples,
-    )
     def post(self, request: Request) -> Response:
         try:
             input_data = serializers.CoilBaseModel.parse_obj(request.data)
@@ -44,50 +37,21 @@ class CoilView(APIView):
 
 
 class CoilDetailView(APIView):
-    @extend_schema(
-        tags=['Бухты'],
-        description=drf_spectacular.coils_descriptions['get'],
-        responses=drf_spectacular.coils_responses['get'],
-        parameters=[
-            OpenApiParameter(
-                name='reference',
-                location='path',
-                description='Идентификатор бухты',
-                examples=drf_spectacular.coils_reference_request_examples,
-            ),
-        ],
-    )
     def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         reference = self.kwargs['reference']
         try:
-            coil = services.get_a_coil(
-                reference,
-                unit_of_work.DjangoUnitOfWork(),
-            )
+            with db_router.replica_reads():
+                coil_row = queries.coil(reference)
         except exceptions.DBCoilRecordDoesNotExist as error:
             output_data = json.dumps({"message": error.message}, ensure_ascii=False)
             return Response(data=output_data, status=404)
         try:
-            output_data = serializers.serialize_coil_domain_instance_to_json(coil)
+            output_data = serializers.serialize_coil_row_to_json(coil_row)
         except ValidationError as error:
             output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
             return Response(data=output_data, status=403)
         return Response(data=output_data, status=200)
 
-    @extend_schema(
-        tags=['Бухты'],
-        description=drf_spectacular.coils_descriptions['put'],
-        responses=drf_spectacular.coils_responses['put'],
-        request=serializers.CoilBaseModel,
-        examples=drf_spectacular.coils_request_examples,
-        parameters=[OpenApiParameter(
-            name='reference',
-            location='path',
-            description='Идентификатор бухты',
-            examples=drf_spectacular.coils_reference_request_examples,
-        ),
-        ],
-    )
     def put(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         reference = self.kwargs['reference']
         try:
@@ -95,7 +59,20 @@ class CoilDetailView(APIView):
         except ValidationError as error:
             output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
             return Response(data=output_data, status=400)
+        optimize = request.query_params.get('optimize') == 'true'
         try:
+            if request.query_params.get('reallocate') == 'true':
+                batch_allocation = services.update_a_coil_and_reallocate(
+                    reference,
+                    input_data.product_id,
+                    input_data.quantity,
+                    input_data.recommended_balance,
+                    input_data.acceptable_loss,
+                    unit_of_work.DjangoUnitOfWork(),
+                    optimize=optimize,
+                )
+                output_data = serializers.serialize_batch_allocation_to_json(batch_allocation)
+                return Response(data=output_data, status=200)
             deallocated_lines = services.update_a_coil(
                 reference,
                 input_data.product_id,
@@ -103,6 +80,7 @@ class CoilDetailView(APIView):
                 input_data.recommended_balance,
                 input_data.acceptable_loss,
                 unit_of_work.DjangoUnitOfWork(),
+                optimize=optimize,
             )
         except exceptions.DBCoilRecordDoesNotExist as error:
             output_data = json.dumps({"message": error.message}, ensure_ascii=False)
@@ -112,22 +90,16 @@ class CoilDetailView(APIView):
         output_data = json.dumps(serialized_deallocated_lines, ensure_ascii=False)
         return Response(data=output_data, status=200)
 
-    @extend_schema(
-        tags=['Бухты'],
-        description=drf_spectacular.coils_descriptions['delete'],
-        responses=drf_spectacular.coils_responses['delete'],
-        parameters=[
-            OpenApiParameter(
-                name='reference',
-                location='path',
-                description='Идентификатор бухты',
-                examples=drf_spectacular.coils_reference_request_examples,
-            ),
-        ],
-    )
     def delete(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         reference = self.kwargs['reference']
         try:
+            if request.query_params.get('reallocate') == 'true':
+                batch_allocation = services.delete_a_coil_and_reallocate(
+                    reference,
+                    unit_of_work.DjangoUnitOfWork(),
+                )
+                output_data = serializers.serialize_batch_allocation_to_json(batch_allocation)
+                return Response(data=output_data, status=200)
             deallocated_lines = services.delete_a_coil(
                 reference,
                 unit_of_work.DjangoUnitOfWork(),
@@ -142,13 +114,6 @@ class CoilDetailView(APIView):
 
 
 class OrderLineView(APIView):
-    @extend_schema(
-        tags=['Товарные позиции'],
-        description=drf_spectacular.lines_descriptions['post'],
-        responses=drf_spectacular.lines_responses['post'],
-        request=serializers.OrderLineBaseModel,
-        examples=drf_spectacular.lines_request_examples,
-    )
     def post(self, request: Request) -> Response:
         try:
             input_data = serializers.OrderLineBaseModel.parse_obj(request.data)
@@ -171,55 +136,22 @@ class OrderLineView(APIView):
 
 
 class OrderLineDetailView(APIView):
-    @extend_schema(
-        tags=['Товарные позиции'],
-        description=drf_spectacular.lines_descriptions['get'],
-        responses=drf_spectacular.lines_responses['get'],
-        parameters=[OpenApiParameter(name='order_id',
-                                     location='path',
-                                     description='Идентификатор заказа',
-                                     examples=drf_spectacular.lines_order_id_request_examples),
-                    OpenApiParameter(name='line_item',
-                                     location='path',
-                                     description='Номер товарной позиции в заказе',
-                                     examples=drf_spectacular.lines_line_item_request_examples),
-                    ],
-    )
     def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         order_id = self.kwargs['order_id']
         line_item = self.kwargs['line_item']
         try:
-            line = services.get_a_line(
-                order_id,
-                line_item,
-                unit_of_work.DjangoUnitOfWork(),
-            )
+            with db_router.replica_reads():
+                orderline_row = queries.order_line(order_id, line_item)
         except exceptions.DBOrderLineRecordDoesNotExist as error:
             output_data = json.dumps({"message": error.message}, ensure_ascii=False)
             return Response(data=output_data, status=404)
         try:
-            output_data = serializers.serialize_order_line_domain_instance_to_json(line)
+            output_data = serializers.serialize_order_line_row_to_json(orderline_row)
         except ValidationError as error:
             output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
             return Response(data=output_data, status=403)
         return Response(data=output_data, status=200)
 
-    @extend_schema(
-        tags=['Товарные позиции'],
-        description=drf_spectacular.lines_descriptions['put'],
-        responses=drf_spectacular.lines_responses['put'],
-        request=serializers.OrderLineBaseModel,
-        examples=drf_spectacular.lines_request_examples,
-        parameters=[OpenApiParameter(name='order_id',
-                                     location='path',
-                                     description='Идентификатор заказа',
-                                     examples=drf_spectacular.lines_order_id_request_examples),
-                    OpenApiParameter(name='line_item',
-                                     location='path',
-                                     description='Номер товарной позиции в заказе',
-                                     examples=drf_spectacular.lines_line_item_request_examples),
-                    ],
-    )
     def put(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         order_id = self.kwargs['order_id']
         line_item = self.kwargs['line_item']
@@ -246,20 +178,6 @@ class OrderLineDetailView(APIView):
             return Response(data=output_data, status=403)
         return Response(data=output_data, status=200)
 
-    @extend_schema(
-        tags=['Товарные позиции'],
-        description=drf_spectacular.lines_descriptions['delete'],
-        responses=drf_spectacular.lines_responses['delete'],
-        parameters=[OpenApiParameter(name='order_id',
-                                     location='path',
-                                     description='Идентификатор заказа',
-                                     examples=drf_spectacular.lines_order_id_request_examples),
-                    OpenApiParameter(name='line_item',
-                                     location='path',
-                                     description='Номер товарной позиции в заказе',
-                                     examples=drf_spectacular.lines_line_item_request_examples),
-                    ],
-    )
     def delete(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         order_id = self.kwargs['order_id']
         line_item = self.kwargs['line_item']
@@ -281,13 +199,6 @@ class OrderLineDetailView(APIView):
 
 
 class AllocateView(APIView):
-    @extend_schema(
-        tags=['Размещение товарных позиций'],
-        description=drf_spectacular.allocate_descriptions['post'],
-        responses=drf_spectacular.allocate_responses['post'],
-        request=serializers.CoilBaseModel,
-        examples=drf_spectacular.lines_request_examples,
-    )
     def post(self, request: Request) -> Response:
         order_id = request.data['order_id']
         line_item = request.data['line_item']
@@ -311,26 +222,29 @@ class AllocateView(APIView):
         return Response(data=output_data, status=200)
 
 
-class AllocateDetailView(APIView):
-    @extend_schema(
-        tags=['Размещение товарных позиций'],
-        description=drf_spectacular.allocate_descriptions['get'],
-        responses=drf_spectacular.allocate_responses['get'],
-        parameters=[OpenApiParameter(name='order_id',
-                                     location='path',
-                                     description='Идентификатор заказа',
-                                     examples=drf_spectacular.lines_order_id_request_examples),
-                    OpenApiParameter(name='line_item',
-                                     location='path',
-                                     description='Номер товарной позиции в заказе',
-                                     examples=drf_spectacular.lines_line_item_request_examples),
-                    ],
-    )
-    def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
-        order_id = self.kwargs['order_id']
-        line_item = self.kwargs['line_item']
+class AllocateSimulateView(APIView):
+    def post(self, request: Request) -> Response:
+        try:
+            input_data = parse_obj_as(list[serializers.OrderLineBaseModel], request.data)
+        except ValidationError as error:
+            output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
+            return Response(data=output_data, status=400)
+        lines = [domain_logic.OrderLine(line.order_id, line.line_item, line.product_id, line.quantity)
+                 for line in input_data]
+        simulation_result = services.simulate_allocation(
+            lines,
+            unit_of_work.ReadOnlyUnitOfWork(snapshot=True),
+        )
+        output_data = serializers.serialize_simulation_result_to_json(simulation_result)
+        return Response(data=output_data, status=200)
+
+
+class AllocateQueueView(APIView):
+    def post(self, request: Request) -> Response:
+        order_id = request.data['order_id']
+        line_item = request.data['line_item']
         try:
-            allocation_coil = services.get_an_allocation_coil(
+            ticket = services.enqueue_allocation(
                 order_id,
                 line_item,
                 unit_of_work.DjangoUnitOfWork(),
@@ -338,27 +252,39 @@ class AllocateDetailView(APIView):
         except exceptions.DBOrderLineRecordDoesNotExist as error:
             output_data = json.dumps({"message": error.message}, ensure_ascii=False)
             return Response(data=output_data, status=404)
+        output_data = serializers.serialize_ticket_to_json(ticket)
+        return Response(data=output_data, status=202, headers={'Location': f'/v1/allocate/queue/{ticket.ticket}'})
+
+
+class AllocateTicketView(APIView):
+    def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         try:
-            output_data = serializers.serialize_coil_domain_instance_to_json(allocation_coil)
+            # Заявка читается из основной базы данных, так как реплика может не содержать результат размещения
+            ticket = services.get_a_ticket(self.kwargs['ticket'], unit_of_work.DjangoUnitOfWork())
+        except exceptions.AllocationTicketDoesNotExist as error:
+            output_data = json.dumps({"message": error.message}, ensure_ascii=False)
+            return Response(data=output_data, status=404)
+        output_data = serializers.serialize_ticket_to_json(ticket)
+        return Response(data=output_data, status=200)
+
+
+class AllocateDetailView(APIView):
+    def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
+        order_id = self.kwargs['order_id']
+        line_item = self.kwargs['line_item']
+        try:
+            with db_router.replica_reads():
+                coil_row = queries.allocation_coil(order_id, line_item)
+        except exceptions.DBOrderLineRecordDoesNotExist as error:
+            output_data = json.dumps({"message": error.message}, ensure_ascii=False)
+            return Response(data=output_data, status=404)
+        try:
+            output_data = serializers.serialize_coil_row_to_json(coil_row)
         except ValidationError as error:
             output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
             return Response(data=output_data, status=403)
         return Response(data=output_data, status=200)
 
-    @extend_schema(
-        tags=['Размещение товарных позиций'],
-        description=drf_spectacular.allocate_descriptions['delete'],
-        responses=drf_spectacular.allocate_responses['delete'],
-        parameters=[OpenApiParameter(name='order_id',
-                                     location='path',
-                                     description='Идентификатор заказа',
-                                     examples=drf_spectacular.lines_order_id_request_examples),
-                    OpenApiParameter(name='line_item',
-                                     location='path',
-                                     description='Номер товарной позиции в заказе',
-                                     examples=drf_spectacular.lines_line_item_request_examples),
-                    ],
-    )
     def delete(self, request: Request, **kwargs: dict[str, Any]) -> Response:
         order_id = self.kwargs['order_id']
         line_item = self.kwargs['line_item']
@@ -377,3 +303,36 @@ class AllocateDetailView(APIView):
             output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
             return Response(data=output_data, status=403)
         return Response(data=output_data, status=200)
+
+
+class OrderAllocateView(APIView):
+    def post(self, request: Request, **kwargs: dict[str, Any]) -> Response:
+        order_id = self.kwargs['order_id']
+        try:
+            batch_allocation = services.allocate_an_order(
+                order_id,
+                unit_of_work.DjangoUnitOfWork(),
+                prefer_locality=request.query_params.get('prefer_locality') == 'true',
+            )
+        except exceptions.DBOrderRecordsDoNotExist as error:
+            output_data = json.dumps({"message": error.message}, ensure_ascii=False)
+            return Response(data=output_data, status=404)
+        output_data = serializers.serialize_batch_allocation_to_json(batch_allocation)
+        return Response(data=output_data, status=200)
+
+
+class StockFeasibleView(APIView):
+    def get(self, request: Request, **kwargs: dict[str, Any]) -> Response:
+        product_id = self.kwargs['product_id']
+        try:
+            input_data = serializers.FeasibilityQueryModel.parse_obj(request.query_params.dict())
+        except ValidationError as error:
+            output_data = json.dumps({"message": str(error)}, ensure_ascii=False)
+            return Response(data=output_data, status=400)
+        feasible_coils = services.get_feasible_coils(
+            product_id,
+            input_data.quantity,
+            unit_of_work.ReadOnlyUnitOfWork(),
+        )
+        output_data = serializers.serialize_feasible_coils_to_json(feasible_coils)
+        return Response(data=output_data, status=200)
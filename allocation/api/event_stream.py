@@ -0,0 +1,224 @@
+"""
+Поток событий размещения для клиентов (server-sent events), см. coils_and_wires/asgi.py.
+
+Запрос GET /v1/events/stream?product_id=...&coil=... открывает поток событий доменной модели
+из таблицы OutboxEventDB, относящихся к материалу product_id и (или) бухте coil. Идентификатор события
+в потоке совпадает с идентификатором записи, поэтому клиент, переподключившийся с заголовком
+Last-Event-ID, получает пропущенные события.
+
+Обработчик ASGI Django 4.0 не поддерживает асинхронную потоковую передачу ответа, поэтому поток
+реализован отдельным приложением ASGI. Новые события читает из базы данных одна задача asyncio
+на процесс (EventBroadcaster), которая работает, пока есть подписчики, и раздает события
+их очередям, поэтому неактивный подписчик не выполняет запросов к базе данных и не занимает поток.
+"""
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+
+from allocation.adapters import outbox
+from allocation.domain import events
+
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApplication = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+EVENT_STREAM_PATH = '/v1/events/stream'
+
+# Интервал (в секундах) между проверками новых событий
+POLL_INTERVAL = 1.0
+
+# Интервал (в секундах), через который подписчику отправляется комментарий, если событий нет.
+# Не позволяет прокси-серверам закрыть соединение и позволяет обнаружить отключение клиента
+KEEPALIVE_INTERVAL = 15.0
+
+# Количество событий, читаемых из базы данных за один запрос
+READ_BATCH_SIZE = 500
+
+# Количество событий, ожидающих отправки подписчику. При переполнении очереди поток закрывается,
+# и клиент переподключается с заголовком Last-Event-ID
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# Время (в миллисекундах), через которое клиент переподключается после закрытия потока
+RETRY_INTERVAL = 3000
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Подписчик потока событий с фильтрами по материалу и бухте."""
+    product_id: str | None = None
+    coil: str | None = None
+    queue: asyncio.Queue[tuple[int, events.Event] | None] = field(
+        default_factory=lambda: asyncio.Queue(SUBSCRIBER_QUEUE_SIZE))
+
+    def matches(self, event: events.Event) -> bool:
+        """Возвращает True, если событие относится к материалу и бухте подписчика."""
+        return ((self.product_id is None or getattr(event, 'product_id', None) == self.product_id)
+                and (self.coil is None or getattr(event, 'reference', None) == self.coil))
+
+    def put(self, record_id: int, event: events.Event) -> bool:
+        """
+        Добавляет событие в очередь подписчика, если оно соответствует фильтрам.
+        Возвращает False, если очередь переполнена.
+        """
+        if not self.matches(event):
+            return True
+        try:
+            self.queue.put_nowait((record_id, event))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+
+class EventBroadcaster:
+    """Читает новые события из таблицы OutboxEventDB и раздает их подписчикам процесса."""
+    def __init__(self) -> None:
+        self.subscriptions: set[Subscription] = set()
+        # Идентификатор последней прочитанной записи
+        self.last_id = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def subscribe(self, subscription: Subscription) -> None:
+        """
+        Добавляет подписчика и запускает чтение событий, если оно не запущено.
+        Чтение начинается с событий, созданных после запуска.
+        """
+        if not self.is_polling():
+            last_id = await sync_to_async(outbox.last_id)()
+            # Чтение могло быть запущено другим подписчиком во время запроса к базе данных
+            if not self.is_polling():
+                self.last_id = last_id
+                self._task = asyncio.create_task(self._poll())
+        self.subscriptions.add(subscription)
+
+    def is_polling(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    async def _poll(self) -> None:
+        """Читает новые события, пока есть подписчики."""
+        while self.subscriptions:
+            records = await sync_to_async(outbox.after)(self.last_id, READ_BATCH_SIZE)
+            for record_id, event in records:
+                for subscription in list(self.subscriptions):
+                    if not subscription.put(record_id, event):
+                        # Переполнение очереди: поток подписчика будет закрыт
+                        self.unsubscribe(subscription)
+                        subscription.queue.get_nowait()
+                        subscription.queue.put_nowait(None)
+                self.last_id = record_id
+            if len(records) < READ_BATCH_SIZE:
+                await asyncio.sleep(POLL_INTERVAL)
+
+
+broadcaster = EventBroadcaster()
+
+
+def format_event(record_id: int, event: events.Event) -> bytes:
+    """Возвращает событие в формате server-sent events."""
+    data = json.dumps(events.to_dict(event), ensure_ascii=False, separators=(',', ':'))
+    return f'id: {record_id}\nevent: {type(event).__name__}\ndata: {data}\n\n'.encode()
+
+
+async def stream(scope: Scope, receive: Receive, send: Send) -> None:
+    """Приложение ASGI, отправляющее поток событий."""
+    if scope['method'] != 'GET':
+        await send_plain_response(send, 405, 'Метод не поддерживается')
+        return
+    query = parse_qs(scope['query_string'].decode())
+    last_event_id = dict(scope['headers']).get(b'last-event-id', b'').decode() or query.get('last_event_id', [''])[0]
+    if last_event_id and not last_event_id.isdigit():
+        await send_plain_response(send, 400, 'Некорректный Last-Event-ID')
+        return
+    product_id = query['product_id'][0] if 'product_id' in query else None
+    coil = query['coil'][0] if 'coil' in query else None
+    subscription = Subscription(product_id=product_id, coil=coil)
+    # Подписка выполняется до чтения пропущенных событий, чтобы не потерять события, созданные во время чтения
+    await broadcaster.subscribe(subscription)
+    disconnected: asyncio.Future[None] = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        await send_body(send, f'retry: {RETRY_INTERVAL}\n\n'.encode())
+        sent_id = 0
+        if last_event_id:
+            sent_id = await send_missed_events(send, subscription, int(last_event_id))
+        await send_new_events(send, subscription, disconnected, sent_id)
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+    finally:
+        broadcaster.unsubscribe(subscription)
+        disconnected.cancel()
+
+
+async def send_new_events(send: Send, subscription: Subscription, disconnected: 'asyncio.Future[None]',
+                          sent_id: int) -> None:
+    """
+    Отправляет события из очереди подписчика, пока клиент не отключится или очередь не переполнится.
+    События с идентификаторами не больше sent_id уже отправлены при чтении пропущенных событий.
+    """
+    while not disconnected.done():
+        next_event: asyncio.Future[Any] = asyncio.ensure_future(subscription.queue.get())
+        await asyncio.wait({next_event, disconnected}, timeout=KEEPALIVE_INTERVAL,
+                           return_when=asyncio.FIRST_COMPLETED)
+        if not next_event.done():
+            next_event.cancel()
+            if not disconnected.done():
+                await send_body(send, b': keep-alive\n\n')
+            continue
+        record = next_event.result()
+        if record is None:
+            return
+        if record[0] > sent_id:
+            await send_body(send, format_event(*record))
+
+
+async def send_missed_events(send: Send, subscription: Subscription, last_event_id: int) -> int:
+    """
+    Отправляет события подписчика с идентификаторами больше last_event_id,
+    возвращает идентификатор последнего прочитанного события.
+    """
+    while True:
+        records = await sync_to_async(outbox.after)(last_event_id, READ_BATCH_SIZE)
+        for record_id, event in records:
+            if subscription.matches(event):
+                await send_body(send, format_event(record_id, event))
+        if records:
+            last_event_id = records[-1][0]
+        if len(records) < READ_BATCH_SIZE:
+            return last_event_id
+
+
+async def wait_for_disconnect(receive: Receive) -> None:
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_body(send: Send, body: bytes) -> None:
+    await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+
+async def send_plain_response(send: Send, status: int, message: str) -> None:
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'text/plain; charset=utf-8')]})
+    await send({'type': 'http.response.body', 'body': message.encode()})
+
+
+def with_event_stream(application: ASGIApplication) -> ASGIApplication:
+    """Возвращает приложение ASGI, которое передает запросы потока событий функции stream, остальные - application."""
+    async def router(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http' and scope['path'] == EVENT_STREAM_PATH:
+            await stream(scope, receive, send)
+        else:
+            await application(scope, receive, send)
+
+    return router
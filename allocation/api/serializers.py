@@ -1,6 +1,17 @@
+import json
+from typing import Any
+
 from pydantic import BaseModel, Field
 
-from allocation.domain.domain_logic import Coil, OrderLine, coil_validation_patterns, orderline_validation_patterns
+from allocation.adapters.allocation_queue import Ticket
+from allocation.domain.domain_logic import (
+    BatchAllocation,
+    Coil,
+    OrderLine,
+    coil_validation_patterns,
+    orderline_validation_patterns,
+)
+from allocation.domain.simulation import SimulationResult
 
 
 class CoilBaseModel(BaseModel):
@@ -17,6 +28,15 @@ class CoilBaseModel(BaseModel):
     allocations: list = []
 
 
+class FeasibilityQueryModel(BaseModel):
+    """
+    Принимает параметры запроса бухт, в которых может быть размещена товарная позиция,
+    выполняет их синтаксический анализ и проверку.
+    Генерирует ошибку ValidationError в случае несоответствия типам полей, определенных в классе.
+    """
+    quantity: int = Field(gt=0)
+
+
 class OrderLineBaseModel(BaseModel):
     """
     Принимает данные для инициализации экземпляра класса, выполняет их синтаксический анализ и проверку.
@@ -63,3 +83,70 @@ def serialize_order_line_domain_instance_to_json(domain_instance: OrderLine) ->
         quantity=domain_instance.quantity,
     )
     return model_instance.json(ensure_ascii=False)
+
+
+def serialize_coil_row_to_json(coil_row: dict[str, Any]) -> str:
+    """
+    Принимает словарь с полями бухты, полученный модулем queries, проверяет его с помощью CoilBaseModel,
+    как и функция serialize_coil_domain_instance_to_json, и сериализует словарь в объект JSON
+    без создания экземпляров классов доменной модели.
+    Товарные позиции, находящиеся в allocations, также проверяются и сериализуются в объекты JSON.
+    """
+    output_data = dict(coil_row, allocations=[serialize_order_line_row_to_json(line_row)
+                                              for line_row in coil_row['allocations']])
+    CoilBaseModel.parse_obj(output_data)
+    return json.dumps(output_data, ensure_ascii=False)
+
+
+def serialize_order_line_row_to_json(orderline_row: dict[str, Any]) -> str:
+    """
+    Принимает словарь с полями товарной позиции, полученный модулем queries, проверяет его
+    с помощью OrderLineBaseModel и сериализует в объект JSON.
+    """
+    OrderLineBaseModel.parse_obj(orderline_row)
+    return json.dumps(orderline_row, ensure_ascii=False)
+
+
+def serialize_batch_allocation_to_json(batch_allocation: BatchAllocation) -> str:
+    """
+    Принимает результат размещения нескольких товарных позиций - экземпляр класса BatchAllocation
+    доменной модели. Сериализует в объект JSON и возвращает товарные позиции с идентификаторами бухт,
+    в которых они размещены, и товарные позиции, которые не удалось разместить.
+    """
+    output_data = {
+        'allocated': [{'line': serialize_order_line_domain_instance_to_json(line), 'reference': coil.reference}
+                      for line, coil in batch_allocation.allocated.items()],
+        'out_of_stock': [serialize_order_line_domain_instance_to_json(line)
+                         for line in batch_allocation.out_of_stock],
+    }
+    return json.dumps(output_data, ensure_ascii=False)
+
+
+def serialize_simulation_result_to_json(simulation_result: SimulationResult) -> str:
+    """
+    Принимает результат моделирования размещения товарных позиций - экземпляр класса SimulationResult
+    доменной модели. Сериализует в объект JSON и возвращает товарные позиции с идентификаторами бухт,
+    в которых они были бы размещены, и товарные позиции, которые не удалось бы разместить.
+    """
+    output_data = {
+        'allocated': [{'line': serialize_order_line_domain_instance_to_json(line), 'reference': reference}
+                      for line, reference in simulation_result.allocated.items()],
+        'out_of_stock': [serialize_order_line_domain_instance_to_json(line)
+                         for line in simulation_result.out_of_stock],
+    }
+    return json.dumps(output_data, ensure_ascii=False)
+
+
+def serialize_ticket_to_json(ticket: Ticket) -> str:
+    """Принимает заявку на размещение товарной позиции, сериализует ее в объект JSON и возвращает его."""
+    return json.dumps({'ticket': ticket.ticket, 'order_id': ticket.order_id, 'line_item': ticket.line_item,
+                       'status': ticket.status, 'reference': ticket.reference}, ensure_ascii=False)
+
+
+def serialize_feasible_coils_to_json(feasible_coils: list[tuple[str, int]]) -> str:
+    """
+    Принимает пары (идентификатор бухты, доступное количество материала),
+    сериализует их в объект JSON и возвращает его.
+    """
+    return json.dumps([{'reference': reference, 'available_quantity': available_quantity}
+                       for reference, available_quantity in feasible_coils], ensure_ascii=False)
@@ -9,5 +9,10 @@ urlpatterns = [
     path('orderlines', api_views.OrderLineView.as_view()),
     path('orderlines/<str:order_id>/<str:line_item>', api_views.OrderLineDetailView.as_view()),
     path('allocate', api_views.AllocateView.as_view()),
+    path('allocate/simulate', api_views.AllocateSimulateView.as_view()),
+    path('allocate/queue', api_views.AllocateQueueView.as_view()),
+    path('allocate/queue/<str:ticket>', api_views.AllocateTicketView.as_view()),
     path('allocate/<str:order_id>/<str:line_item>', api_views.AllocateDetailView.as_view()),
+    path('orders/<str:order_id>/allocate', api_views.OrderAllocateView.as_view()),
+    path('stock/<str:product_id>/feasible', api_views.StockFeasibleView.as_view()),
 ]
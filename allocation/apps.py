@@ -1,6 +1,11 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class AllocationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'allocation'
+
+    def ready(self) -> None:
+        from allocation.adapters import sqlite
+        connection_created.connect(sqlite.set_sqlite_pragmas, dispatch_uid='allocation_sqlite_pragmas')
@@ -0,0 +1,212 @@
+from array import array
+from bisect import bisect_left, insort
+from itertools import compress
+from typing import Iterable
+
+from allocation.domain.domain_logic import Coil, OrderLine
+
+
+class CoilPool:
+    """
+    Колоночное представление бухт с одним материалом для пакетных алгоритмов:
+    моделирования, пакетного размещения, переоптимизации и отчетов.
+
+    Атрибуты бухт хранятся в параллельных массивах, i-й элемент каждого массива относится к i-й бухте.
+    Размещенные товарные позиции также хранятся в параллельных массивах, для каждой из них
+    в line_coil_indexes хранится индекс бухты, в которой она размещена.
+    """
+    def __init__(self, product_id: str) -> None:
+        # Идентификатор материала
+        self.product_id = product_id
+        # Идентификаторы бухт
+        self.references: list[str] = []
+        # Изначальное количество материала
+        self.initial_quantities = array('q')
+        # Суммарное количество материала размещенных товарных позиций
+        self.allocated_quantities = array('q')
+        # Рекомендуемый остаток материала
+        self.recommended_balances = array('q')
+        # Приемлемые потери материала
+        self.acceptable_losses = array('q')
+        # Идентификаторы (order_id, line_item) размещенных товарных позиций
+        self.line_keys: list[tuple[str, str]] = []
+        # Идентификаторы материала размещенных товарных позиций
+        self.line_product_ids: list[str] = []
+        # Количество материала размещенных товарных позиций
+        self.line_quantities = array('q')
+        # Индексы бухт, в которых размещены товарные позиции
+        self.line_coil_indexes = array('q')
+        # Позиции товарных позиций в массивах по их идентификаторам (order_id, line_item)
+        self._line_positions: dict[tuple[str, str], int] = {}
+        # Пары (доступное количество материала, индекс бухты), упорядоченные по возрастанию.
+        # Порядок совпадает с порядком перебора бухт в функции allocate_to_list_of_coils.
+        # None - после добавления бухт порядок строится одной сортировкой при первом использовании,
+        # что при загрузке пула быстрее вставки каждой бухты в упорядоченный список
+        self._sorted_keys: list[tuple[int, int]] | None = []
+        # Наименьший из рекомендуемых остатков материала, но не больше нуля.
+        # Бухты с доступным количеством материала меньше quantity + _lowest_balance заведомо не подходят
+        self._lowest_balance = 0
+
+    __slots__ = ['product_id', 'references', 'initial_quantities', 'allocated_quantities', 'recommended_balances',
+                 'acceptable_losses', 'line_keys', 'line_product_ids', 'line_quantities', 'line_coil_indexes',
+                 '_line_positions', '_sorted_keys', '_lowest_balance']
+
+    @classmethod
+    def from_coils(cls, product_id: str, coils: Iterable[Coil]) -> 'CoilPool':
+        """
+        Принимает идентификатор материала и экземпляры класса Coil доменной модели,
+        возвращает экземпляр CoilPool с бухтами, содержащими материал product_id, в порядке их следования.
+        """
+        pool = cls(product_id)
+        for coil in coils:
+            if coil.product_id != product_id:
+                continue
+            index = pool.add_coil(coil.reference, coil.initial_quantity, 0,
+                                  coil.recommended_balance, coil.acceptable_loss)
+            for line in coil.allocations:
+                pool._add_line(line.order_id, line.line_item, line.product_id, line.quantity, index)
+        return pool
+
+    def to_coils(self) -> list[Coil]:
+        """Возвращает список экземпляров класса Coil доменной модели с размещенными товарными позициями."""
+        coils = [Coil(reference, self.product_id, initial_quantity, recommended_balance, acceptable_loss)
+                 for reference, initial_quantity, recommended_balance, acceptable_loss
+                 in zip(self.references, self.initial_quantities, self.recommended_balances, self.acceptable_losses)]
+        for (order_id, line_item), product_id, quantity, index in zip(self.line_keys, self.line_product_ids,
+                                                                      self.line_quantities, self.line_coil_indexes):
+            coils[index].allocations.add(OrderLine(order_id, line_item, product_id, quantity))
+        return coils
+
+    def add_coil(self, reference: str, initial_quantity: int, allocated_quantity: int,
+                 recommended_balance: int, acceptable_loss: int) -> int:
+        """
+        Добавляет бухту с заданными атрибутами, возвращает ее индекс.
+        Товарные позиции, составляющие allocated_quantity, могут не добавляться в пул, если они
+        не нужны алгоритму, например, при моделировании размещения.
+        """
+        index = len(self.references)
+        self.references.append(reference)
+        self.initial_quantities.append(initial_quantity)
+        self.allocated_quantities.append(allocated_quantity)
+        self.recommended_balances.append(recommended_balance)
+        self.acceptable_losses.append(acceptable_loss)
+        self._sorted_keys = None
+        self._lowest_balance = min(self._lowest_balance, recommended_balance)
+        return index
+
+    def available_quantities(self) -> array:
+        """Возвращает массив доступного количества материала бухт."""
+        return array('q', (initial_quantity - allocated_quantity for initial_quantity, allocated_quantity
+                           in zip(self.initial_quantities, self.allocated_quantities)))
+
+    def can_allocate(self, quantity: int) -> list[bool]:
+        """
+        Принимает количество материала товарной позиции, за один проход по массивам определяет
+        для каждой из бухт возможность размещения товарной позиции по условиям метода Coil.can_allocate.
+        """
+        return self._can_allocate(quantity, self.available_quantities())
+
+    def feasible(self, quantity: int) -> list[int]:
+        """
+        Принимает количество материала товарной позиции, возвращает индексы всех бухт, в которых
+        может быть размещена товарная позиция, в порядке их перебора функцией allocate_to_list_of_coils:
+        по возрастанию доступного количества материала, при равенстве - в порядке следования бухт.
+        """
+        available_quantities = self.available_quantities()
+        indexes = list(compress(range(len(available_quantities)),
+                                self._can_allocate(quantity, available_quantities)))
+        indexes.sort(key=available_quantities.__getitem__)
+        return indexes
+
+    def best_fit(self, quantity: int) -> int | None:
+        """
+        Принимает количество материала товарной позиции, возвращает индекс бухты с наименьшим доступным
+        количеством материала, в которой может быть размещена товарная позиция, или None, если такой бухты нет.
+        Выбор совпадает с выбором функции allocate_to_list_of_coils.
+        """
+        sorted_keys = self._get_sorted_keys()
+        start = bisect_left(sorted_keys, (quantity + self._lowest_balance, -1))
+        # Перебор по позициям без копирования хвоста списка срезом
+        for position in range(start, len(sorted_keys)):
+            available_quantity, index = sorted_keys[position]
+            balance = available_quantity - quantity
+            if balance >= self.recommended_balances[index] or self.acceptable_losses[index] >= balance >= 0:
+                return index
+        return None
+
+    def allocation_index(self, order_id: str, line_item: str) -> int | None:
+        """Возвращает индекс бухты, в которой размещена товарная позиция, или None, если она не размещена."""
+        position = self._line_positions.get((order_id, line_item))
+        return None if position is None else self.line_coil_indexes[position]
+
+    def allocate(self, line: OrderLine) -> int | None:
+        """
+        Принимает экземпляр товарной позиции, размещает ее так же, как функция allocate_to_list_of_coils.
+        Возвращает индекс бухты, в которой размещена товарная позиция, или None, если разместить ее невозможно.
+        """
+        index = self.allocation_index(line.order_id, line.line_item)
+        if index is not None:
+            return index
+        if line.product_id != self.product_id:
+            return None
+        index = self.best_fit(line.quantity)
+        if index is not None:
+            self._add_line(line.order_id, line.line_item, line.product_id, line.quantity, index)
+        return index
+
+    def deallocate(self, order_id: str, line_item: str) -> int | None:
+        """
+        Отменяет размещение товарной позиции, возвращает индекс бухты, в которой она была размещена,
+        или None, если товарная позиция не была размещена.
+        """
+        position = self._line_positions.pop((order_id, line_item), None)
+        if position is None:
+            return None
+        index = self.line_coil_indexes[position]
+        self.change_allocated_quantity(index, -self.line_quantities[position])
+        # Перемещение последней товарной позиции на место удаленной
+        last_position = len(self.line_keys) - 1
+        if position != last_position:
+            self.line_keys[position] = self.line_keys[last_position]
+            self.line_product_ids[position] = self.line_product_ids[last_position]
+            self.line_quantities[position] = self.line_quantities[last_position]
+            self.line_coil_indexes[position] = self.line_coil_indexes[last_position]
+            self._line_positions[self.line_keys[position]] = position
+        self.line_keys.pop()
+        self.line_product_ids.pop()
+        self.line_quantities.pop()
+        self.line_coil_indexes.pop()
+        return index
+
+    def change_allocated_quantity(self, index: int, delta: int) -> None:
+        """
+        Изменяет суммарное количество материала размещенных товарных позиций бухты с индексом index.
+        Позволяет учитывать размещение без сохранения товарной позиции в пуле.
+        """
+        available_quantity = self.initial_quantities[index] - self.allocated_quantities[index]
+        self.allocated_quantities[index] += delta
+        if self._sorted_keys is not None:
+            del self._sorted_keys[bisect_left(self._sorted_keys, (available_quantity, index))]
+            insort(self._sorted_keys, (available_quantity - delta, index))
+
+    def _get_sorted_keys(self) -> list[tuple[int, int]]:
+        """Возвращает упорядоченные пары (доступное количество материала, индекс бухты), строит их при необходимости."""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(zip(self.available_quantities(), range(len(self.references))))
+        return self._sorted_keys
+
+    def _can_allocate(self, quantity: int, available_quantities: array) -> list[bool]:
+        """Проверяет возможность размещения товарной позиции для каждой из бухт при заданном доступном количестве."""
+        return [balance >= recommended_balance or acceptable_loss >= balance >= 0
+                for balance, recommended_balance, acceptable_loss
+                in zip((available_quantity - quantity for available_quantity in available_quantities),
+                       self.recommended_balances, self.acceptable_losses)]
+
+    def _add_line(self, order_id: str, line_item: str, product_id: str, quantity: int, index: int) -> None:
+        """Добавляет товарную позицию, размещенную в бухте с индексом index."""
+        self._line_positions[(order_id, line_item)] = len(self.line_keys)
+        self.line_keys.append((order_id, line_item))
+        self.line_product_ids.append(product_id)
+        self.line_quantities.append(quantity)
+        self.line_coil_indexes.append(index)
+        self.change_allocated_quantity(index, quantity)
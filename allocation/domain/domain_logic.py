@@ -1,9 +1,20 @@
-from copy import deepcopy
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
 
+from allocation.domain import events
 from allocation.exceptions import exceptions
 
 
+# Ограничение времени (в секундах) на поиск оптимального переразмещения товарных позиций
+# при обновлении бухты, см. функцию optimal_reallocation
+REALLOCATION_TIME_BUDGET = 0.05
+# Наибольшее произведение доступного количества материала бухты на количество товарных позиций,
+# при котором выполняется поиск оптимального переразмещения: битовые маски достижимых сумм
+# занимают не более REALLOCATION_MAX_BITS / 8 байт памяти
+REALLOCATION_MAX_BITS = 2 ** 24
+
+
 class OrderLine:
     """Абстракция товарной позиции - элемента заказа материалов (проводов, кабелей)."""
     def __init__(self, order_id: str, line_item: str, product_id: str, quantity: int):
@@ -15,8 +26,11 @@ class OrderLine:
         self.product_id = product_id
         # Количество материала
         self.quantity = quantity
+        # Хэш идентификаторов (order_id, line_item), вычисляется однократно.
+        # Идентификаторы товарной позиции не изменяются после ее создания
+        self._hash = hash((order_id, line_item))
 
-    __slots__ = ['order_id', 'line_item', 'product_id', 'quantity']
+    __slots__ = ['order_id', 'line_item', 'product_id', 'quantity', '_hash']
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, OrderLine):
@@ -24,7 +38,7 @@ class OrderLine:
         return self.order_id == other.order_id and self.line_item == other.line_item
 
     def __hash__(self) -> int:
-        return hash(self.order_id + self.line_item)
+        return self._hash
 
 
 class Coil:
@@ -48,9 +62,11 @@ class Coil:
         self.acceptable_loss = acceptable_loss
         # Множество экземпляров размещенных товарных позиций
         self.allocations: set[OrderLine] = set()
+        # События, возникшие при изменении бухты и еще не сохраненные, см. модуль events
+        self.events: list[events.Event] = []
 
     __slots__ = ['reference', 'product_id', 'initial_quantity',
-                 'recommended_balance', 'acceptable_loss', 'allocations']
+                 'recommended_balance', 'acceptable_loss', 'allocations', 'events']
 
     @property
     def allocated_quantity(self) -> int:
@@ -65,34 +81,93 @@ class Coil:
     def can_allocate(self, line: OrderLine) -> bool:
         """Принимает экземпляр товарной позиции, определяет возможность ее размещения в бухте."""
         is_product_ids_match = self.product_id == line.product_id
-        is_balance_bigger_recommended_balance = (self.available_quantity - line.quantity) >= self.recommended_balance
-        is_balance_smaller_acceptable_loss_and_bigger_zero = \
-            self.acceptable_loss >= (self.available_quantity - line.quantity) >= 0
-        result = is_product_ids_match and (is_balance_bigger_recommended_balance
-                                           or is_balance_smaller_acceptable_loss_and_bigger_zero)
-        return result
+        return is_product_ids_match and self.is_acceptable_balance(self.available_quantity - line.quantity)
+
+    def is_acceptable_balance(self, balance: int) -> bool:
+        """
+        Принимает остаток материала в бухте после размещения товарной позиции,
+        определяет, допустим ли такой остаток.
+        """
+        is_balance_bigger_recommended_balance = balance >= self.recommended_balance
+        is_balance_smaller_acceptable_loss_and_bigger_zero = self.acceptable_loss >= balance >= 0
+        return is_balance_bigger_recommended_balance or is_balance_smaller_acceptable_loss_and_bigger_zero
 
     def allocate(self, line: OrderLine) -> None:
         """Принимает экземпляр товарной позиции, размещает ее в бухте."""
         if self.can_allocate(line):
             self.allocations.add(line)
+            self.events.append(events.Allocated(line.order_id, line.line_item, line.product_id,
+                                                line.quantity, self.reference))
 
     def deallocate(self, line: OrderLine) -> None:
         """Принимает экземпляр товарной позиции, отменяет ее размещение в бухте."""
         if line in self.allocations:
             self.allocations.discard(line)
+            self.record_deallocation(line)
 
-    def reallocate(self, coil: 'Coil') -> set[OrderLine]:
+    def record_deallocation(self, line: OrderLine) -> None:
+        """
+        Принимает экземпляр товарной позиции, которая перестала быть размещенной в бухте
+        при ее обновлении или удалении, добавляет событие Deallocated.
+        """
+        self.events.append(events.Deallocated(line.order_id, line.line_item, line.product_id,
+                                              line.quantity, self.reference))
+
+    def record_creation(self) -> None:
+        """Добавляет событие CoilAdded для новой бухты."""
+        self.events.append(events.CoilAdded(self.reference, self.product_id, self.initial_quantity,
+                                            self.recommended_balance, self.acceptable_loss))
+
+    def record_update(self, previous: 'Coil') -> None:
+        """
+        Принимает прежнее состояние бухты, добавляет события CoilQuantityChanged и CoilUpdated,
+        если изменились количество материала и остальные атрибуты бухты, кроме размещенных товарных позиций.
+        """
+        attributes = (self.product_id, self.initial_quantity, self.recommended_balance, self.acceptable_loss)
+        previous_attributes = (previous.product_id, previous.initial_quantity,
+                               previous.recommended_balance, previous.acceptable_loss)
+        if self.initial_quantity != previous.initial_quantity:
+            self.events.append(events.CoilQuantityChanged(self.reference, self.product_id, self.initial_quantity))
+        if attributes != previous_attributes:
+            self.events.append(events.CoilUpdated(self.reference, *attributes))
+
+    def record_deletion(self) -> None:
+        """Добавляет события Deallocated для размещенных товарных позиций и событие CoilDeleted."""
+        for line in self.allocations:
+            self.record_deallocation(line)
+        self.events.append(events.CoilDeleted(self.reference, self.product_id))
+
+    def reallocate(self, coil: 'Coil', optimize: bool = False,
+                   time_budget: float = REALLOCATION_TIME_BUDGET) -> set[OrderLine]:
         """
         Принимает экземпляр бухты. Среди товарных позиций, размещенных в бухте (self),
         для которой вызван метод, определяет те, которые могут быть размещены
         в бухте (coil) - аргументе метода.
+
+        Товарные позиции перебираются в порядке возрастания количества материала, возможность
+        размещения проверяется по тем же условиям, что и в методе can_allocate, но с использованием
+        доступного количества материала, которое уменьшается по мере размещения. Бухта coil
+        при этом не изменяется и не копируется.
+
+        При optimize=True определяет множество товарных позиций с наибольшим суммарным количеством
+        материала, см. функцию optimal_reallocation. Если за время time_budget (в секундах)
+        решение не найдено или количество материала бухты слишком велико для поиска решения,
+        то используется описанный выше порядок перебора.
         """
-        new_coil = deepcopy(coil)
-        sorted_line_list = sorted(self.allocations, key=lambda x: x.quantity)
-        for line in sorted_line_list:
-            new_coil.allocate(line)
-        return new_coil.allocations
+        if optimize:
+            optimal_lines = optimal_reallocation(self.allocations, coil, time_budget)
+            if optimal_lines is not None:
+                return optimal_lines
+        reallocated_lines = set(coil.allocations)
+        available_quantity = coil.available_quantity
+        for line in sorted(self.allocations, key=lambda x: x.quantity):
+            if line in reallocated_lines or line.product_id != coil.product_id:
+                continue
+            balance = available_quantity - line.quantity
+            if coil.is_acceptable_balance(balance):
+                reallocated_lines.add(line)
+                available_quantity = balance
+        return reallocated_lines
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Coil):
@@ -129,6 +204,143 @@ def allocate_to_list_of_coils(line: OrderLine, coils: list[Coil]) -> Coil:
         raise exceptions.OutOfStock(line.product_id)
 
 
+@dataclass
+class BatchAllocation:
+    """Результат размещения нескольких товарных позиций в бухтах списка."""
+    # Бухты, в которых размещены товарные позиции
+    allocated: dict[OrderLine, Coil] = field(default_factory=dict)
+    # Товарные позиции, которые не удалось разместить из-за недостаточного количества материала
+    out_of_stock: set[OrderLine] = field(default_factory=set)
+
+
+def allocate_lines_to_list_of_coils(lines: Iterable[OrderLine], coils: list[Coil],
+                                    prefer_locality: bool = False) -> BatchAllocation:
+    """
+    Принимает товарные позиции и список экземпляров бухт, размещает товарные позиции в бухтах списка.
+    Возвращает экземпляр BatchAllocation с бухтами, в которых размещены товарные позиции,
+    и товарными позициями, которые не удалось разместить.
+
+    Товарные позиции, уже размещенные в одной из бухт списка, остаются в ней. Остальные размещаются
+    в порядке убывания количества материала, каждая из них - так же, как в функции allocate_to_list_of_coils.
+    Доступное количество материала бухт вычисляется однократно и обновляется по мере размещения.
+
+    При prefer_locality=True товарные позиции с одинаковым материалом размещаются в возможно
+    меньшем количестве бухт: предпочтение отдается бухтам, в которых уже размещены товарные позиции
+    с этим материалом, а если таких нет - бухтам, в которых поместятся все оставшиеся товарные позиции
+    с этим материалом.
+    """
+    result = BatchAllocation()
+    available_quantities = [coil.available_quantity for coil in coils]
+    # Индексы бухт, в которых размещены товарные позиции, для каждого из материалов
+    used_indexes: dict[str, set[int]] = {}
+    pending_lines = []
+    for line in lines:
+        allocation_index = next((index for index, coil in enumerate(coils) if line in coil.allocations), None)
+        if allocation_index is None:
+            pending_lines.append(line)
+        else:
+            result.allocated[line] = coils[allocation_index]
+            used_indexes.setdefault(line.product_id, set()).add(allocation_index)
+    pending_lines.sort(key=lambda x: x.quantity, reverse=True)
+    for position, line in enumerate(pending_lines):
+        suitable_indexes = [index for index, coil in enumerate(coils) if coil.product_id == line.product_id
+                            and coil.is_acceptable_balance(available_quantities[index] - line.quantity)]
+        if prefer_locality:
+            remaining_quantities = [other_line.quantity for other_line in pending_lines[position:]
+                                    if other_line.product_id == line.product_id]
+            suitable_indexes = _local_coil_indexes(suitable_indexes, used_indexes.get(line.product_id, set()),
+                                                   coils, available_quantities, remaining_quantities)
+        if not suitable_indexes:
+            result.out_of_stock.add(line)
+            continue
+        best_index = min(suitable_indexes, key=lambda x: available_quantities[x])
+        coils[best_index].allocate(line)
+        available_quantities[best_index] -= line.quantity
+        used_indexes.setdefault(line.product_id, set()).add(best_index)
+        result.allocated[line] = coils[best_index]
+    return result
+
+
+def _local_coil_indexes(suitable_indexes: list[int], used_indexes: set[int], coils: list[Coil],
+                        available_quantities: list[int], remaining_quantities: list[int]) -> list[int]:
+    """
+    Отбирает среди индексов подходящих бухт индексы бухт, которые уже использованы для материала,
+    либо, если таких нет, индексы бухт, в которых поместятся все оставшиеся товарные позиции с материалом.
+    Если отобрать бухты не удалось, то возвращает индексы всех подходящих бухт.
+    """
+    local_indexes = [index for index in suitable_indexes if index in used_indexes]
+    if local_indexes:
+        return local_indexes
+    whole_indexes = [index for index in suitable_indexes
+                     if _can_allocate_quantities(coils[index], available_quantities[index], remaining_quantities)]
+    return whole_indexes or suitable_indexes
+
+
+def _can_allocate_quantities(coil: Coil, available_quantity: int, quantities: list[int]) -> bool:
+    """
+    Определяет, могут ли товарные позиции с количествами материала quantities быть последовательно
+    размещены в бухте с доступным количеством материала available_quantity.
+    """
+    for quantity in quantities:
+        available_quantity -= quantity
+        if not coil.is_acceptable_balance(available_quantity):
+            return False
+    return True
+
+
+def optimal_reallocation(lines: Iterable[OrderLine], coil: Coil,
+                         time_budget: float = REALLOCATION_TIME_BUDGET) -> set[OrderLine] | None:
+    """
+    Принимает товарные позиции и экземпляр бухты. Определяет множество товарных позиций, которые
+    могут быть размещены в бухте вместе с уже размещенными в ней, так, чтобы суммарное количество
+    материала размещенных товарных позиций было наибольшим. Остаток материала в бухте после размещения
+    должен быть больше или равен рекомендуемому остатку, либо находиться в пределах от нуля
+    до приемлемых потерь материала.
+
+    Задача решается как задача о рюкзаке: множество достижимых сумм количеств материала хранится
+    в виде битовой маски целого числа. При равных суммах предпочтение отдается товарным позициям
+    с меньшим количеством материала, т.е. размещенными остается большее число товарных позиций.
+
+    Возвращает None, если решение не найдено за время time_budget (в секундах) или если размер битовых масок
+    превышает REALLOCATION_MAX_BITS.
+    """
+    deadline = time.perf_counter() + time_budget
+    capacity = coil.available_quantity
+    sorted_lines = sorted((line for line in lines
+                           if line not in coil.allocations and line.product_id == coil.product_id
+                           and 0 < line.quantity <= capacity),
+                          key=lambda x: x.quantity)
+    if capacity <= 0 or not sorted_lines:
+        return set(coil.allocations)
+    # Ограничение памяти и времени, занимаемых битовыми масками, до их создания
+    if (capacity + 1) * len(sorted_lines) > REALLOCATION_MAX_BITS:
+        return None
+    # i-й бит маски равен единице, если сумма i достижима
+    mask = (1 << (capacity + 1)) - 1
+    reachable = 1
+    # Маски достижимых сумм до добавления каждой из товарных позиций, используются для восстановления решения
+    history = []
+    for line in sorted_lines:
+        if time.perf_counter() > deadline:
+            return None
+        history.append(reachable)
+        reachable = (reachable | (reachable << line.quantity)) & mask
+    # Наибольшая сумма, при которой остаток находится в пределах от нуля до приемлемых потерь
+    lower_bound = max(capacity - coil.acceptable_loss, 0)
+    loss_total = lower_bound + (reachable >> lower_bound).bit_length() - 1
+    # Наибольшая сумма, при которой остаток больше или равен рекомендуемому остатку
+    upper_bound = capacity - coil.recommended_balance
+    balance_total = (reachable & ((1 << (upper_bound + 1)) - 1)).bit_length() - 1 if upper_bound >= 0 else -1
+    total = max(loss_total if loss_total >= lower_bound else -1, balance_total, 0)
+    # Восстановление множества товарных позиций, начиная с наибольших по количеству материала
+    reallocated_lines = set(coil.allocations)
+    for line, previous in zip(reversed(sorted_lines), reversed(history)):
+        if not (previous >> total) & 1:
+            reallocated_lines.add(line)
+            total -= line.quantity
+    return reallocated_lines
+
+
 # Значения используются для (де)сериализации и валидации данных,
 # которые получены из тела запроса клиента или возвращаются клиенту в ответе
 coil_validation_patterns = {'reference': '^(Бухта|fake)'}
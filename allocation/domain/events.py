@@ -0,0 +1,84 @@
+"""
+События доменной модели. События добавляются в атрибут events бухты при изменении ее размещений
+и сохраняются в таблицу OutboxEventDB в одной транзакции с изменениями, см. DjangoUnitOfWork.commit().
+"""
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Event:
+    """Базовый класс событий доменной модели."""
+
+
+@dataclass(frozen=True)
+class Allocated(Event):
+    """Товарная позиция размещена в бухте."""
+    order_id: str
+    line_item: str
+    product_id: str
+    quantity: int
+    reference: str
+
+
+@dataclass(frozen=True)
+class Deallocated(Event):
+    """Отменено размещение товарной позиции в бухте, в том числе при обновлении или удалении бухты."""
+    order_id: str
+    line_item: str
+    product_id: str
+    quantity: int
+    reference: str
+
+
+@dataclass(frozen=True)
+class CoilQuantityChanged(Event):
+    """Изменено изначальное количество материала в бухте."""
+    reference: str
+    product_id: str
+    quantity: int
+
+
+@dataclass(frozen=True)
+class CoilAdded(Event):
+    """Добавлена бухта."""
+    reference: str
+    product_id: str
+    quantity: int
+    recommended_balance: int
+    acceptable_loss: int
+
+
+@dataclass(frozen=True)
+class CoilUpdated(Event):
+    """Изменены атрибуты бухты, кроме размещенных товарных позиций."""
+    reference: str
+    product_id: str
+    quantity: int
+    recommended_balance: int
+    acceptable_loss: int
+
+
+@dataclass(frozen=True)
+class CoilDeleted(Event):
+    """Удалена бухта. Отмена размещения ее товарных позиций передается событиями Deallocated."""
+    reference: str
+    product_id: str
+
+
+# Классы событий по их именам, используемым при сохранении событий
+EVENT_TYPES: dict[str, type[Event]] = {
+    event_type.__name__: event_type
+    for event_type in (Allocated, Deallocated, CoilQuantityChanged, CoilAdded, CoilUpdated, CoilDeleted)
+}
+
+
+def to_dict(event: Event) -> dict[str, Any]:
+    """Возвращает словарь с именем класса события (type) и его полями."""
+    return {'type': type(event).__name__, **asdict(event)}
+
+
+def from_dict(data: dict[str, Any]) -> Event:
+    """Принимает словарь, полученный функцией to_dict, возвращает событие."""
+    fields = dict(data)
+    return EVENT_TYPES[fields.pop('type')](**fields)
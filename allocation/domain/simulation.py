@@ -0,0 +1,62 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from allocation.domain.coil_pool import CoilPool
+from allocation.domain.domain_logic import OrderLine
+
+
+class WarehouseSnapshot:
+    """
+    Снимок состояния склада, загруженный из базы данных однократно, для моделирования размещения
+    товарных позиций без изменения базы данных.
+    """
+    def __init__(self) -> None:
+        # Бухты для каждого из материалов
+        self.products: dict[str, CoilPool] = {}
+        # Идентификаторы бухт, в которых размещены товарные позиции, по идентификаторам (order_id, line_item)
+        self.allocations: dict[tuple[str, str], str] = {}
+
+    __slots__ = ['products', 'allocations']
+
+    def add_coil(self, reference: str, product_id: str, available_quantity: int,
+                 recommended_balance: int, acceptable_loss: int) -> None:
+        """Добавляет бухту с заданными атрибутами в снимок."""
+        pool = self.products.get(product_id)
+        if pool is None:
+            pool = self.products[product_id] = CoilPool(product_id)
+        # Товарные позиции, размещенные в бухте, не нужны для моделирования, учитывается только их количество
+        pool.add_coil(reference, available_quantity, 0, recommended_balance, acceptable_loss)
+
+
+@dataclass
+class SimulationResult:
+    """Результат моделирования размещения товарных позиций."""
+    # Идентификаторы бухт, в которых были бы размещены товарные позиции
+    allocated: dict[OrderLine, str] = field(default_factory=dict)
+    # Товарные позиции, которые не удалось бы разместить из-за недостаточного количества материала
+    out_of_stock: list[OrderLine] = field(default_factory=list)
+
+
+def simulate_allocation(lines: Iterable[OrderLine], snapshot: WarehouseSnapshot) -> SimulationResult:
+    """
+    Принимает товарные позиции и снимок состояния склада, моделирует последовательное размещение
+    товарных позиций в заданном порядке. Результат совпадает с результатом последовательного вызова
+    функции allocate_to_list_of_coils. Снимок изменяется в процессе моделирования.
+    """
+    result = SimulationResult()
+    for line in lines:
+        key = (line.order_id, line.line_item)
+        reference = snapshot.allocations.get(key)
+        if reference is None:
+            pool = snapshot.products.get(line.product_id)
+            if pool is not None:
+                index = pool.best_fit(line.quantity)
+                if index is not None:
+                    pool.change_allocated_quantity(index, line.quantity)
+                    reference = pool.references[index]
+        if reference is None:
+            result.out_of_stock.append(line)
+        else:
+            snapshot.allocations[key] = reference
+            result.allocated[line] = reference
+    return result
@@ -42,6 +42,19 @@ class DBOrderLineRecordDoesNotExist(Exception):
                        f' отсутствует в таблице OrderLineDB базы данных'
 
 
+@dataclass
+class DBOrderRecordsDoNotExist(Exception):
+    """
+    Исключение возникает при обращении к записям с идентификатором order_id таблицы OrderLine базы данных,
+    в случае, если записей с таким идентификатором в таблице не существует.
+    """
+    order_id: str
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.message = f'Записи с order_id={self.order_id} отсутствуют в таблице OrderLineDB базы данных'
+
+
 @dataclass
 class DBCoilRecordAlreadyExist(Exception):
     """
@@ -68,3 +81,29 @@ class DBOrderLineRecordAlreadyExist(Exception):
     def __post_init__(self) -> None:
         self.message = f'Запись с order_id={self.order_id} и line_item={self.line_item}' \
                        f' уже существует в таблице OrderLineDB базы данных'
+
+
+@dataclass
+class ReadOnlyUnitOfWorkViolation(Exception):
+    """
+    Исключение возникает при попытке изменить данные или зафиксировать изменения
+    с помощью Unit of Work, предназначенного только для чтения.
+    """
+    operation: str
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.message = f'Операция {self.operation} недоступна в Unit of Work только для чтения'
+
+
+@dataclass
+class AllocationTicketDoesNotExist(Exception):
+    """
+    Исключение возникает при обращении к заявке на размещение с идентификатором ticket,
+    в случае, если заявки с таким идентификатором не существует.
+    """
+    ticket: str
+    message: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.message = f'Заявка на размещение с ticket={self.ticket} отсутствует в таблице AllocationTicketDB'
@@ -0,0 +1,39 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from allocation.adapters import webhook
+from allocation.domain import events
+from allocation.services import messagebus
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003, VNE003
+        'Доставляет события доменной модели из таблицы OutboxEventDB зарегистрированным обработчикам '
+        'и на адрес ALLOCATION_EVENTS_WEBHOOK_URL, если он задан'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Интервал (в секундах) между проверками новых событий. '
+                                 'При 0 события доставляются один раз')
+        parser.add_argument('--batch-size', type=int, default=messagebus.DISPATCH_BATCH_SIZE,
+                            help='Количество событий, доставляемых обработчикам за один раз')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if settings.ALLOCATION_EVENTS_WEBHOOK_URL:
+            handler = webhook.WebhookHandler(settings.ALLOCATION_EVENTS_WEBHOOK_URL)
+            for event_type in events.EVENT_TYPES.values():
+                messagebus.register(event_type, handler)
+        while True:
+            dispatched = 0
+            # Доставка всех накопившихся событий пакетами
+            while count := messagebus.dispatch_pending(options['batch_size']):
+                dispatched += count
+            if dispatched:
+                self.stdout.write(f'Доставлено событий: {dispatched}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
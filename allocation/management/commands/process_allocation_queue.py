@@ -0,0 +1,46 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from allocation.adapters import allocation_queue
+from allocation.services import services, unit_of_work
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003, VNE003
+        'Размещает товарные позиции заявок из таблицы AllocationTicketDB пакетами по материалу. '
+        'Одновременно может работать несколько обработчиков'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Интервал (в секундах) между проверками новых заявок. '
+                                 'При 0 заявки обрабатываются один раз')
+        parser.add_argument('--batch-size', type=int, default=allocation_queue.QUEUE_BATCH_SIZE,
+                            help='Наибольшее количество заявок в пакете')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            processed = 0
+            # Обработка всех ожидающих заявок. Проверка только читает записи,
+            # поэтому обработчик без заявок не получает блокировку записи
+            while services.has_queued(unit_of_work.DjangoUnitOfWork()):
+                processed += self._allocate_batch(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано заявок: {processed}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _allocate_batch(self, batch_size: int) -> int:
+        """
+        Обрабатывает пакет заявок, возвращает количество обработанных заявок.
+        Ошибка обработки пакета выводится и не останавливает обработчик: неудачная попытка сохраняется
+        в заявках, и после allocation_queue.MAX_ATTEMPTS попыток заявка больше не обрабатывается.
+        """
+        try:
+            return len(services.allocate_queued(unit_of_work.DjangoUnitOfWork(), batch_size))
+        except Exception as error:
+            self.stderr.write(f'Ошибка обработки пакета заявок: {error!r}')
+            return 0
@@ -0,0 +1,49 @@
+import sqlite3
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003, VNE003
+        'Копирует основную базу данных SQLite в файл реплики (DATABASE_REPLICA_ALIAS) '
+        'с помощью API резервного копирования SQLite'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Интервал (в секундах) между копированиями. При 0 копирование выполняется один раз')
+        parser.add_argument('--source', type=str, default='',
+                            help='Файл основной базы данных. По умолчанию - NAME базы данных default')
+        parser.add_argument('--replica', type=str, default='',
+                            help='Файл реплики. По умолчанию - NAME базы данных DATABASE_REPLICA_ALIAS')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        replica = settings.DATABASES.get(settings.DATABASE_REPLICA_ALIAS)
+        if replica is None and not options['replica']:
+            raise CommandError('Реплика не настроена, задайте переменную окружения DJANGO_REPLICA_DB_NAME')
+        source_name = options['source'] or str(settings.DATABASES[DEFAULT_DB_ALIAS]['NAME'])
+        replica_name = options['replica'] or str(replica['NAME'])
+        while True:
+            self.copy_database(source_name, replica_name)
+            self.stdout.write(f'Реплика {replica_name} обновлена')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def copy_database(source_name: str, replica_name: str) -> None:
+        """
+        Копирует базу данных source_name в replica_name. Копирование выполняется постранично
+        и не блокирует запись в основную базу данных, читатели реплики видят согласованное состояние.
+        """
+        source = sqlite3.connect(source_name)
+        replica = sqlite3.connect(replica_name)
+        try:
+            source.backup(replica)
+        finally:
+            replica.close()
+            source.close()
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.6 on 2026-10-19 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coildb',
+            name='product_id',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='Идентификатор материала'),
+        ),
+    ]
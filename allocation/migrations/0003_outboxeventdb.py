@@ -0,0 +1,27 @@
+# Generated by Django 4.0.6 on 2026-10-19 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0002_coildb_product_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEventDB',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=255, verbose_name='Тип события')),
+                ('payload', models.JSONField(verbose_name='Данные события')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Время создания')),
+                ('dispatched_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Время доставки')),
+            ],
+            options={
+                'verbose_name': 'Событие',
+                'verbose_name_plural': 'События',
+            },
+        ),
+    ]
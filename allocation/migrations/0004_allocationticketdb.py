@@ -0,0 +1,37 @@
+# Generated by Django 4.0.6 on 2026-10-19 15:57
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0003_outboxeventdb'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AllocationTicketDB',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket', models.UUIDField(default=uuid.uuid4, unique=True, verbose_name='Идентификатор заявки')),
+                ('order_id', models.CharField(max_length=255, verbose_name='Идентификатор заказа')),
+                ('line_item', models.CharField(max_length=255, verbose_name='Идентификатор товарной позиции в заказе')),
+                ('product_id', models.CharField(max_length=255, verbose_name='Идентификатор материала')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает размещения'), ('allocated', 'Размещена'), ('out_of_stock', 'Недостаточно материала'), ('not_found', 'Товарная позиция отсутствует')], default='pending', max_length=20, verbose_name='Состояние заявки')),
+                ('reference', models.CharField(blank=True, max_length=255, verbose_name='Идентификатор бухты')),
+                ('batch', models.UUIDField(blank=True, null=True, verbose_name='Идентификатор пакета')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Время создания')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Время обработки')),
+            ],
+            options={
+                'verbose_name': 'Заявка на размещение',
+                'verbose_name_plural': 'Заявки на размещение',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='allocationticketdb',
+            index=models.Index(fields=['status', 'product_id'], name='allocation_ticket_status_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.6 on 2026-10-19 16:01
+
+import zlib
+
+from django.db import migrations, models
+
+
+def fill_product_hash(apps, schema_editor):
+    AllocationTicketDB = apps.get_model('allocation', 'AllocationTicketDB')
+    tickets = list(AllocationTicketDB.objects.filter(status='pending'))
+    for ticket in tickets:
+        ticket.product_hash = zlib.crc32(ticket.product_id.encode())
+    AllocationTicketDB.objects.bulk_update(tickets, ['product_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0004_allocationticketdb'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='allocationticketdb',
+            name='product_hash',
+            field=models.BigIntegerField(default=0, verbose_name='Хэш идентификатора материала'),
+        ),
+        migrations.RunPython(fill_product_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.0.6 on 2026-10-19 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0005_allocationticketdb_product_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coildb',
+            name='reference',
+            field=models.CharField(db_index=True, max_length=255, verbose_name='Идентификатор бухты'),
+        ),
+        migrations.AddIndex(
+            model_name='orderlinedb',
+            index=models.Index(fields=['order_id', 'line_item'], name='allocation_orderline_idx'),
+        ),
+    ]
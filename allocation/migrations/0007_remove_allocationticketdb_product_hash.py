@@ -0,0 +1,17 @@
+# Generated by Django 4.0.6 on 2026-10-19 16:55
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0006_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='allocationticketdb',
+            name='product_hash',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.6 on 2026-10-19 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('allocation', '0007_remove_allocationticketdb_product_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='allocationticketdb',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество неудачных попыток обработки'),
+        ),
+        migrations.AlterField(
+            model_name='allocationticketdb',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает размещения'), ('allocated', 'Размещена'), ('out_of_stock', 'Недостаточно материала'), ('not_found', 'Товарная позиция отсутствует'), ('failed', 'Ошибка обработки')], default='pending', max_length=20, verbose_name='Состояние заявки'),
+        ),
+    ]
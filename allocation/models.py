@@ -1,9 +1,11 @@
+import uuid
+
 from django.db import models
 
 
 class CoilDB(models.Model):
-    reference = models.CharField(max_length=255, verbose_name='Идентификатор бухты')
-    product_id = models.CharField(max_length=255, verbose_name='Идентификатор материала')
+    reference = models.CharField(max_length=255, db_index=True, verbose_name='Идентификатор бухты')
+    product_id = models.CharField(max_length=255, db_index=True, verbose_name='Идентификатор материала')
     quantity = models.IntegerField(verbose_name='Изначальное количество')
     recommended_balance = models.IntegerField(verbose_name='Рекомендуемый остаток')
     acceptable_loss = models.IntegerField(verbose_name='Приемлемые потери')
@@ -22,6 +24,7 @@ class OrderLineDB(models.Model):
     class Meta:
         verbose_name = 'Товарная позиция'
         verbose_name_plural = 'Товарные позиции'
+        indexes = [models.Index(fields=['order_id', 'line_item'], name='allocation_orderline_idx')]
 
 
 class AllocationDB(models.Model):
@@ -32,3 +35,41 @@ class AllocationDB(models.Model):
     class Meta:
         verbose_name = 'Размещение товарной позиции'
         verbose_name_plural = 'Размещения товарных позиций'
+
+
+class OutboxEventDB(models.Model):
+    event_type = models.CharField(max_length=255, verbose_name='Тип события')
+    payload = models.JSONField(verbose_name='Данные события')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Время создания')
+    dispatched_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name='Время доставки')
+
+    class Meta:
+        verbose_name = 'Событие'
+        verbose_name_plural = 'События'
+
+
+class AllocationTicketDB(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Ожидает размещения'),
+        ('allocated', 'Размещена'),
+        ('out_of_stock', 'Недостаточно материала'),
+        ('not_found', 'Товарная позиция отсутствует'),
+        ('failed', 'Ошибка обработки'),
+    ]
+
+    ticket = models.UUIDField(unique=True, default=uuid.uuid4, verbose_name='Идентификатор заявки')
+    order_id = models.CharField(max_length=255, verbose_name='Идентификатор заказа')
+    line_item = models.CharField(max_length=255, verbose_name='Идентификатор товарной позиции в заказе')
+    product_id = models.CharField(max_length=255, verbose_name='Идентификатор материала')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending',
+                              verbose_name='Состояние заявки')
+    reference = models.CharField(max_length=255, blank=True, verbose_name='Идентификатор бухты')
+    batch = models.UUIDField(null=True, blank=True, verbose_name='Идентификатор пакета')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Количество неудачных попыток обработки')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Время создания')
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name='Время обработки')
+
+    class Meta:
+        verbose_name = 'Заявка на размещение'
+        verbose_name_plural = 'Заявки на размещение'
+        indexes = [models.Index(fields=['status', 'product_id'], name='allocation_ticket_status_idx')]
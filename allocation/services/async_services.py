@@ -0,0 +1,340 @@
+"""
+Асинхронные версии функций модуля services, использующие AbstractAsyncUnitOfWork.
+Независимые операции с репозиториями выполняются одновременно с помощью asyncio.gather,
+результаты функций совпадают с результатами соответствующих функций модуля services.
+"""
+import asyncio
+
+from allocation.domain import domain_logic, simulation
+from allocation.exceptions import exceptions
+from allocation.services import unit_of_work
+
+
+async def get_a_coil(
+        reference: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.get_a_coil."""
+    async with uow:
+        return await uow.coil_repo.get(reference)
+
+
+async def add_a_coil(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> None:
+    """Асинхронная версия services.add_a_coil."""
+    async with uow:
+        coil = domain_logic.Coil(reference, product_id, quantity, recommended_balance, acceptable_loss)
+        coil.record_creation()
+        await uow.coil_repo.add(coil)
+        await uow.commit()
+
+
+async def update_a_coil(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+        optimize: bool = False,
+) -> set[domain_logic.OrderLine]:
+    """Асинхронная версия services.update_a_coil."""
+    async with uow:
+        deallocated_lines = await _update_coil(reference, product_id, quantity, recommended_balance,
+                                               acceptable_loss, optimize, uow)
+        await uow.commit()
+        return deallocated_lines
+
+
+async def update_a_coil_and_reallocate(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+        optimize: bool = False,
+) -> domain_logic.BatchAllocation:
+    """Асинхронная версия services.update_a_coil_and_reallocate."""
+    async with uow:
+        deallocated_lines = await _update_coil(reference, product_id, quantity, recommended_balance,
+                                               acceptable_loss, optimize, uow)
+        batch_allocation = await _reallocate_lines(deallocated_lines, reference, uow)
+        await uow.commit()
+        return batch_allocation
+
+
+async def delete_a_coil(
+        reference: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> set[domain_logic.OrderLine]:
+    """Асинхронная версия services.delete_a_coil."""
+    async with uow:
+        deallocated_lines = await _delete_coil(reference, uow)
+        await uow.commit()
+        return deallocated_lines
+
+
+async def delete_a_coil_and_reallocate(
+        reference: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.BatchAllocation:
+    """Асинхронная версия services.delete_a_coil_and_reallocate."""
+    async with uow:
+        deallocated_lines = await _delete_coil(reference, uow)
+        batch_allocation = await _reallocate_lines(deallocated_lines, reference, uow)
+        await uow.commit()
+        return batch_allocation
+
+
+async def _update_coil(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        optimize: bool,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> set[domain_logic.OrderLine]:
+    """
+    Обновляет запись бухты в базе данных без фиксации изменений.
+    Возвращает множество товарных позиций, которые перестанут быть размещенными после обновления записи.
+    """
+    db_coil = await uow.coil_repo.get(reference)
+    input_coil = domain_logic.Coil(reference, product_id, quantity, recommended_balance, acceptable_loss)
+    reallocated_lines = db_coil.reallocate(input_coil, optimize=optimize)
+    input_coil.allocations = reallocated_lines
+    deallocated_lines = db_coil.allocations - reallocated_lines
+    input_coil.record_update(db_coil)
+    for line in deallocated_lines:
+        input_coil.record_deallocation(line)
+    await uow.coil_repo.update(input_coil)
+    return deallocated_lines
+
+
+async def _delete_coil(reference: str, uow: unit_of_work.AbstractAsyncUnitOfWork) -> set[domain_logic.OrderLine]:
+    """
+    Удаляет запись бухты из базы данных без фиксации изменений.
+    Возвращает множество товарных позиций, которые перестанут быть размещенными после удаления записи.
+    """
+    coil = await uow.coil_repo.get(reference)
+    coil.record_deletion()
+    await uow.coil_repo.delete(reference)
+    return coil.allocations
+
+
+async def _reallocate_lines(
+        lines: set[domain_logic.OrderLine],
+        excluded_reference: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.BatchAllocation:
+    """
+    Размещает товарные позиции в бухтах с тем же материалом, за исключением бухты excluded_reference,
+    и одновременно обновляет в базе данных бухты, в которых они были размещены, без фиксации изменений.
+    """
+    if not lines:
+        return domain_logic.BatchAllocation()
+    list_of_coils = [coil for coil in await uow.coil_repo.coils_list({line.product_id for line in lines})
+                     if coil.reference != excluded_reference]
+    batch_allocation = domain_logic.allocate_lines_to_list_of_coils(lines, list_of_coils)
+    await asyncio.gather(*(uow.coil_repo.update(coil) for coil in set(batch_allocation.allocated.values())))
+    return batch_allocation
+
+
+async def get_a_line(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.OrderLine:
+    """Асинхронная версия services.get_a_line."""
+    async with uow:
+        return await uow.line_repo.get(order_id, line_item)
+
+
+async def add_a_line(
+        order_id: str,
+        line_item: str,
+        product_id: str,
+        quantity: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> None:
+    """Асинхронная версия services.add_a_line."""
+    async with uow:
+        line = domain_logic.OrderLine(order_id, line_item, product_id, quantity)
+        await uow.line_repo.add(line)
+        await uow.commit()
+
+
+async def update_a_line(
+        order_id: str,
+        line_item: str,
+        product_id: str,
+        quantity: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.update_a_line."""
+    async with uow:
+        # Одновременное получение товарной позиции и бухты, в которой она размещена
+        db_line, allocation_coil = await asyncio.gather(
+            uow.line_repo.get(order_id=order_id, line_item=line_item),
+            _get_an_allocation_coil(order_id, line_item, uow),
+        )
+        if not allocation_coil.reference == 'fake':
+            allocation_coil.deallocate(db_line)
+            await uow.coil_repo.update(allocation_coil)
+            await uow.commit()
+
+        input_line = domain_logic.OrderLine(order_id, line_item, product_id, quantity)
+        await uow.line_repo.update(input_line)
+        await uow.commit()
+
+        if allocation_coil.reference == 'fake':
+            return allocation_coil
+        if not allocation_coil.can_allocate(input_line):
+            list_of_coils = await uow.coil_repo.candidate_coils(input_line)
+            allocation_coil = domain_logic.allocate_to_list_of_coils(line=input_line, coils=list_of_coils)
+        else:
+            allocation_coil.allocate(input_line)
+        await uow.coil_repo.update(allocation_coil)
+        await uow.commit()
+        return allocation_coil
+
+
+async def delete_a_line(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.delete_a_line."""
+    async with uow:
+        line, allocation_coil = await asyncio.gather(
+            uow.line_repo.get(order_id=order_id, line_item=line_item),
+            _get_an_allocation_coil(order_id, line_item, uow),
+        )
+        await uow.line_repo.delete(order_id=order_id, line_item=line_item)
+        await uow.commit()
+
+        if allocation_coil.reference == 'fake':
+            return allocation_coil
+        allocation_coil.deallocate(line)
+        await uow.coil_repo.update(allocation_coil)
+        await uow.commit()
+        return allocation_coil
+
+
+async def get_an_allocation_coil(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.get_an_allocation_coil."""
+    async with uow:
+        return await _get_an_allocation_coil(order_id, line_item, uow)
+
+
+async def _get_an_allocation_coil(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """
+    Возвращает бухту, в которой размещена товарная позиция, или "поддельную" бухту, не входя в блок async with.
+    Проверка существования товарной позиции и получение бухт выполняются одновременно.
+    """
+    _, coils_list = await asyncio.gather(
+        uow.line_repo.get(order_id=order_id, line_item=line_item),
+        uow.coil_repo.coils_list(),
+    )
+    allocation_coil = domain_logic.Coil('fake', 'fake', 1, 1, 1)
+    for coil in coils_list:
+        for line in coil.allocations:
+            if line.order_id == order_id and line.line_item == line_item:
+                allocation_coil = coil
+    return allocation_coil
+
+
+async def allocate(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.allocate."""
+    async with uow:
+        line = await uow.line_repo.get(order_id, line_item)
+        list_of_coils = await uow.coil_repo.candidate_coils(line)
+        allocation_coil = domain_logic.allocate_to_list_of_coils(line=line, coils=list_of_coils)
+        await uow.coil_repo.update(allocation_coil)
+        await uow.commit()
+        return allocation_coil
+
+
+async def allocate_an_order(
+        order_id: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+        prefer_locality: bool = False,
+) -> domain_logic.BatchAllocation:
+    """
+    Асинхронная версия services.allocate_an_order.
+    Бухты, в которых были размещены товарные позиции заказа, обновляются одновременно.
+    """
+    async with uow:
+        order_lines = await uow.line_repo.order_lines_list(order_id)
+        if not order_lines:
+            raise exceptions.DBOrderRecordsDoNotExist(order_id)
+        list_of_coils = await uow.coil_repo.coils_list({line.product_id for line in order_lines})
+        allocated_lines = set().union(*(coil.allocations for coil in list_of_coils))
+        batch_allocation = domain_logic.allocate_lines_to_list_of_coils(order_lines, list_of_coils,
+                                                                        prefer_locality=prefer_locality)
+        await asyncio.gather(*(uow.coil_repo.update(coil)
+                               for coil in {batch_allocation.allocated[line] for line in batch_allocation.allocated
+                                            if line not in allocated_lines}))
+        await uow.commit()
+        return batch_allocation
+
+
+async def simulate_allocation(
+        lines: list[domain_logic.OrderLine],
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> simulation.SimulationResult:
+    """Асинхронная версия services.simulate_allocation."""
+    async with uow:
+        snapshot = await uow.coil_repo.snapshot({line.product_id for line in lines},
+                                                {line.order_id for line in lines})
+        return simulation.simulate_allocation(lines, snapshot)
+
+
+async def get_feasible_coils(
+        product_id: str,
+        quantity: int,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> list[tuple[str, int]]:
+    """Асинхронная версия services.get_feasible_coils."""
+    async with uow:
+        pool = await uow.coil_repo.coil_pool(product_id)
+        available_quantities = pool.available_quantities()
+        return [(pool.references[index], available_quantities[index]) for index in pool.feasible(quantity)]
+
+
+async def deallocate(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractAsyncUnitOfWork,
+) -> domain_logic.Coil:
+    """Асинхронная версия services.deallocate."""
+    async with uow:
+        line, allocation_coil = await asyncio.gather(
+            uow.line_repo.get(order_id=order_id, line_item=line_item),
+            _get_an_allocation_coil(order_id, line_item, uow),
+        )
+        if allocation_coil.reference == 'fake':
+            return allocation_coil
+        allocation_coil.deallocate(line)
+        await uow.coil_repo.update(allocation_coil)
+        await uow.commit()
+        return allocation_coil
@@ -0,0 +1,57 @@
+"""
+Доставка событий доменной модели обработчикам. События сохраняются в таблицу OutboxEventDB
+при фиксации изменений (см. модуль adapters.outbox) и доставляются пакетами функцией dispatch_pending,
+которую периодически вызывает команда dispatch_events, поэтому обработка событий не замедляет запросы к API.
+"""
+from collections import defaultdict
+from typing import Callable
+
+from allocation.adapters import outbox
+from allocation.domain import events
+
+
+# Обработчик принимает пакет событий классов, на которые он подписан, в порядке их возникновения
+Handler = Callable[[list[events.Event]], None]
+
+# Количество событий, доставляемых обработчикам за один раз
+DISPATCH_BATCH_SIZE = 100
+
+# Обработчики событий по классам событий
+HANDLERS: dict[type[events.Event], list[Handler]] = defaultdict(list)
+
+
+def register(event_type: type[events.Event], handler: Handler) -> None:
+    """Регистрирует обработчик handler событий класса event_type."""
+    if handler not in HANDLERS[event_type]:
+        HANDLERS[event_type].append(handler)
+
+
+def handle(batch: list[events.Event]) -> None:
+    """
+    Принимает пакет событий, передает каждому зарегистрированному обработчику одним вызовом
+    события тех классов, на которые он подписан, в порядке их возникновения.
+    Исключение обработчика прерывает обработку пакета.
+    """
+    batches_by_handler: dict[Handler, list[events.Event]] = {}
+    for event in batch:
+        for handler in HANDLERS.get(type(event), []):
+            batches_by_handler.setdefault(handler, []).append(event)
+    for handler, handler_batch in batches_by_handler.items():
+        handler(handler_batch)
+
+
+def dispatch_pending(batch_size: int = DISPATCH_BATCH_SIZE) -> int:
+    """
+    Доставляет обработчикам не более batch_size недоставленных событий из таблицы OutboxEventDB,
+    возвращает количество доставленных событий.
+
+    События отмечаются как доставленные только после успешной обработки всего пакета, поэтому
+    при ошибке обработчика пакет будет доставлен повторно (доставка «хотя бы один раз»).
+    Предполагается, что события доставляет один процесс.
+    """
+    records = outbox.pending(batch_size)
+    if not records:
+        return 0
+    handle([event for _, event in records])
+    outbox.mark_dispatched(record_id for record_id, _ in records)
+    return len(records)
@@ -1,15 +1,22 @@
-from allocation.domain import domain_logic
+import dataclasses
+
+from allocation.adapters import allocation_queue
+from allocation.domain import domain_logic, simulation
+from allocation.exceptions import exceptions
 from allocation.services import unit_of_work
 
 
 def get_a_coil(
         reference: str,
-        uow: unit_of_work.AbstractUnitOfWork,
+        uow: unit_of_work.AbstractUnitOfWork | None = None,
 ) -> domain_logic.Coil:
     """
     Принимает идентификатор бухты - экземпляра класса Coil доменной модели,
     возвращает соответствующий ему экземпляр класса Coil, полученный из записи в базе данных.
+    По умолчанию используется ReadOnlyUnitOfWork.
     """
+    if uow is None:
+        uow = unit_of_work.ReadOnlyUnitOfWork()
     with uow:
         coil = uow.coil_repo.get(reference)
         return coil
@@ -29,6 +36,7 @@ def add_a_coil(
     """
     with uow:
         coil = domain_logic.Coil(reference, product_id, quantity, recommended_balance, acceptable_loss)
+        coil.record_creation()
         uow.coil_repo.add(coil)
         uow.commit()
 
@@ -40,31 +48,49 @@ def update_a_coil(
         recommended_balance: int,
         acceptable_loss: int,
         uow: unit_of_work.AbstractUnitOfWork,
+        optimize: bool = False,
 ) -> set[domain_logic.OrderLine]:
     """
     Принимает атрибуты бухты - экземпляра класса Coil доменной модели,
     обновляет соответствующую им запись в таблице Coil базы данных.
     Возвращает множество товарных позиций - экземпляров класса OrderLine доменной модели,
     полученных из записей в базе данных, которые перестанут быть размещенными после обновления записи.
+
+    При optimize=True в бухте остаются размещенными товарные позиции с наибольшим
+    суммарным количеством материала, см. метод Coil.reallocate.
     """
     with uow:
-        # Получение бухты, которую необходимо обновить
-        db_coil = uow.coil_repo.get(reference)
-        # Создание бухты, которая обновит db_coil
-        input_coil = domain_logic.Coil(reference, product_id, quantity, recommended_balance, acceptable_loss)
-        # Получение множества товарных позиций, ранее размещенных в db_coil,
-        # которые смогут быть размещены в input_coil после обновления db_coil
-        reallocated_lines = db_coil.reallocate(input_coil)
-        # Размещение товарных позиций, принадлежащих reallocated_lines, в бухте input_coil
-        input_coil.allocations = reallocated_lines
-        # Обновление input_coil в базе данных
-        uow.coil_repo.update(input_coil)
-        # Получение множества товарных позиций, которые перестанут быть размещенными после обновления db_coil
-        deallocated_lines = db_coil.allocations - reallocated_lines
+        deallocated_lines = _update_coil(reference, product_id, quantity, recommended_balance, acceptable_loss,
+                                         optimize, uow)
         uow.commit()
         return deallocated_lines
 
 
+def update_a_coil_and_reallocate(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        uow: unit_of_work.AbstractUnitOfWork,
+        optimize: bool = False,
+) -> domain_logic.BatchAllocation:
+    """
+    Принимает атрибуты бухты - экземпляра класса Coil доменной модели,
+    обновляет соответствующую им запись в таблице Coil базы данных.
+    Товарные позиции, которые перестанут быть размещенными после обновления записи, в той же транзакции
+    размещает в других бухтах с тем же материалом, см. функцию allocate_lines_to_list_of_coils.
+    Возвращает экземпляр BatchAllocation с бухтами, в которых размещены эти товарные позиции,
+    и товарными позициями, которые не удалось разместить.
+    """
+    with uow:
+        deallocated_lines = _update_coil(reference, product_id, quantity, recommended_balance, acceptable_loss,
+                                         optimize, uow)
+        batch_allocation = _reallocate_lines(deallocated_lines, reference, uow)
+        uow.commit()
+        return batch_allocation
+
+
 def delete_a_coil(
         reference: str,
         uow: unit_of_work.AbstractUnitOfWork,
@@ -76,25 +102,108 @@ def delete_a_coil(
     полученных из записей в базе данных, которые перестанут быть размещенными после удаления записи.
     """
     with uow:
-        # Получение бухты, которую необходимо удалить
-        coil = uow.coil_repo.get(reference)
-        # Получение множества товарных позиций, которые перестанут быть размещенными после удаления coil
-        deallocated_lines = coil.allocations
-        # Удаление coil из базы данных
-        uow.coil_repo.delete(reference)
+        deallocated_lines = _delete_coil(reference, uow)
         uow.commit()
         return deallocated_lines
 
 
+def delete_a_coil_and_reallocate(
+        reference: str,
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> domain_logic.BatchAllocation:
+    """
+    Принимает идентификатор бухты - экземпляра класса Coil доменной модели,
+    удаляет соответствующую ему запись в таблице Coil базы данных.
+    Товарные позиции, которые перестанут быть размещенными после удаления записи, в той же транзакции
+    размещает в других бухтах с тем же материалом, см. функцию allocate_lines_to_list_of_coils.
+    Возвращает экземпляр BatchAllocation с бухтами, в которых размещены эти товарные позиции,
+    и товарными позициями, которые не удалось разместить.
+    """
+    with uow:
+        deallocated_lines = _delete_coil(reference, uow)
+        batch_allocation = _reallocate_lines(deallocated_lines, reference, uow)
+        uow.commit()
+        return batch_allocation
+
+
+def _update_coil(
+        reference: str,
+        product_id: str,
+        quantity: int,
+        recommended_balance: int,
+        acceptable_loss: int,
+        optimize: bool,
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> set[domain_logic.OrderLine]:
+    """
+    Обновляет запись бухты в базе данных без фиксации изменений.
+    Возвращает множество товарных позиций, которые перестанут быть размещенными после обновления записи.
+    """
+    # Получение бухты, которую необходимо обновить
+    db_coil = uow.coil_repo.get(reference)
+    # Создание бухты, которая обновит db_coil
+    input_coil = domain_logic.Coil(reference, product_id, quantity, recommended_balance, acceptable_loss)
+    # Получение множества товарных позиций, ранее размещенных в db_coil,
+    # которые смогут быть размещены в input_coil после обновления db_coil
+    reallocated_lines = db_coil.reallocate(input_coil, optimize=optimize)
+    # Размещение товарных позиций, принадлежащих reallocated_lines, в бухте input_coil
+    input_coil.allocations = reallocated_lines
+    # Получение множества товарных позиций, которые перестанут быть размещенными после обновления db_coil
+    deallocated_lines = db_coil.allocations - reallocated_lines
+    # Добавление событий изменения атрибутов бухты и отмены размещения товарных позиций
+    input_coil.record_update(db_coil)
+    for line in deallocated_lines:
+        input_coil.record_deallocation(line)
+    # Обновление input_coil в базе данных
+    uow.coil_repo.update(input_coil)
+    return deallocated_lines
+
+
+def _delete_coil(reference: str, uow: unit_of_work.AbstractUnitOfWork) -> set[domain_logic.OrderLine]:
+    """
+    Удаляет запись бухты из базы данных без фиксации изменений.
+    Возвращает множество товарных позиций, которые перестанут быть размещенными после удаления записи.
+    """
+    # Получение бухты, которую необходимо удалить
+    coil = uow.coil_repo.get(reference)
+    coil.record_deletion()
+    # Удаление coil из базы данных
+    uow.coil_repo.delete(reference)
+    return coil.allocations
+
+
+def _reallocate_lines(
+        lines: set[domain_logic.OrderLine],
+        excluded_reference: str,
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> domain_logic.BatchAllocation:
+    """
+    Размещает товарные позиции в бухтах с тем же материалом, за исключением бухты excluded_reference,
+    и обновляет в базе данных бухты, в которых они были размещены, без фиксации изменений.
+    Бухты загружаются из базы данных однократно.
+    """
+    if not lines:
+        return domain_logic.BatchAllocation()
+    list_of_coils = [coil for coil in uow.coil_repo.coils_list({line.product_id for line in lines})
+                     if coil.reference != excluded_reference]
+    batch_allocation = domain_logic.allocate_lines_to_list_of_coils(lines, list_of_coils)
+    for coil in set(batch_allocation.allocated.values()):
+        uow.coil_repo.update(coil)
+    return batch_allocation
+
+
 def get_a_line(
         order_id: str,
         line_item: str,
-        uow: unit_of_work.AbstractUnitOfWork,
+        uow: unit_of_work.AbstractUnitOfWork | None = None,
 ) -> domain_logic.OrderLine:
     """
     Принимает идентификаторы товарной позиции - экземпляра класса OrderLine доменной модели,
     возвращает соответствующий им экземпляр класса OrderLine, полученный из записи в базе данных.
+    По умолчанию используется ReadOnlyUnitOfWork.
     """
+    if uow is None:
+        uow = unit_of_work.ReadOnlyUnitOfWork()
     with uow:
         line = uow.line_repo.get(order_id, line_item)
         return line
@@ -162,7 +271,7 @@ def update_a_line(
                 return allocation_coil
             # Если попытка неудачная, то выполнение обычного размещения товарной позиции
             else:
-                list_of_coils = uow.coil_repo.coils_list()
+                list_of_coils = uow.coil_repo.candidate_coils(input_line)
                 allocation_coil = domain_logic.allocate_to_list_of_coils(line=input_line, coils=list_of_coils)
                 uow.coil_repo.update(allocation_coil)
                 uow.commit()
@@ -205,13 +314,16 @@ def delete_a_line(
 def get_an_allocation_coil(
         order_id: str,
         line_item: str,
-        uow: unit_of_work.AbstractUnitOfWork,
+        uow: unit_of_work.AbstractUnitOfWork | None = None,
 ) -> domain_logic.Coil:
     """
     Принимает идентификаторы товарной позиции - экземпляра класса OrderLine доменной модели.
     Возвращает бухту - экземпляр класса Coil, полученный из записи в базе данных или "поддельный",
     в которой размещена товарная позиция.
+    По умолчанию используется ReadOnlyUnitOfWork.
     """
+    if uow is None:
+        uow = unit_of_work.ReadOnlyUnitOfWork()
     with uow:
         # Получение товарной позиции, для которой необходимо найти бухту, где она размещена.
         # Получение необходимо для проверки существования товарной позиции
@@ -243,8 +355,9 @@ def allocate(
         # Получение товарной позиции, которую необходимо разместить
         line = uow.line_repo.get(order_id, line_item)
 
-        # Размещение товарной позиции в бухте ее и возврат
-        list_of_coils = uow.coil_repo.coils_list()
+        # Размещение товарной позиции в бухте ее и возврат.
+        # Бухты-кандидаты отбираются и упорядочиваются на стороне базы данных
+        list_of_coils = uow.coil_repo.candidate_coils(line)
         allocation_coil = domain_logic.allocate_to_list_of_coils(line=line, coils=list_of_coils)
         # Обновление allocation_coil в базе данных
         uow.coil_repo.update(allocation_coil)
@@ -252,6 +365,177 @@ def allocate(
         return allocation_coil
 
 
+def allocate_an_order(
+        order_id: str,
+        uow: unit_of_work.AbstractUnitOfWork,
+        prefer_locality: bool = False,
+) -> domain_logic.BatchAllocation:
+    """
+    Принимает идентификатор заказа, размещает в бухтах все неразмещенные товарные позиции заказа.
+    Возвращает экземпляр BatchAllocation с бухтами, в которых размещены товарные позиции заказа,
+    и товарными позициями, которые не удалось разместить.
+
+    Товарные позиции заказа и бухты с их материалами загружаются из базы данных
+    постоянным количеством запросов. При prefer_locality=True товарные позиции с одинаковым
+    материалом размещаются в возможно меньшем количестве бухт, см. функцию allocate_lines_to_list_of_coils.
+    """
+    with uow:
+        # Получение товарных позиций заказа
+        order_lines = uow.line_repo.order_lines_list(order_id)
+        if not order_lines:
+            raise exceptions.DBOrderRecordsDoNotExist(order_id)
+        # Получение бухт с материалами товарных позиций заказа
+        list_of_coils = uow.coil_repo.coils_list({line.product_id for line in order_lines})
+        allocated_lines = set().union(*(coil.allocations for coil in list_of_coils))
+        batch_allocation = domain_logic.allocate_lines_to_list_of_coils(order_lines, list_of_coils,
+                                                                        prefer_locality=prefer_locality)
+        # Обновление в базе данных бухт, в которых были размещены товарные позиции
+        for coil in {batch_allocation.allocated[line] for line in batch_allocation.allocated
+                     if line not in allocated_lines}:
+            uow.coil_repo.update(coil)
+        uow.commit()
+        return batch_allocation
+
+
+def enqueue_allocation(
+        order_id: str,
+        line_item: str,
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> allocation_queue.Ticket:
+    """
+    Принимает идентификаторы товарной позиции - экземпляра класса OrderLine доменной модели,
+    создает заявку на ее размещение в очереди и возвращает заявку.
+    Товарная позиция будет размещена функцией allocate_queued.
+    """
+    with uow:
+        # Получение товарной позиции или вызов исключения, если она отсутствует
+        line = uow.line_repo.get(order_id, line_item)
+        ticket = uow.ticket_repo.add(line)
+        uow.commit()
+        return ticket
+
+
+def get_a_ticket(
+        ticket: str,
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> allocation_queue.Ticket:
+    """
+    Принимает идентификатор заявки на размещение товарной позиции, возвращает заявку.
+    Вызывает исключение, если заявка отсутствует.
+    """
+    with uow:
+        return uow.ticket_repo.get(ticket)
+
+
+def has_queued(uow: unit_of_work.AbstractUnitOfWork) -> bool:
+    """Возвращает True, если в очереди есть ожидающие заявки."""
+    with uow:
+        return uow.ticket_repo.has_pending()
+
+
+def allocate_queued(
+        uow: unit_of_work.AbstractUnitOfWork,
+        batch_size: int = allocation_queue.QUEUE_BATCH_SIZE,
+) -> list[allocation_queue.Ticket]:
+    """
+    Размещает в бухтах товарные позиции пакета ожидающих заявок с одним материалом,
+    см. allocation_queue.claim_batch.
+    Возвращает обработанные заявки с результатом размещения.
+
+    Бухты с материалом загружаются однократно, товарные позиции размещаются в них
+    функцией allocate_lines_to_list_of_coils, изменения и состояние заявок фиксируются одной транзакцией.
+    Если обработка пакета вызывает исключение, изменения отменяются, неудачная попытка обработки заявок
+    сохраняется, см. allocation_queue.record_failure, и исключение вызывается повторно.
+    """
+    with uow:
+        tickets = uow.ticket_repo.claim_batch(batch_size)
+        if not tickets:
+            return []
+        try:
+            processed_tickets = _allocate_tickets(tickets, uow)
+        except Exception:
+            uow.rollback()
+            uow.ticket_repo.record_failure(tickets)
+            uow.commit()
+            raise
+        uow.commit()
+        return processed_tickets
+
+
+def _allocate_tickets(
+        tickets: list[allocation_queue.Ticket],
+        uow: unit_of_work.AbstractUnitOfWork,
+) -> list[allocation_queue.Ticket]:
+    """Размещает товарные позиции заявок пакета и сохраняет состояние заявок без фиксации изменений."""
+    lines = uow.line_repo.order_lines_by_keys({(ticket.order_id, ticket.line_item) for ticket in tickets})
+    found_lines = list(lines.values())
+    # Получение бухт с материалами товарных позиций и размещение в них товарных позиций
+    list_of_coils = uow.coil_repo.coils_list({line.product_id for line in found_lines})
+    allocated_lines = set().union(*(coil.allocations for coil in list_of_coils))
+    batch_allocation = domain_logic.allocate_lines_to_list_of_coils(found_lines, list_of_coils)
+    # Обновление в базе данных бухт, в которых были размещены товарные позиции
+    for coil in {batch_allocation.allocated[line] for line in batch_allocation.allocated
+                 if line not in allocated_lines}:
+        uow.coil_repo.update(coil)
+    processed_tickets = [_processed_ticket(ticket, lines.get((ticket.order_id, ticket.line_item)), batch_allocation)
+                         for ticket in tickets]
+    uow.ticket_repo.complete(processed_tickets)
+    return processed_tickets
+
+
+def _processed_ticket(
+        ticket: allocation_queue.Ticket,
+        line: domain_logic.OrderLine | None,
+        batch_allocation: domain_logic.BatchAllocation,
+) -> allocation_queue.Ticket:
+    """Возвращает заявку с результатом размещения ее товарной позиции."""
+    if line is None:
+        return dataclasses.replace(ticket, status=allocation_queue.NOT_FOUND)
+    if line in batch_allocation.allocated:
+        return dataclasses.replace(ticket, status=allocation_queue.ALLOCATED,
+                                   reference=batch_allocation.allocated[line].reference)
+    return dataclasses.replace(ticket, status=allocation_queue.OUT_OF_STOCK)
+
+
+def simulate_allocation(
+        lines: list[domain_logic.OrderLine],
+        uow: unit_of_work.AbstractUnitOfWork | None = None,
+) -> simulation.SimulationResult:
+    """
+    Принимает товарные позиции - экземпляры класса OrderLine доменной модели,
+    моделирует их последовательное размещение в бухтах без изменения базы данных.
+    Возвращает экземпляр SimulationResult с идентификаторами бухт, в которых были бы размещены
+    товарные позиции, и товарными позициями, которые не удалось бы разместить.
+    По умолчанию используется ReadOnlyUnitOfWork.
+    """
+    if uow is None:
+        uow = unit_of_work.ReadOnlyUnitOfWork()
+    with uow:
+        # Однократная загрузка снимка бухт с материалами товарных позиций
+        snapshot = uow.coil_repo.snapshot({line.product_id for line in lines}, {line.order_id for line in lines})
+        return simulation.simulate_allocation(lines, snapshot)
+
+
+def get_feasible_coils(
+        product_id: str,
+        quantity: int,
+        uow: unit_of_work.AbstractUnitOfWork | None = None,
+) -> list[tuple[str, int]]:
+    """
+    Принимает идентификатор материала и количество материала товарной позиции,
+    возвращает пары (идентификатор бухты, доступное количество материала) для всех бухт,
+    в которых может быть размещена такая товарная позиция, в порядке выбора бухт при размещении.
+    Не изменяет базу данных.
+    По умолчанию используется ReadOnlyUnitOfWork.
+    """
+    if uow is None:
+        uow = unit_of_work.ReadOnlyUnitOfWork()
+    with uow:
+        pool = uow.coil_repo.coil_pool(product_id)
+        available_quantities = pool.available_quantities()
+        return [(pool.references[index], available_quantities[index]) for index in pool.feasible(quantity)]
+
+
 def deallocate(
         order_id: str,
         line_item: str,
@@ -1,12 +1,17 @@
+from contextlib import ExitStack
 from typing import Any, Protocol
+
+from asgiref.sync import sync_to_async
 from django.db import transaction
 
-from allocation.adapters import repository
+from allocation.adapters import coil_pool_cache, db_router, outbox, repository
+from allocation.exceptions import exceptions
 
 
 class AbstractUnitOfWork(Protocol):
     coil_repo: repository.AbstractCoilRepository
     line_repo: repository.AbstractOrderLineRepository
+    ticket_repo: repository.AbstractTicketRepository
 
     def __enter__(self) -> 'AbstractUnitOfWork': ...
 
@@ -22,37 +27,202 @@ class DjangoUnitOfWork(AbstractUnitOfWork):
     Поддерживает протокол менеджера контекста в целях реализации паттерна «Unit of Work».
     При использовании экземпляра класса с инструкцией with создаются экземпляры
     классов-репозиториев, которые будут работать с одним контекстом данных.
+
+    Допускается вложенное использование экземпляра с инструкцией with: вход во вложенный блок
+    создает точку сохранения, методы commit() и rollback() во вложенном блоке сохраняют или отменяют
+    изменения только после точки сохранения, выход из вложенного блока отменяет несохраненные изменения
+    вложенного блока. Транзакция завершается только при выходе из внешнего блока.
+    События доменной модели, возникшие после точки сохранения, отбрасываются при отмене изменений
+    вложенного блока.
     """
+    coil_repo: repository.DjangoCoilRepository
+
+    def __init__(self) -> None:
+        # Вложенные блоки atomic, создающие точки сохранения вложенных блоков with,
+        # и количество несохраненных событий бухт в момент создания точки сохранения
+        self._savepoints: list[tuple[Any, dict[int, int]]] = []
+        # Глубина вложенности блоков with
+        self._depth = 0
+
     def __enter__(self) -> 'DjangoUnitOfWork':
         """
         Выполняется до входа в блок with.
-        Создает экземпляры классов-репозиториев и отключает автокоммит транзакций с базой данных.
+        Во внешнем блоке создает экземпляры классов-репозиториев и отключает автокоммит транзакций
+        с базой данных, во вложенном блоке - создает точку сохранения.
         Возвращает экземпляр класса DjangoUnitOfWork.
         """
-        self.coil_repo = repository.DjangoCoilRepository()
-        self.line_repo = repository.DjangoOrderLineRepository()
-        transaction.set_autocommit(False)
+        if self._depth == 0:
+            self.coil_repo = repository.DjangoCoilRepository()
+            self.line_repo = repository.DjangoOrderLineRepository()
+            self.ticket_repo = repository.DjangoTicketRepository()
+            transaction.set_autocommit(False)
+        else:
+            self._create_savepoint()
+        self._depth += 1
         return self
 
     def __exit__(self, *args: tuple[Any]) -> None:
         """
         Выполняется после выхода из блока with.
         Запускает метод rollback(), который сработает, если в блоке with не был запущен метод commit().
-        Включает автокоммит транзакций с базой данных.
+        Во внешнем блоке включает автокоммит транзакций с базой данных,
+        во вложенном блоке - удаляет точку сохранения.
         """
-        self.rollback()
-        transaction.set_autocommit(True)
+        if self._depth > 1:
+            self._close_savepoint(keep_changes=False)
+        else:
+            self.rollback()
+            transaction.set_autocommit(True)
+        self._depth -= 1
 
     def commit(self) -> None:
         """
         Обеспечивает фиксацию изменений, выполненных в базе данных,
         при выполнении операций в блоке with.
+        События доменной модели, собранные репозиторием бухт, записываются в таблицу OutboxEventDB
+        в той же транзакции, см. модуль outbox.
+        Закэшированные пулы бухт после фиксации изменений становятся недействительными.
+        Во вложенном блоке изменения сохраняются в транзакции внешнего блока.
         """
-        transaction.commit()
+        outbox.add(self.coil_repo.collect_events())
+        if self._depth > 1:
+            self._close_savepoint(keep_changes=True)
+            self._create_savepoint()
+        else:
+            transaction.commit()
+            coil_pool_cache.invalidate()
 
     def rollback(self) -> None:
         """
         Обеспечивает отмену изменений, выполненных в базе данных,
         при выполнении операций в блоке with.
+        Во вложенном блоке отменяются только изменения и события доменной модели после точки сохранения.
+        Во внешнем блоке несохраненные события доменной модели отбрасываются.
+        """
+        if self._depth > 1:
+            self._close_savepoint(keep_changes=False)
+            self._create_savepoint()
+        else:
+            self.coil_repo.collect_events()
+            transaction.rollback()
+
+    def _create_savepoint(self) -> None:
+        """
+        Создает точку сохранения с помощью вложенного блока atomic.
+        SQLite начинает транзакцию командой SAVEPOINT, если транзакция еще не начата, и фиксирует ее
+        при удалении точки сохранения, поэтому транзакция внешнего блока предварительно начинается явно.
+        """
+        connection = transaction.get_connection()
+        connection.ensure_connection()
+        if connection.vendor == 'sqlite' and not connection.connection.in_transaction:
+            with connection.cursor() as cursor:
+                cursor.execute('BEGIN')
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        self._savepoints.append((atomic, self.coil_repo.events_snapshot()))
+
+    def _close_savepoint(self, keep_changes: bool) -> None:
+        """
+        Удаляет последнюю точку сохранения, предварительно отменив изменения и события доменной модели
+        после нее, если keep_changes=False.
+        """
+        atomic, events_snapshot = self._savepoints.pop()
+        if not keep_changes:
+            self.coil_repo.rollback_events(events_snapshot)
+            transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+class ReadOnlyUnitOfWork(AbstractUnitOfWork):
+    """
+    Версия Unit of Work для операций чтения. Не управляет транзакциями: каждый запрос выполняется
+    в режиме автокоммита, либо, при snapshot=True, все запросы блока with выполняются в одной транзакции
+    и видят согласованное состояние базы данных.
+    Запросы выполняются в реплике базы данных, если она настроена, см. модуль db_router.
+    Методы изменения записей репозиториев и метод commit() вызывают исключение.
+    """
+    def __init__(self, snapshot: bool = False) -> None:
+        self.snapshot = snapshot
+
+    def __enter__(self) -> 'ReadOnlyUnitOfWork':
+        """
+        Выполняется до входа в блок with.
+        Включает чтение из реплики и создает экземпляры классов-репозиториев только для чтения.
+        """
+        self._exit_stack = ExitStack()
+        self.using = self._exit_stack.enter_context(db_router.replica_reads())
+        if self.snapshot:
+            self._exit_stack.enter_context(transaction.atomic(using=self.using))
+        self.coil_repo = repository.ReadOnlyDjangoCoilRepository()
+        self.line_repo = repository.ReadOnlyDjangoOrderLineRepository()
+        self.ticket_repo = repository.ReadOnlyDjangoTicketRepository()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Выполняется после выхода из блока with. Выключает чтение из реплики."""
+        self._exit_stack.__exit__(*args)
+
+    def commit(self) -> None:
+        raise exceptions.ReadOnlyUnitOfWorkViolation('commit')
+
+    def rollback(self) -> None:
+        """Изменения в блоке with невозможны, поэтому отменять нечего."""
+
+
+class AbstractAsyncUnitOfWork(Protocol):
+    coil_repo: repository.AbstractAsyncCoilRepository
+    line_repo: repository.AbstractAsyncOrderLineRepository
+
+    async def __aenter__(self) -> 'AbstractAsyncUnitOfWork': ...
+
+    async def __aexit__(self, *args: tuple[Any]) -> None: ...
+
+    async def commit(self) -> None: ...
+
+    async def rollback(self) -> None: ...
+
+
+class AsyncDjangoUnitOfWork(AbstractAsyncUnitOfWork):
+    """
+    Асинхронная версия DjangoUnitOfWork для использования с инструкцией async with.
+    Управление транзакцией и методы репозиториев выполняются с помощью sync_to_async
+    в одном потоке, поэтому используют одно соединение с базой данных.
+    """
+    async def __aenter__(self) -> 'AsyncDjangoUnitOfWork':
+        """
+        Выполняется до входа в блок async with.
+        Создает экземпляры асинхронных классов-репозиториев и отключает автокоммит транзакций с базой данных.
+        """
+        self.coil_repo = repository.AsyncDjangoCoilRepository()
+        self.line_repo = repository.AsyncDjangoOrderLineRepository()
+        await sync_to_async(transaction.set_autocommit)(False)
+        return self
+
+    async def __aexit__(self, *args: tuple[Any]) -> None:
+        """
+        Выполняется после выхода из блока async with.
+        Отменяет изменения, если в блоке не был запущен метод commit(), и включает автокоммит транзакций.
+        """
+        await self.rollback()
+        await sync_to_async(transaction.set_autocommit)(True)
+
+    async def commit(self) -> None:
+        """
+        Обеспечивает фиксацию изменений, выполненных в базе данных, при выполнении операций в блоке async with.
+        События доменной модели записываются в таблицу OutboxEventDB в той же транзакции.
+        Закэшированные пулы бухт после фиксации изменений становятся недействительными.
+        """
+        await sync_to_async(self._commit)()
+        coil_pool_cache.invalidate()
+
+    def _commit(self) -> None:
+        outbox.add(self.coil_repo.collect_events())
+        transaction.commit()
+
+    async def rollback(self) -> None:
+        """
+        Обеспечивает отмену изменений, выполненных в базе данных, при выполнении операций в блоке async with.
+        Несохраненные события доменной модели отбрасываются.
         """
-        transaction.rollback()
+        self.coil_repo.collect_events()
+        await sync_to_async(transaction.rollback)()
@@ -0,0 +1,8 @@
+"""
+Бенчмарки запускаются без режима отладки, как при производственном развертывании,
+поэтому обязательные переменные окружения задаются значениями для измерений, если они не заданы.
+"""
+import os
+
+os.environ.setdefault('DJANGO_SECRET_KEY', 'benchmarks-secret-key')
+os.environ.setdefault('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1,testserver')
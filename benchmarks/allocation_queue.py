@@ -0,0 +1,78 @@
+"""
+Сравнение пропускной способности размещения товарных позиций по одной (services.allocate,
+транзакция на каждую товарную позицию) и через очередь заявок (services.enqueue_allocation
+и services.allocate_queued, транзакция на пакет заявок с одним материалом).
+
+Товарные позиции LINES_COUNT распределены по PRODUCTS_COUNT материалам, у каждого материала
+COILS_PER_PRODUCT бухт. Для очереди измеряются отдельно создание заявок (работа запроса к API)
+и их обработка (работа команды process_allocation_queue).
+Измерение выполняется на временной базе данных.
+
+Запуск: python -m benchmarks.allocation_queue
+"""
+import os
+import tempfile
+import time
+
+PRODUCTS_COUNT = 10
+COILS_PER_PRODUCT = 5
+LINES_COUNT = 1000
+
+
+def fill_database(prefix: str) -> list[tuple[str, str]]:
+    """Добавляет бухты и товарные позиции, возвращает идентификаторы товарных позиций."""
+    from allocation import models as django_models
+
+    django_models.CoilDB.objects.bulk_create(
+        django_models.CoilDB(reference=f'{prefix}-Бухта-{number:03}', product_id=f'{prefix}_{number % PRODUCTS_COUNT}',
+                             quantity=10000, recommended_balance=10, acceptable_loss=2)
+        for number in range(PRODUCTS_COUNT * COILS_PER_PRODUCT))
+    lines = django_models.OrderLineDB.objects.bulk_create(
+        django_models.OrderLineDB(order_id=f'{prefix}-Заказ-{number:05}', line_item='Позиция-001',
+                                  product_id=f'{prefix}_{number % PRODUCTS_COUNT}', quantity=10)
+        for number in range(LINES_COUNT))
+    return [(line.order_id, line.line_item) for line in lines]
+
+
+def measure() -> None:
+    from allocation.services import services, unit_of_work
+
+    lines = fill_database('А')
+    start = time.perf_counter()
+    for order_id, line_item in lines:
+        services.allocate(order_id, line_item, unit_of_work.DjangoUnitOfWork())
+    allocate_time = time.perf_counter() - start
+
+    lines = fill_database('Б')
+    start = time.perf_counter()
+    for order_id, line_item in lines:
+        services.enqueue_allocation(order_id, line_item, unit_of_work.DjangoUnitOfWork())
+    enqueue_time = time.perf_counter() - start
+    start = time.perf_counter()
+    processed = 0
+    while batch := services.allocate_queued(unit_of_work.DjangoUnitOfWork()):
+        processed += len(batch)
+    queue_time = time.perf_counter() - start
+    assert processed == LINES_COUNT
+
+    print(f'Товарных позиций: {LINES_COUNT}, материалов: {PRODUCTS_COUNT}, бухт каждого материала: {COILS_PER_PRODUCT}')
+    print(f'  services.allocate:         {LINES_COUNT / allocate_time:8.0f} размещений/с')
+    print(f'  создание заявок:           {LINES_COUNT / enqueue_time:8.0f} заявок/с')
+    print(f'  обработка очереди:         {LINES_COUNT / queue_time:8.0f} размещений/с')
+    print(f'  создание и обработка:      {LINES_COUNT / (enqueue_time + queue_time):8.0f} размещений/с')
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DJANGO_DB_NAME'] = os.path.join(directory, 'db.sqlite3')
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
+        import django
+        django.setup()
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        measure()
+
+
+if __name__ == '__main__':
+    main()
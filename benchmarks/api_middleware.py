@@ -0,0 +1,68 @@
+"""
+Сравнение времени обработки запроса API при полном наборе middleware и аутентификации DRF по умолчанию
+(API_MIDDLEWARE_PROFILE=0) и в профиле API (API_MIDDLEWARE_PROFILE=1, см. coils_and_wires/middleware.py).
+
+Приложение coils_and_wires.wsgi вызывается напрямую, без сетевого сервера, на временной базе данных SQLite.
+Измеряются запросы GET /v1/allocate/queue/<ticket> к несуществующей заявке (ответ 404 после одного запроса
+к базе данных) без cookie и с cookie сессии, которую передают клиенты, ранее работавшие
+с административным интерфейсом, а также запросы к несуществующему адресу /v1/unknown (ответ 404
+без обращения к базе данных, время определяется набором middleware). Каждый профиль измеряется
+в отдельном процессе.
+
+Запуск: python -m benchmarks.api_middleware
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+REQUESTS_COUNT = 3000
+
+
+def measure(path: str, cookie: str = '') -> float:
+    """Возвращает среднее время обработки запроса API (в секундах)."""
+    from coils_and_wires.wsgi import application
+
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+               'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer}
+    if cookie:
+        environ['HTTP_COOKIE'] = cookie
+    statuses: list[str] = []
+    start = time.perf_counter()
+    for _ in range(REQUESTS_COUNT):
+        application(dict(environ), lambda status, headers: statuses.append(status)).close()
+    elapsed = time.perf_counter() - start
+    assert all(status.startswith('404') for status in statuses)
+    return elapsed / REQUESTS_COUNT
+
+
+def run(title: str) -> None:
+    import django
+    django.setup()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    ticket_path = f'/v1/allocate/queue/{uuid.uuid4()}'
+    without_cookie = measure(ticket_path)
+    with_cookie = measure(ticket_path, 'sessionid=0123456789abcdefghijklmnopqrstuv')
+    unknown_time = measure('/v1/unknown')
+    print(f'{title:<24} заявка: {without_cookie * 1e6:5.0f} мкс, заявка с cookie сессии: {with_cookie * 1e6:5.0f} мкс, '
+          f'/v1/unknown: {unknown_time * 1e6:5.0f} мкс')
+
+
+def main() -> None:
+    print(f'Среднее время обработки запроса API, {REQUESTS_COUNT} запросов')
+    for title, profile in (('полный набор middleware', '0'), ('профиль API', '1')):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DJANGO_SETTINGS_MODULE='coils_and_wires.settings', API_MIDDLEWARE_PROFILE=profile,
+                       DJANGO_DB_NAME=os.path.join(directory, 'db.sqlite3'))
+            subprocess.run([sys.executable, '-m', 'benchmarks.api_middleware', title], env=env, check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        main()
+    else:
+        run(sys.argv[1])
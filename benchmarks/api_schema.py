@@ -0,0 +1,50 @@
+"""
+Сравнение времени ответа на запрос схемы API (GET /v1/schema/) при создании схемы для каждого запроса
+(SpectacularAPIView) и при схеме, хранящейся в памяти процесса (CachedSpectacularAPIView):
+первый запрос, когда схема создается, и последующие запросы. Ответы в формате YAML (по умолчанию).
+
+Запуск: python -m benchmarks.api_schema
+"""
+import os
+import time
+from typing import Any, Callable
+
+REQUESTS_COUNT = 20
+
+
+def measure(view: Callable[..., Any], count: int, accept: str = 'application/vnd.oai.openapi') -> float:
+    """Возвращает среднее время ответа представления view на запрос схемы API в формате accept (в секундах)."""
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    start = time.perf_counter()
+    for _ in range(count):
+        response = view(factory.get('/v1/schema/', HTTP_ACCEPT=accept))
+        # Ответ SpectacularAPIView преобразуется в тело ответа при вызове render()
+        if hasattr(response, 'render'):
+            response.render()
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
+    os.environ['API_SCHEMA_ENABLED'] = '1'
+    import django
+    django.setup()
+    from drf_spectacular.views import SpectacularAPIView
+
+    from coils_and_wires.api_schema import CachedSpectacularAPIView
+
+    cached_view = CachedSpectacularAPIView.as_view()
+    print(f'Время ответа на запрос схемы API, среднее для {REQUESTS_COUNT} запросов:')
+    uncached_time = measure(SpectacularAPIView.as_view(), REQUESTS_COUNT)
+    print(f'  создание схемы для каждого запроса:  {uncached_time * 1000:7.1f} мс')
+
+    CachedSpectacularAPIView.clear()
+    print(f'  первый запрос, создание схемы:       {measure(cached_view, 1) * 1000:7.1f} мс')
+    print(f'  последующие запросы:                 {measure(cached_view, REQUESTS_COUNT) * 1000:7.1f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Сравнение пропускной способности запросов GET /v1/allocate/<order_id>/<line_item> при развертывании
+под WSGI сервером (пул потоков) и под ASGI сервером (множество одновременных запросов в одном цикле событий).
+Представления DRF синхронные, под ASGI сервером они выполняются в отдельных потоках.
+
+Приложения coils_and_wires.wsgi и coils_and_wires.asgi вызываются напрямую, без сетевого сервера,
+на временной базе данных SQLite. Каждое из развертываний измеряется в отдельном процессе.
+
+Запуск: python -m benchmarks.asgi_wsgi
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+COILS_COUNT = 200
+LINES_PER_COIL = 5
+REQUESTS_COUNT = 2000
+# Количество потоков WSGI сервера
+WSGI_THREADS = 8
+# Количество одновременных запросов к ASGI серверу
+ASGI_CONCURRENCY = 200
+
+# Наибольшее количество потоков процесса во время измерения
+peak_threads = 0
+
+
+def update_peak_threads() -> None:
+    global peak_threads
+    peak_threads = max(peak_threads, threading.active_count())
+
+
+def setup_database(database_name: str) -> list[str]:
+    """Создает временную базу данных с бухтами и размещенными товарными позициями, возвращает пути запросов."""
+    import django
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database_name
+    django.setup()
+    from django.core.management import call_command
+
+    from allocation import models as django_models
+    call_command('migrate', verbosity=0)
+    coils = django_models.CoilDB.objects.bulk_create(
+        django_models.CoilDB(reference=f'Бухта-{number:05}', product_id='АВВГ_2х6', quantity=1000,
+                             recommended_balance=10, acceptable_loss=2) for number in range(COILS_COUNT))
+    lines = django_models.OrderLineDB.objects.bulk_create(
+        django_models.OrderLineDB(order_id=f'Заказ-{number:05}', line_item=f'Позиция-{item:03}',
+                                  product_id='АВВГ_2х6', quantity=10)
+        for number in range(COILS_COUNT) for item in range(LINES_PER_COIL))
+    django_models.AllocationDB.objects.bulk_create(
+        django_models.AllocationDB(coil_record=coils[index // LINES_PER_COIL], orderline_record=line)
+        for index, line in enumerate(lines))
+    return [f'/v1/allocate/{line.order_id}/{line.line_item}' for line in lines]
+
+
+def run_wsgi(paths: list[str]) -> None:
+    from coils_and_wires.wsgi import application
+
+    def request(path: str) -> None:
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path.encode().decode('iso-8859-1'),
+                   'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'wsgi.url_scheme': 'http',
+                   'wsgi.input': sys.stdin.buffer}
+        statuses = []
+        application(environ, lambda status, headers: statuses.append(status))
+        update_peak_threads()
+        assert statuses[0].startswith('200')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+        for _ in executor.map(request, (paths[number % len(paths)] for number in range(REQUESTS_COUNT))):
+            pass
+    report(f'WSGI, {WSGI_THREADS} потоков', time.perf_counter() - start)
+
+
+def run_asgi(paths: list[str]) -> None:
+    from coils_and_wires.asgi import application
+
+    async def request(path: str, semaphore: asyncio.Semaphore) -> None:
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+                 'server': ('localhost', 80)}
+        messages: list[dict[str, Any]] = []
+
+        async def receive() -> dict[str, Any]:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: dict[str, Any]) -> None:
+            messages.append(message)
+            update_peak_threads()
+
+        async with semaphore:
+            await application(scope, receive, send)
+        assert messages[0]['status'] == 200
+
+    async def main() -> None:
+        semaphore = asyncio.Semaphore(ASGI_CONCURRENCY)
+        await asyncio.gather(*(request(paths[number % len(paths)], semaphore) for number in range(REQUESTS_COUNT)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    report(f'ASGI, {ASGI_CONCURRENCY} одновременных запросов', time.perf_counter() - start)
+
+
+def report(title: str, elapsed: float) -> None:
+    print(f'{title:<40} {REQUESTS_COUNT / elapsed:8.0f} запросов/с, потоков не более {peak_threads}')
+
+
+def main() -> None:
+    for mode in ('wsgi', 'asgi'):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='coils_and_wires.settings')
+        subprocess.run([sys.executable, '-m', 'benchmarks.asgi_wsgi', mode], env=env, check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        main()
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            request_paths = setup_database(os.path.join(directory, 'db.sqlite3'))
+            run_wsgi(request_paths) if sys.argv[1] == 'wsgi' else run_asgi(request_paths)
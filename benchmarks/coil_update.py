@@ -0,0 +1,110 @@
+"""
+Сравнение времени сохранения бухты методом DjangoCoilRepository.update с прежней реализацией,
+которая удаляла все записи размещений бухты и создавала их заново по одной (get_or_create),
+и времени поиска товарной позиции по идентификаторам (order_id, line_item) с индексом
+allocation_orderline_idx и без него.
+
+В бухте размещено lines_count товарных позиций, при сохранении к ним добавляется одна товарная позиция,
+как при размещении товарной позиции запросом POST /v1/allocate.
+Измерение выполняется на временной базе данных.
+
+Запуск: python -m benchmarks.coil_update
+"""
+import os
+import tempfile
+import time
+
+from allocation.domain import domain_logic
+
+LINES_COUNTS = (10, 100, 500)
+# Количество товарных позиций в таблице OrderLineDB для измерения поиска
+LOOKUP_LINES_COUNT = 20000
+LOOKUP_NUMBER = 500
+
+
+def full_rewrite_update(coil_domain: domain_logic.Coil) -> None:
+    """Прежняя реализация сохранения размещений в методе DjangoCoilRepository.update."""
+    from allocation import models as django_models
+
+    coil_record = django_models.CoilDB.objects.get(reference=coil_domain.reference)
+    django_models.AllocationDB.objects.filter(coil_record=coil_record).delete()
+    for line in coil_domain.allocations:
+        orderline_record = django_models.OrderLineDB.objects.get(order_id=line.order_id, line_item=line.line_item)
+        django_models.AllocationDB.objects.get_or_create(coil_record=coil_record, orderline_record=orderline_record)
+
+
+def measure_update(lines_count: int) -> tuple[float, float]:
+    """Возвращает время сохранения бухты с одной новой товарной позицией прежней и текущей реализацией."""
+    from django.db import transaction
+
+    from allocation import models as django_models
+    from allocation.adapters import repository
+
+    results = []
+    for prefix, update in (('А', full_rewrite_update), ('Б', repository.DjangoCoilRepository().update)):
+        reference = f'{prefix}-Бухта-{lines_count}'
+        django_models.CoilDB.objects.create(reference=reference, product_id='АВВГ_2х6',
+                                            quantity=(lines_count + 1) * 10, recommended_balance=10, acceptable_loss=2)
+        coil = domain_logic.Coil(reference, 'АВВГ_2х6', (lines_count + 1) * 10, 10, 2)
+        lines = [domain_logic.OrderLine(f'{prefix}-Заказ-{lines_count}', f'Позиция-{number:05}', 'АВВГ_2х6', 10)
+                 for number in range(lines_count + 1)]
+        django_models.OrderLineDB.objects.bulk_create(
+            django_models.OrderLineDB(order_id=line.order_id, line_item=line.line_item,
+                                      product_id=line.product_id, quantity=line.quantity) for line in lines)
+        coil.allocations = set(lines[:-1])
+        repository.DjangoCoilRepository().update(coil)
+        coil.allocations.add(lines[-1])
+        with transaction.atomic():
+            start = time.perf_counter()
+            update(coil)
+            results.append(time.perf_counter() - start)
+        assert django_models.AllocationDB.objects.filter(coil_record__reference=reference).count() == lines_count + 1
+    return results[0], results[1]
+
+
+def measure_lookup() -> tuple[float, float]:
+    """Возвращает среднее время поиска товарной позиции без индекса allocation_orderline_idx и с ним."""
+    from django.db import connection
+
+    from allocation import models as django_models
+
+    django_models.OrderLineDB.objects.bulk_create(
+        django_models.OrderLineDB(order_id=f'В-Заказ-{number // 10:05}', line_item=f'Позиция-{number % 10:03}',
+                                  product_id='АВВГ_2х6', quantity=10)
+        for number in range(LOOKUP_LINES_COUNT))
+    keys = [(f'В-Заказ-{number // 10:05}', f'Позиция-{number % 10:03}')
+            for number in range(0, LOOKUP_LINES_COUNT, LOOKUP_LINES_COUNT // LOOKUP_NUMBER)]
+
+    def lookup() -> float:
+        start = time.perf_counter()
+        for order_id, line_item in keys:
+            django_models.OrderLineDB.objects.get(order_id=order_id, line_item=line_item)
+        return (time.perf_counter() - start) / len(keys)
+
+    with connection.cursor() as cursor:
+        cursor.execute('DROP INDEX allocation_orderline_idx')
+        without_index = lookup()
+        cursor.execute('CREATE INDEX allocation_orderline_idx ON allocation_orderlinedb (order_id, line_item)')
+    return without_index, lookup()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DJANGO_DB_NAME'] = os.path.join(directory, 'db.sqlite3')
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
+        import django
+        django.setup()
+        from django.core.management import call_command
+
+        call_command('migrate', verbosity=0)
+        for lines_count in LINES_COUNTS:
+            before, after = measure_update(lines_count)
+            print(f'{lines_count:>4} позиций в бухте: удаление и создание размещений {before * 1e3:8.1f} мс, '
+                  f'только измененные размещения {after * 1e3:8.1f} мс, ускорение {before / after:.1f}x')
+        without_index, with_index = measure_lookup()
+        print(f'Поиск товарной позиции среди {LOOKUP_LINES_COUNT}: без индекса {without_index * 1e6:8.1f} мкс, '
+              f'с индексом {with_index * 1e6:8.1f} мкс, ускорение {without_index / with_index:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
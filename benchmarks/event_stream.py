@@ -0,0 +1,122 @@
+"""
+Стоимость подписчиков потока событий (GET /v1/events/stream) в сравнении с периодическими запросами
+GET /v1/coils/<reference>, которые заменяет поток.
+
+SUBSCRIBERS_COUNT подписчиков подключаются к приложению ASGI потока событий в одном процессе
+и в течение IDLE_SECONDS не получают событий. Измеряются память на одного подписчика, количество
+запросов к базе данных и время процессора за это время, а также время доставки одного события всем
+подписчикам. Для сравнения измеряется время процессора на запросы бухты, которые выполнили бы
+те же клиенты, запрашивающие бухту каждые POLLING_INTERVAL секунд.
+Измерение выполняется на временной базе данных.
+
+Запуск: python -m benchmarks.event_stream
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+SUBSCRIBERS_COUNT = 1000
+IDLE_SECONDS = 5.0
+POLLING_INTERVAL = 2.0
+
+
+async def measure_stream() -> None:
+    from asgiref.sync import sync_to_async
+
+    from allocation.adapters import outbox
+    from allocation.api import event_stream
+    from allocation.services import services, unit_of_work
+
+    reads = 0
+    outbox_after = outbox.after
+
+    def counted_after(last_id: int, limit: int) -> Any:
+        nonlocal reads
+        reads += 1
+        return outbox_after(last_id, limit)
+
+    outbox.after = counted_after  # type: ignore[assignment]
+    disconnect = asyncio.Event()
+    received = 0
+    all_received = asyncio.Event()
+
+    async def receive() -> dict[str, Any]:
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal received
+        if message.get('body', b'').startswith(b'id:'):
+            received += 1
+            if received == SUBSCRIBERS_COUNT:
+                all_received.set()
+
+    scope = {'type': 'http', 'method': 'GET', 'path': event_stream.EVENT_STREAM_PATH,
+             'query_string': 'product_id=АВВГ_2х2,5'.encode(), 'headers': []}
+    application = event_stream.with_event_stream(None)  # type: ignore[arg-type]
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    streams = [asyncio.ensure_future(application(scope, receive, send)) for _ in range(SUBSCRIBERS_COUNT)]
+    while len(event_stream.broadcaster.subscriptions) < SUBSCRIBERS_COUNT:
+        await asyncio.sleep(0.01)
+    memory_per_subscriber = (tracemalloc.get_traced_memory()[0] - memory_before) / SUBSCRIBERS_COUNT
+    tracemalloc.stop()
+
+    reads = 0
+    cpu_start = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    idle_cpu = time.process_time() - cpu_start
+    idle_reads = reads
+
+    start = time.perf_counter()
+    await sync_to_async(services.allocate)('Заказ-001', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+    await all_received.wait()
+    delivery_time = time.perf_counter() - start
+
+    disconnect.set()
+    await asyncio.gather(*streams)
+
+    print(f'Подписчиков: {SUBSCRIBERS_COUNT}, ожидание событий {IDLE_SECONDS:.0f} с')
+    print(f'  память на подписчика:              {memory_per_subscriber / 1024:8.1f} КБ')
+    print(f'  запросов к базе данных:            {idle_reads:8d}')
+    print(f'  время процессора:                  {idle_cpu:8.3f} с')
+    print(f'  доставка события всем подписчикам: {delivery_time * 1000:8.1f} мс')
+
+
+def measure_polling() -> None:
+    from allocation.adapters import queries
+
+    requests_count = int(SUBSCRIBERS_COUNT * IDLE_SECONDS / POLLING_INTERVAL)
+    cpu_start = time.process_time()
+    for _ in range(requests_count):
+        queries.coil('Бухта-001')
+    polling_cpu = time.process_time() - cpu_start
+    print(f'Периодические запросы бухты каждые {POLLING_INTERVAL:.0f} с за то же время (без обработки HTTP)')
+    print(f'  запросов к базе данных:            {requests_count:8d}')
+    print(f'  время процессора:                  {polling_cpu:8.3f} с')
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['DJANGO_DB_NAME'] = os.path.join(directory, 'db.sqlite3')
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
+        import django
+        django.setup()
+        from django.core.management import call_command
+
+        from allocation.services import services, unit_of_work
+
+        call_command('migrate', verbosity=0)
+        services.add_a_coil('Бухта-001', 'АВВГ_2х2,5', 1000, 10, 2, unit_of_work.DjangoUnitOfWork())
+        services.add_a_line('Заказ-001', 'Позиция-001', 'АВВГ_2х2,5', 10, unit_of_work.DjangoUnitOfWork())
+
+        asyncio.run(measure_stream())
+        measure_polling()
+
+
+if __name__ == '__main__':
+    main()
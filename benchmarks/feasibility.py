@@ -0,0 +1,50 @@
+"""
+Измерение времени поиска бухт, в которых может быть размещена товарная позиция, по пулу бухт одного материала.
+
+Запуск: python -m benchmarks.feasibility
+"""
+import random
+import time
+
+from allocation.domain.coil_pool import CoilPool
+from allocation.domain.domain_logic import OrderLine
+
+
+REPEATS = 20
+
+
+def make_pool(coils_count: int, rnd: random.Random) -> CoilPool:
+    """Создает пул из coils_count бухт с материалом АВВГ_2х6."""
+    pool = CoilPool('АВВГ_2х6')
+    for number in range(coils_count):
+        initial_quantity = rnd.randint(100, 500)
+        pool.add_coil(f'Бухта-{number:05}', initial_quantity, rnd.randint(0, initial_quantity),
+                      rnd.randint(5, 20), rnd.randint(1, 5))
+    return pool
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    for coils_count in (1000, 10000, 50000):
+        pool = make_pool(coils_count, rnd)
+        coils = pool.to_coils()
+        for coil, allocated_quantity in zip(coils, pool.allocated_quantities):
+            coil.allocations.add(OrderLine(f'Заказ-{coil.reference}', 'Позиция-001', 'АВВГ_2х6', allocated_quantity))
+        line = OrderLine('Заказ-99999', 'Позиция-001', 'АВВГ_2х6', 120)
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            indexes = pool.feasible(line.quantity)
+        pool_elapsed = (time.perf_counter() - start) / REPEATS
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            references = [coil.reference for coil in sorted(coils) if coil.can_allocate(line)]
+        coils_elapsed = (time.perf_counter() - start) / REPEATS
+
+        assert [pool.references[index] for index in indexes] == references
+        print(f'{coils_count:>6} бухт: CoilPool {pool_elapsed * 1000:7.2f} мс, '
+              f'list[Coil] {coils_elapsed * 1000:7.2f} мс, подходит {len(indexes)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Измерение времени построения множества из 1 000 000 товарных позиций при хэшировании
+конкатенации идентификаторов и при хэше кортежа идентификаторов, вычисленном однократно.
+
+Запуск: python -m benchmarks.orderline_hash
+"""
+import time
+
+from allocation.domain.domain_logic import OrderLine
+
+
+LINES_COUNT = 1_000_000
+
+
+class ConcatenatedHashOrderLine(OrderLine):
+    """Товарная позиция с прежним хэшем конкатенации order_id и line_item."""
+    __slots__: list[str] = []
+
+    def __hash__(self) -> int:
+        return hash(self.order_id + self.line_item)
+
+
+def measure(line_class: type[OrderLine]) -> float:
+    """Возвращает время (в секундах) построения двух множеств из LINES_COUNT экземпляров line_class."""
+    lines = [line_class(f'Заказ-{number // 10:06}', f'Позиция-{number % 10:03}', 'АВВГ_2х6', 10)
+             for number in range(LINES_COUNT)]
+    start = time.perf_counter()
+    lines_set = set(lines)
+    # Повторное хэширование тех же экземпляров, как при повторной загрузке размещений бухт
+    assert len(lines_set | set(lines)) == LINES_COUNT
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    concatenated = measure(ConcatenatedHashOrderLine)
+    cached = measure(OrderLine)
+    print(f'Конкатенация идентификаторов: {concatenated * 1000:8.1f} мс')
+    print(f'Однократно вычисленный хэш:   {cached * 1000:8.1f} мс')
+    print(f'Ускорение: {concatenated / cached:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
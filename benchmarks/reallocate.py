@@ -0,0 +1,45 @@
+"""
+Сравнение времени выполнения метода Coil.reallocate с прежней реализацией,
+которая выполняла глубокое копирование бухты.
+
+Запуск: python -m benchmarks.reallocate
+"""
+import random
+import timeit
+from copy import deepcopy
+from functools import partial
+
+from allocation.domain.domain_logic import Coil, OrderLine
+
+
+def deepcopy_reallocate(old_coil: Coil, coil: Coil) -> set[OrderLine]:
+    """Прежняя реализация метода Coil.reallocate."""
+    new_coil = deepcopy(coil)
+    for line in sorted(old_coil.allocations, key=lambda x: x.quantity):
+        new_coil.allocate(line)
+    return new_coil.allocations
+
+
+def make_coil(lines_count: int) -> Coil:
+    """Создает бухту, в которой размещено lines_count товарных позиций."""
+    rnd = random.Random(lines_count)
+    coil = Coil('Бухта-001', 'АВВГ_2х6', lines_count * 50, 10, 3)
+    coil.allocations = {OrderLine('Заказ-001', f'Позиция-{number:05}', 'АВВГ_2х6', rnd.randint(1, 50))
+                        for number in range(lines_count)}
+    return coil
+
+
+def main() -> None:
+    for lines_count in (10, 100, 500):
+        old_coil = make_coil(lines_count)
+        new_coil = Coil('Бухта-001', 'АВВГ_2х6', lines_count * 20, 10, 3)
+        assert old_coil.reallocate(new_coil) == deepcopy_reallocate(old_coil, new_coil)
+        number = 2000 // lines_count + 10
+        before = timeit.timeit(partial(deepcopy_reallocate, old_coil, new_coil), number=number) / number
+        after = timeit.timeit(partial(old_coil.reallocate, new_coil), number=number) / number
+        print(f'{lines_count:>4} позиций: deepcopy {before * 1e6:9.1f} мкс, '
+              f'без копирования {after * 1e6:9.1f} мкс, ускорение {before / after:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
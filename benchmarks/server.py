@@ -0,0 +1,109 @@
+"""
+Сравнение пропускной способности запросов GET /v1/allocate/<order_id>/<line_item> при запуске
+сервером разработки (python manage.py runserver, DEBUG=1) и сервером gunicorn с конфигурацией
+gunicorn.conf.py (DEBUG=0).
+
+Серверы запускаются в отдельных процессах на временной базе данных SQLite, запросы отправляются
+по HTTP из нескольких потоков. После измерения выводится суммарная резидентная память процессов
+сервера (читается из /proc, поэтому доступна только в Linux).
+
+Запуск: python -m benchmarks.server
+"""
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.asgi_wsgi import setup_database
+
+PORT = 8765
+REQUESTS_COUNT = 3000
+# Количество одновременных клиентов
+CLIENTS = 16
+
+SERVERS = {
+    'runserver, DEBUG=1': ([sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{PORT}', '--noreload'],
+                           {'DJANGO_DEBUG': '1'}),
+    'gunicorn, DEBUG=0': ([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'coils_and_wires.wsgi'],
+                          {'DJANGO_DEBUG': '0', 'GUNICORN_BIND': f'127.0.0.1:{PORT}'}),
+}
+
+
+def wait_for_server(timeout: float = 20) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=1)
+            connection.request('GET', '/v1/coils/none')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Сервер не запустился')
+
+
+def process_tree_rss(pid: int) -> int:
+    """Возвращает суммарную резидентную память процесса и его дочерних процессов в килобайтах."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as stat:
+                    parent = int(stat.read().rsplit(')', 1)[1].split()[1])
+            except OSError:
+                continue
+            children.setdefault(parent, []).append(int(entry))
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/status') as status:
+                total += next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+        except (OSError, StopIteration):
+            pass
+    return total
+
+
+def run_clients(paths: list[str]) -> float:
+    def request(path: str) -> None:
+        connection = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+        connection.request('GET', urllib.parse.quote(path))
+        response = connection.getresponse()
+        response.read()
+        connection.close()
+        assert response.status == 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as executor:
+        for _ in executor.map(request, (paths[number % len(paths)] for number in range(REQUESTS_COUNT))):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
+    with tempfile.TemporaryDirectory() as directory:
+        database_name = os.path.join(directory, 'db.sqlite3')
+        paths = setup_database(database_name)
+        for title, (command, server_env) in SERVERS.items():
+            env = dict(os.environ, DJANGO_DB_NAME=database_name, **server_env)
+            server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                      start_new_session=True)
+            try:
+                wait_for_server()
+                elapsed = run_clients(paths)
+                rss = process_tree_rss(server.pid)
+            finally:
+                os.killpg(server.pid, signal.SIGTERM)
+                server.wait()
+            print(f'{title:<24} {REQUESTS_COUNT / elapsed:8.0f} запросов/с, память процессов {rss // 1024} МБ')
+
+
+if __name__ == '__main__':
+    main()
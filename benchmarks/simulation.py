@@ -0,0 +1,39 @@
+"""
+Измерение времени моделирования размещения товарных позиций на снимке состояния склада.
+
+Запуск: python -m benchmarks.simulation
+"""
+import random
+import time
+
+from allocation.domain.domain_logic import OrderLine
+from allocation.domain.simulation import WarehouseSnapshot, simulate_allocation
+
+
+PRODUCT_IDS = [f'АВВГ_{number}' for number in range(20)]
+
+
+def make_snapshot(coils_count: int, rnd: random.Random) -> WarehouseSnapshot:
+    """Создает снимок состояния склада с coils_count бухтами."""
+    snapshot = WarehouseSnapshot()
+    for number in range(coils_count):
+        snapshot.add_coil(f'Бухта-{number:05}', rnd.choice(PRODUCT_IDS), rnd.randint(100, 500),
+                          rnd.randint(5, 20), rnd.randint(1, 5))
+    return snapshot
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    for coils_count, lines_count in ((1000, 10000), (10000, 10000), (10000, 100000)):
+        snapshot = make_snapshot(coils_count, rnd)
+        lines = [OrderLine(f'Заказ-{number // 10:05}', f'Позиция-{number % 10:03}', rnd.choice(PRODUCT_IDS),
+                           rnd.randint(1, 60)) for number in range(lines_count)]
+        start = time.perf_counter()
+        result = simulate_allocation(lines, snapshot)
+        elapsed = time.perf_counter() - start
+        print(f'{coils_count:>6} бухт, {lines_count:>6} позиций: {elapsed * 1000:8.1f} мс, '
+              f'не размещено {len(result.out_of_stock)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Сравнение пропускной способности размещения товарных позиций (services.allocate) на базе данных SQLite
+с настройками по умолчанию (журнал отката, synchronous=FULL, новое соединение для каждого запроса)
+и с настройками SQLITE_PRAGMAS и CONN_MAX_AGE из coils_and_wires/settings.py.
+
+Товарные позиции распределены по материалам бухт поровну, чтобы время обновления бухты
+не зависело от количества размещенных в ней товарных позиций. Каждое размещение выполняется
+так же, как при обработке запроса: после него вызывается close_old_connections(),
+которая закрывает соединение при CONN_MAX_AGE=0.
+Каждый профиль измеряется в отдельном процессе на временной базе данных.
+
+Запуск: python -m benchmarks.sqlite_pragmas
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+COILS_COUNT = 200
+LINES_COUNT = 1000
+
+PROFILES: dict[str, dict[str, str]] = {
+    'журнал отката, CONN_MAX_AGE=0': {
+        'SQLITE_JOURNAL_MODE': 'delete', 'SQLITE_SYNCHRONOUS': 'full', 'SQLITE_BUSY_TIMEOUT': '',
+        'SQLITE_CACHE_SIZE': '', 'SQLITE_MMAP_SIZE': '', 'DJANGO_CONN_MAX_AGE': '0',
+    },
+    'WAL и PRAGMA, CONN_MAX_AGE=60': {},
+}
+
+
+def run(title: str, database_name: str) -> None:
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import close_old_connections
+
+    from allocation import models as django_models
+    from allocation.services import services, unit_of_work
+
+    call_command('migrate', verbosity=0)
+    django_models.CoilDB.objects.bulk_create(
+        django_models.CoilDB(reference=f'Бухта-{number:05}', product_id=f'АВВГ_{number}', quantity=1000,
+                             recommended_balance=10, acceptable_loss=2) for number in range(COILS_COUNT))
+    lines = django_models.OrderLineDB.objects.bulk_create(
+        django_models.OrderLineDB(order_id=f'Заказ-{number:05}', line_item='Позиция-001',
+                                  product_id=f'АВВГ_{number % COILS_COUNT}', quantity=10)
+        for number in range(LINES_COUNT))
+    close_old_connections()
+
+    start = time.perf_counter()
+    for line in lines:
+        services.allocate(line.order_id, line.line_item, unit_of_work.DjangoUnitOfWork())
+        close_old_connections()
+    elapsed = time.perf_counter() - start
+    print(f'{title:<32} {LINES_COUNT / elapsed:8.0f} размещений/с')
+
+
+def main() -> None:
+    for title, profile in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DJANGO_SETTINGS_MODULE='coils_and_wires.settings',
+                       DJANGO_DB_NAME=os.path.join(directory, 'db.sqlite3'), **profile)
+            subprocess.run([sys.executable, '-m', 'benchmarks.sqlite_pragmas', title], env=env, check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        main()
+    else:
+        run(sys.argv[1], os.environ['DJANGO_DB_NAME'])
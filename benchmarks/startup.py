@@ -0,0 +1,65 @@
+"""
+Сравнение времени запуска со схемой API (API_SCHEMA_ENABLED=1, загружаются приложение drf_spectacular
+и представления схемы из coils_and_wires/api_schema.py) и без нее (API_SCHEMA_ENABLED=0).
+
+Измеряются время выполнения команды manage.py check (загрузка настроек, приложений и URL,
+как у команд управления) и время от запуска процесса до ответа на первый запрос к API
+(как у процесса-обработчика gunicorn после перезапуска). Каждое измерение выполняется
+в отдельном процессе RUNS раз на временной базе данных, выводится медиана.
+
+Запуск: python -m benchmarks.startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 7
+
+PROFILES: dict[str, dict[str, str]] = {
+    'схема API включена': {'API_SCHEMA_ENABLED': '1'},
+    'схема API выключена': {'API_SCHEMA_ENABLED': '0'},
+}
+
+
+def first_request() -> None:
+    """Загружает приложение WSGI и выполняет первый запрос к API."""
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    from django.test import Client
+
+    response = Client().get('/v1/coils/Бухта-001')
+    assert response.status_code == 404
+
+
+def measure(command: list[str], env: dict[str, str]) -> float:
+    """Возвращает медиану времени выполнения команды в отдельном процессе."""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='coils_and_wires.settings',
+                   DJANGO_DB_NAME=os.path.join(directory, 'db.sqlite3'))
+        subprocess.run([sys.executable, 'manage.py', 'migrate', '--verbosity', '0'], env=env, check=True)
+        print(f'Медиана {RUNS} запусков')
+        for title, profile in PROFILES.items():
+            profile_env = dict(env, **profile)
+            check_time = measure([sys.executable, 'manage.py', 'check'], profile_env)
+            request_time = measure([sys.executable, '-m', 'benchmarks.startup', 'first_request'], profile_env)
+            print(f'{title:<20} manage.py check: {check_time * 1000:6.0f} мс, '
+                  f'первый запрос: {request_time * 1000:6.0f} мс')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        main()
+    else:
+        first_request()
@@ -0,0 +1,86 @@
+"""
+Схема OpenAPI и интерактивная документация API (Swagger UI).
+
+Модуль подключается к адресам только при API_SCHEMA_ENABLED=True (см. coils_and_wires/urls.py),
+поэтому процессы-обработчики и команды управления без схемы API не загружают drf_spectacular, описания,
+примеры и ответы представлений API. Описания применяются к представлениям allocation/api/api_views.py
+декоратором extend_schema_view при загрузке модуля, см. coils_and_wires/drf_spectacular.py.
+
+Схема API создается однократно, при первом запросе к /v1/schema/, и хранится в памяти процесса.
+"""
+from typing import Any
+
+from django.http import HttpResponse
+from django.urls import path
+from django.utils import translation
+
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from rest_framework.request import Request
+
+from coils_and_wires import drf_spectacular
+
+# Наибольшее количество вариантов схемы API (версий и языков) и тел ответов, хранящихся в памяти процесса.
+# Параметры version и lang задаются в запросе, поэтому количество вариантов ограничено
+SCHEMA_CACHE_SIZE = 16
+
+# Описания, примеры и ответы представлений API применяются к ним только при загрузке схемы API
+for view, methods_schema in drf_spectacular.views_schema.items():
+    extend_schema_view(**methods_schema)(view)
+
+
+class CachedSchemaGenerator(SchemaGenerator):
+    """Генератор схемы API, который хранит созданную схему в памяти процесса для каждой версии API и языка."""
+    # Схемы API по версиям API и языкам
+    schemas: dict[tuple[str | None, str | None], dict[str, Any]] = {}
+
+    def get_schema(self, request: Request | None = None, public: bool = False) -> dict[str, Any]:
+        key = (self.api_version, translation.get_language())
+        schema = self.schemas.get(key)
+        if schema is None:
+            schema = super().get_schema(request=request, public=public)
+            if len(self.schemas) < SCHEMA_CACHE_SIZE:
+                self.schemas[key] = schema
+        return schema
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Схема API, которая создается при первом запросе и хранится в памяти процесса до его перезапуска
+    (развертывания новой версии приложения).
+    Для каждого формата (YAML, JSON), версии API и языка (параметры version и lang) схема
+    преобразуется в тело ответа однократно.
+    """
+    generator_class = CachedSchemaGenerator
+    # Тела и заголовки ответов по типам содержимого и параметрам version и lang
+    responses: dict[tuple[str, str, str], tuple[bytes, dict[str, str]]] = {}
+
+    # Представление схемы API не включается в схему, как и в SpectacularAPIView (SERVE_INCLUDE_SCHEMA=False)
+    @extend_schema(exclude=True)
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        key = (request.accepted_media_type, request.GET.get('version', ''), request.GET.get('lang', ''))
+        if key in self.responses:
+            content, headers = self.responses[key]
+            return HttpResponse(content, headers=headers)
+        response = super().get(request, *args, **kwargs)
+
+        def save_response(rendered_response: HttpResponse) -> None:
+            if len(self.responses) < SCHEMA_CACHE_SIZE:
+                self.responses[key] = (rendered_response.content, {
+                    header: rendered_response[header] for header in ('Content-Type', 'Content-Disposition')})
+
+        response.add_post_render_callback(save_response)
+        return response
+
+    @staticmethod
+    def clear() -> None:
+        """Удаляет схемы API и тела ответов из памяти процесса."""
+        CachedSchemaGenerator.schemas.clear()
+        CachedSpectacularAPIView.responses.clear()
+
+
+urlpatterns = [
+    path('schema/', CachedSpectacularAPIView.as_view(), name='schema'),
+    path('schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+]
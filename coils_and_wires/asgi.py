@@ -13,4 +13,10 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coils_and_wires.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from allocation.api.event_stream import with_event_stream  # noqa: E402
+
+# Поток событий размещения обслуживается отдельным приложением ASGI,
+# так как обработчик ASGI Django 4.0 не поддерживает асинхронную потоковую передачу ответа
+application = with_event_stream(django_application)
@@ -1,13 +1,10 @@
-from django.urls import path
+from typing import Any
 
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.plumbing import build_array_type, build_object_type
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema
+from pydantic import BaseModel
 
-
-urlpatterns = [
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-]
+from allocation.api import api_views, serializers
 
 
 coils_descriptions = {
@@ -30,8 +27,36 @@ allocate_descriptions = {
     'post': 'Разместить товарную позицию в бухте',
     'delete': 'Отменить размещение в бухте товарной позиции '
               'с заданными идентификаторами order_id и line_item',
+    'simulate': 'Смоделировать последовательное размещение списка товарных позиций в бухтах '
+                'без изменения базы данных',
+    'queue': 'Создать заявку на размещение товарной позиции в бухте. Заявки обрабатываются пакетами '
+             'по материалу, результат размещения можно получить по идентификатору заявки',
+    'ticket': 'Получить заявку на размещение товарной позиции с заданным идентификатором ticket',
+}
+
+orders_descriptions = {
+    'post': 'Разместить в бухтах все неразмещенные товарные позиции заказа с заданным идентификатором order_id',
+}
+
+stock_descriptions = {
+    'feasible': 'Получить бухты с материалом product_id, в которых может быть размещена товарная позиция '
+                'с заданным количеством материала, в порядке выбора бухт при размещении',
 }
 
+stock_quantity_parameter_description = 'Количество материала товарной позиции'
+
+orders_prefer_locality_parameter_description = ('Если true, то товарные позиции заказа с одинаковым материалом '
+                                                'будут размещены в возможно меньшем количестве бухт')
+
+coils_optimize_parameter_description = ('Если true, то после обновления бухты в ней останутся размещенными '
+                                        'товарные позиции с наибольшим суммарным количеством материала')
+
+coils_reallocate_parameter_description = ('Если true, то товарные позиции, которые перестанут быть размещенными '
+                                          'в бухте, будут размещены в других бухтах с тем же материалом. '
+                                          'В ответе будут получены товарные позиции с идентификаторами бухт, '
+                                          'в которых они размещены (allocated), и товарные позиции, '
+                                          'которые не удалось разместить (out_of_stock)')
+
 
 coils_request_examples = [
     OpenApiExample(name='Пример 1',
@@ -143,6 +168,19 @@ lines_request_examples = [
                           "quantity": 65}),
 ]
 
+allocate_simulate_request_examples = [
+    OpenApiExample(name='Пример 1',
+                   summary='Товарные позиции (Заказ-005, Позиция-001) и (Заказ-006, Позиция-004)',
+                   value=[{"order_id": "Заказ-005",
+                           "line_item": "Позиция-001",
+                           "product_id": "АВВГ_2х2,5",
+                           "quantity": 25},
+                          {"order_id": "Заказ-006",
+                           "line_item": "Позиция-004",
+                           "product_id": "АВВГ_2х2,5",
+                           "quantity": 14}]),
+]
+
 
 coils_reference_request_examples = [
     OpenApiExample(name='Пример 1',
@@ -336,4 +374,293 @@ allocate_responses = {
         403: OpenApiResponse(description="Возвращаемая бухта, в которой была размещена товарная позиция, "
                                          "не прошла валидацию"),
     },
+    'simulate': {
+        200: OpenApiResponse(description="Получены товарные позиции с идентификаторами бухт, в которых они были "
+                                         "бы размещены (allocated), и товарные позиции, которые не удалось бы "
+                                         "разместить (out_of_stock)"),
+        400: OpenApiResponse(description="Товарные позиции в теле запроса не прошли валидацию"),
+    },
+    'queue': {
+        202: OpenApiResponse(description="Создана заявка на размещение товарной позиции с идентификаторами "
+                                         "order_id и line_item, полученными из тела запроса. Получена заявка "
+                                         "с идентификатором ticket, адрес заявки передается в заголовке Location"),
+        404: OpenApiResponse(description="Товарная позиция с идентификаторами order_id и line_item, "
+                                         "полученными из тела запроса, отсутствует в базе данных"),
+    },
+    'ticket': {
+        200: OpenApiResponse(description="Получена заявка с состоянием status: pending - ожидает размещения, "
+                                         "allocated - товарная позиция размещена в бухте reference, "
+                                         "out_of_stock - недостаточно материала, not_found - товарная позиция "
+                                         "удалена из базы данных до размещения, failed - заявка не обработана "
+                                         "из-за повторяющейся ошибки"),
+        404: OpenApiResponse(description="Заявка с заданным идентификатором ticket отсутствует в базе данных"),
+    },
+}
+
+orders_responses = {
+    'post': {
+        200: OpenApiResponse(description="Товарные позиции заказа с заданным идентификатором order_id размещены. "
+                                         "Получены товарные позиции заказа с идентификаторами бухт, в которых "
+                                         "они размещены (allocated), и товарные позиции, которые не удалось "
+                                         "разместить (out_of_stock)"),
+        404: OpenApiResponse(description="Товарные позиции заказа с заданным идентификатором order_id "
+                                         "отсутствуют в базе данных"),
+    },
+}
+
+stock_responses = {
+    'feasible': {
+        200: OpenApiResponse(description="Получен список бухт с идентификаторами (reference) и доступным "
+                                         "количеством материала (available_quantity), в которых может быть "
+                                         "размещена товарная позиция. Список пуст, если таких бухт нет"),
+        400: OpenApiResponse(description="Количество материала quantity не задано или не является "
+                                         "положительным целым числом"),
+    },
+}
+
+
+def array_request(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Возвращает описание тела запроса в формате JSON - массива объектов, поля которых
+    соответствуют полям модели pydantic model. Ограничения exclusiveMinimum и exclusiveMaximum
+    приводятся к формату OpenAPI 3.0.
+    """
+    model_schema = model.schema()
+    for field in model_schema['properties'].values():
+        for bound, limit in (('exclusiveMinimum', 'minimum'), ('exclusiveMaximum', 'maximum')):
+            if bound in field:
+                field[limit], field[bound] = field[bound], True
+    item_schema = build_object_type(properties=model_schema['properties'], required=model_schema['required'])
+    return {'application/json': build_array_type(item_schema)}
+
+
+# Описания представлений API для схемы API по классам представлений и именам методов.
+# Применяются декоратором extend_schema_view в coils_and_wires/api_schema.py, поэтому модуль
+# загружается, только если схема API включена (API_SCHEMA_ENABLED)
+views_schema = {
+    api_views.CoilView: {
+        'post': extend_schema(
+            tags=['Бухты'],
+            description=coils_descriptions['post'],
+            responses=coils_responses['post'],
+            request=serializers.CoilBaseModel,
+            examples=coils_request_examples,
+        ),
+    },
+    api_views.CoilDetailView: {
+        'get': extend_schema(
+            tags=['Бухты'],
+            description=coils_descriptions['get'],
+            responses=coils_responses['get'],
+            parameters=[
+                OpenApiParameter(
+                    name='reference',
+                    location='path',
+                    description='Идентификатор бухты',
+                    examples=coils_reference_request_examples,
+                ),
+            ],
+        ),
+        'put': extend_schema(
+            tags=['Бухты'],
+            description=coils_descriptions['put'],
+            responses=coils_responses['put'],
+            request=serializers.CoilBaseModel,
+            examples=coils_request_examples,
+            parameters=[
+                OpenApiParameter(
+                    name='reference',
+                    location='path',
+                    description='Идентификатор бухты',
+                    examples=coils_reference_request_examples,
+                ),
+                OpenApiParameter(
+                    name='optimize',
+                    location='query',
+                    type=bool,
+                    description=coils_optimize_parameter_description,
+                ),
+                OpenApiParameter(
+                    name='reallocate',
+                    location='query',
+                    type=bool,
+                    description=coils_reallocate_parameter_description,
+                ),
+            ],
+        ),
+        'delete': extend_schema(
+            tags=['Бухты'],
+            description=coils_descriptions['delete'],
+            responses=coils_responses['delete'],
+            parameters=[
+                OpenApiParameter(
+                    name='reference',
+                    location='path',
+                    description='Идентификатор бухты',
+                    examples=coils_reference_request_examples,
+                ),
+                OpenApiParameter(
+                    name='reallocate',
+                    location='query',
+                    type=bool,
+                    description=coils_reallocate_parameter_description,
+                ),
+            ],
+        ),
+    },
+    api_views.OrderLineView: {
+        'post': extend_schema(
+            tags=['Товарные позиции'],
+            description=lines_descriptions['post'],
+            responses=lines_responses['post'],
+            request=serializers.OrderLineBaseModel,
+            examples=lines_request_examples,
+        ),
+    },
+    api_views.OrderLineDetailView: {
+        'get': extend_schema(
+            tags=['Товарные позиции'],
+            description=lines_descriptions['get'],
+            responses=lines_responses['get'],
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='line_item',
+                                         location='path',
+                                         description='Номер товарной позиции в заказе',
+                                         examples=lines_line_item_request_examples),
+                        ],
+        ),
+        'put': extend_schema(
+            tags=['Товарные позиции'],
+            description=lines_descriptions['put'],
+            responses=lines_responses['put'],
+            request=serializers.OrderLineBaseModel,
+            examples=lines_request_examples,
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='line_item',
+                                         location='path',
+                                         description='Номер товарной позиции в заказе',
+                                         examples=lines_line_item_request_examples),
+                        ],
+        ),
+        'delete': extend_schema(
+            tags=['Товарные позиции'],
+            description=lines_descriptions['delete'],
+            responses=lines_responses['delete'],
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='line_item',
+                                         location='path',
+                                         description='Номер товарной позиции в заказе',
+                                         examples=lines_line_item_request_examples),
+                        ],
+        ),
+    },
+    api_views.AllocateView: {
+        'post': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['post'],
+            responses=allocate_responses['post'],
+            request=serializers.CoilBaseModel,
+            examples=lines_request_examples,
+        ),
+    },
+    api_views.AllocateSimulateView: {
+        'post': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['simulate'],
+            responses=allocate_responses['simulate'],
+            request=array_request(serializers.OrderLineBaseModel),
+            examples=allocate_simulate_request_examples,
+        ),
+    },
+    api_views.AllocateQueueView: {
+        'post': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['queue'],
+            responses=allocate_responses['queue'],
+            request=serializers.OrderLineBaseModel,
+            examples=lines_request_examples,
+        ),
+    },
+    api_views.AllocateTicketView: {
+        'get': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['ticket'],
+            responses=allocate_responses['ticket'],
+            parameters=[OpenApiParameter(name='ticket',
+                                         location='path',
+                                         description='Идентификатор заявки на размещение')],
+        ),
+    },
+    api_views.AllocateDetailView: {
+        'get': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['get'],
+            responses=allocate_responses['get'],
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='line_item',
+                                         location='path',
+                                         description='Номер товарной позиции в заказе',
+                                         examples=lines_line_item_request_examples),
+                        ],
+        ),
+        'delete': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=allocate_descriptions['delete'],
+            responses=allocate_responses['delete'],
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='line_item',
+                                         location='path',
+                                         description='Номер товарной позиции в заказе',
+                                         examples=lines_line_item_request_examples),
+                        ],
+        ),
+    },
+    api_views.OrderAllocateView: {
+        'post': extend_schema(
+            tags=['Размещение товарных позиций'],
+            description=orders_descriptions['post'],
+            responses=orders_responses['post'],
+            request=None,
+            parameters=[OpenApiParameter(name='order_id',
+                                         location='path',
+                                         description='Идентификатор заказа',
+                                         examples=lines_order_id_request_examples),
+                        OpenApiParameter(name='prefer_locality',
+                                         location='query',
+                                         type=bool,
+                                         description=orders_prefer_locality_parameter_description),
+                        ],
+        ),
+    },
+    api_views.StockFeasibleView: {
+        'get': extend_schema(
+            tags=['Бухты'],
+            description=stock_descriptions['feasible'],
+            responses=stock_responses['feasible'],
+            parameters=[OpenApiParameter(name='product_id',
+                                         location='path',
+                                         description='Идентификатор материала'),
+                        OpenApiParameter(name='quantity',
+                                         location='query',
+                                         type=int,
+                                         required=True,
+                                         description=stock_quantity_parameter_description),
+                        ],
+        ),
+    },
 }
@@ -0,0 +1,48 @@
+"""
+Middleware административного интерфейса, которые не выполняются для запросов API.
+
+Каждый класс наследует middleware Django и для запросов с путем, начинающимся с API_PATH_PREFIX,
+сразу передает запрос следующему обработчику. Наследование сохраняет проверки административного
+интерфейса (admin.E408-E410), которые ищут в MIDDLEWARE подклассы middleware Django.
+"""
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.http import HttpRequest
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.deprecation import MiddlewareMixin
+
+
+def is_api_request(request: HttpRequest) -> bool:
+    return request.path_info.startswith(settings.API_PATH_PREFIX)
+
+
+class AdminOnlyMiddlewareMixin(MiddlewareMixin):
+    """Пропускает middleware для запросов API. Под ASGI сервером get_response возвращает корутину."""
+    def __call__(self, request: HttpRequest) -> Any:
+        if is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class AdminSessionMiddleware(AdminOnlyMiddlewareMixin, SessionMiddleware):
+    pass
+
+
+class AdminCsrfViewMiddleware(AdminOnlyMiddlewareMixin, CsrfViewMiddleware):
+    def process_view(self, request: HttpRequest, *args: Any) -> Any:
+        # Django вызывает process_view всех middleware после разрешения адреса, минуя __call__
+        if is_api_request(request):
+            return None
+        return super().process_view(request, *args)
+
+
+class AdminAuthenticationMiddleware(AdminOnlyMiddlewareMixin, AuthenticationMiddleware):
+    pass
+
+
+class AdminMessageMiddleware(AdminOnlyMiddlewareMixin, MessageMiddleware):
+    pass
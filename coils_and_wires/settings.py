@@ -10,7 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import os
 from pathlib import Path
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -19,13 +23,29 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-10$c=+x1_r4$t2)ag4ear&y%$ue#)*!io^84um3d#d+5xsqfei'
+# Параметры развертывания задаются переменными окружения, см. gunicorn.conf.py и docker-compose.yml
+
+# Производственное окружение (DJANGO_ENV=production) задается сервисом web_prod и конфигурацией gunicorn.conf.py.
+# В окружении разработки, в том числе при запуске manage.py без переменных окружения, режим отладки включен
+PRODUCTION = os.environ.get('DJANGO_ENV', 'development') == 'production'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# В режиме отладки Django сохраняет в памяти все выполненные запросы SQL
+DEBUG = os.environ.get('DJANGO_DEBUG', '0' if PRODUCTION else '1') == '1'
 
-ALLOWED_HOSTS = ['*']
+# Ключ разработки и любые имена хоста допускаются только в режиме отладки.
+# Без режима отладки переменные DJANGO_SECRET_KEY и DJANGO_ALLOWED_HOSTS обязательны
+if not DEBUG:
+    for variable in ('DJANGO_SECRET_KEY', 'DJANGO_ALLOWED_HOSTS'):
+        if not os.environ.get(variable):
+            raise ImproperlyConfigured(f'Переменная окружения {variable} обязательна при DJANGO_DEBUG=0')
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY', 'django-insecure-10$c=+x1_r4$t2)ag4ear&y%$ue#)*!io^84um3d#d+5xsqfei',
+)
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', '*').split(',')
 
 
 # Application definition
@@ -40,12 +60,17 @@ INSTALLED_APPS = [
 
     'allocation.apps.AllocationConfig',
     'rest_framework',
-    'drf_spectacular',
 ]
 
-REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-}
+# Схема OpenAPI и Swagger UI (/v1/schema/), см. coils_and_wires/api_schema.py. При выключенной схеме
+# приложение drf_spectacular и представления схемы не загружаются, что ускоряет запуск процессов и команд управления
+API_SCHEMA_ENABLED = os.environ.get('API_SCHEMA_ENABLED', '1') == '1'
+
+REST_FRAMEWORK: dict[str, Any] = {}
+
+if API_SCHEMA_ENABLED:
+    INSTALLED_APPS.append('drf_spectacular')
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
 
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Coils and wires',
@@ -54,15 +79,36 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
 
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
+# Профиль API: для запросов с путем, начинающимся с API_PATH_PREFIX, не выполняются middleware сессий, CSRF,
+# аутентификации и сообщений, которые используются только административным интерфейсом,
+# см. coils_and_wires/middleware.py. Представления DRF при этом не выполняют аутентификацию.
+# XFrameOptionsMiddleware защищает от clickjacking страницу Swagger UI (/v1/schema/swagger-ui/)
+API_MIDDLEWARE_PROFILE = os.environ.get('API_MIDDLEWARE_PROFILE', '1') == '1'
+API_PATH_PREFIX = '/v1/'
+
+if API_MIDDLEWARE_PROFILE:
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'coils_and_wires.middleware.AdminSessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'coils_and_wires.middleware.AdminCsrfViewMiddleware',
+        'coils_and_wires.middleware.AdminAuthenticationMiddleware',
+        'coils_and_wires.middleware.AdminMessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+else:
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+
+if API_MIDDLEWARE_PROFILE:
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = []
 
 ROOT_URLCONF = 'coils_and_wires.urls'
 
@@ -84,6 +130,16 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'coils_and_wires.wsgi.application'
 
+# Адрес, на который команда dispatch_events отправляет события доменной модели из таблицы OutboxEventDB,
+# см. allocation/services/messagebus.py. Если адрес не задан, события доставляются только
+# зарегистрированным обработчикам
+ALLOCATION_EVENTS_WEBHOOK_URL = os.environ.get('ALLOCATION_EVENTS_WEBHOOK_URL', '')
+
+# Наибольшее время (в секундах), в течение которого запрос бухт для размещения использует пул бухт,
+# загруженный процессом ранее, без учета изменений других процессов, см. allocation/adapters/coil_pool_cache.py.
+# При 0 пул загружается при каждом запросе
+COIL_POOL_CACHE_TTL = float(os.environ.get('COIL_POOL_CACHE_TTL', '1.0'))
+
 
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
@@ -91,8 +147,37 @@ WSGI_APPLICATION = 'coils_and_wires.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        # Время (в секундах), в течение которого соединение с базой данных используется повторно
+        # между запросами. Значение 0 - соединение закрывается после каждого запроса
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Реплика основной базы данных для запросов на чтение, см. allocation/adapters/db_router.py.
+# Настраивается, если задан путь к файлу реплики. Локально реплика обновляется командой
+# python manage.py sync_replica. При тестировании реплика использует соединение основной базы данных
+DATABASE_REPLICA_ALIAS = os.environ.get('DJANGO_REPLICA_ALIAS', 'replica')
+if os.environ.get('DJANGO_REPLICA_DB_NAME'):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DJANGO_REPLICA_DB_NAME'],
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['allocation.adapters.db_router.PrimaryReplicaRouter']
+
+# Инструкции PRAGMA, выполняемые при открытии соединения с базой данных SQLite,
+# см. allocation/adapters/sqlite.py. Пустое значение переменной окружения отключает инструкцию
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    # Время ожидания (в миллисекундах) освобождения блокировки базы данных другим соединением
+    'busy_timeout': os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'),
+    # Отрицательное значение задает размер кэша страниц в килобайтах
+    'cache_size': os.environ.get('SQLITE_CACHE_SIZE', '-64000'),
+    'mmap_size': os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
 }
 
 
@@ -13,15 +13,18 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
 from allocation.api import urls as allocation_urls
-from coils_and_wires.drf_spectacular import urlpatterns as drf_spectacular_urls
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('v1/', include(allocation_urls)),
-    path('v1/', include(drf_spectacular_urls)),
 ]
+
+# Схема API и Swagger UI загружаются, только если они включены, см. coils_and_wires/api_schema.py
+if settings.API_SCHEMA_ENABLED:
+    urlpatterns.append(path('v1/', include('coils_and_wires.api_schema')))
@@ -0,0 +1,36 @@
+"""
+Конфигурация сервера gunicorn для производственного развертывания:
+gunicorn -c gunicorn.conf.py coils_and_wires.wsgi
+
+Количество процессов и потоков вычисляется по количеству процессоров и может быть
+переопределено переменными окружения GUNICORN_WORKERS и GUNICORN_THREADS.
+"""
+import multiprocessing
+import os
+
+# Настройки Django загружаются после конфигурации: без режима отладки, секретный ключ и имена хоста обязательны
+os.environ.setdefault('DJANGO_ENV', 'production')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Процессы обслуживают запросы, использующие процессор (доменная модель, сериализация),
+# потоки - ожидание базы данных внутри процесса
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Приложение загружается один раз в главном процессе до создания процессов-обработчиков,
+# которые разделяют загруженные модули за счет копирования при записи
+preload_app = True
+
+# Процесс-обработчик перезапускается после обработки max_requests запросов, что ограничивает
+# рост потребляемой памяти. Случайная добавка не дает всем процессам перезапуститься одновременно
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+errorlog = '-'
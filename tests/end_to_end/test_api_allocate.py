@@ -1,6 +1,7 @@
 import json
 
 import pytest
+from django.core.management import call_command
 from rest_framework.test import APIClient
 
 from allocation.domain import domain_logic
@@ -317,3 +318,110 @@ def test_api_deallocate_a_line_raise_validation_error():
     assert response.status_code == 403
     # allocation_coil не соответствует CoilBaseModel, что вызовет ошибку ValidationError
     assert '1 validation error for CoilBaseModel' in output_data['message']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_allocate_an_order(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухт и товарных позиций в базу данных с помощью POST запросов
+    for coil_data in three_coils_and_lines['three_coils']:
+        client.post('/v1/coils', data=coil_data, format='json')
+    for line_data in three_coils_and_lines['three_lines']:
+        client.post('/v1/orderlines', data={**line_data, "order_id": "Заказ-040"}, format='json')
+
+    # Размещение товарных позиций заказа с помощью POST запроса
+    response = client.post('/v1/orders/Заказ-040/allocate?prefer_locality=true')
+    output_data = json.loads(response.data)
+
+    assert response.status_code == 200
+    # Все товарные позиции заказа (35, 30, 10) будут размещены в одной бухте
+    assert len(output_data['allocated']) == 3
+    assert len({item['reference'] for item in output_data['allocated']}) == 1
+    assert output_data['out_of_stock'] == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_allocate_an_order_raise_not_exist_exception():
+    client = APIClient()
+
+    # Размещение товарных позиций несуществующего заказа с помощью POST запроса
+    response = client.post('/v1/orders/Заказ-041/allocate')
+    output_data = json.loads(response.data)
+
+    assert response.status_code == 404
+    assert output_data['message'] == exceptions.DBOrderRecordsDoNotExist('Заказ-041').message
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_simulate_allocation(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухт в базу данных с помощью POST запросов
+    for coil_data in three_coils_and_lines['three_coils']:
+        client.post('/v1/coils', data=coil_data, format='json')
+    # Добавление и размещение товарной позиции с помощью POST запросов
+    line_data = three_coils_and_lines['three_lines'][0]
+    client.post('/v1/orderlines', data=line_data, format='json')
+    client.post('/v1/allocate', data=line_data, format='json')
+    allocation_coil_before = json.loads(client.get('/v1/coils/Бухта-031').data)
+
+    # Моделирование размещения товарных позиций с помощью POST запроса
+    lines_data = three_coils_and_lines['three_lines'] + \
+        [{"order_id": "Заказ-034", "line_item": "Позиция-001", "product_id": "АВВГ_2х6", "quantity": 500}]
+    response = client.post('/v1/allocate/simulate', data=lines_data, format='json')
+    output_data = json.loads(response.data)
+    allocation_coil_after = json.loads(client.get('/v1/coils/Бухта-031').data)
+
+    assert response.status_code == 200
+    assert [(json.loads(item['line'])['order_id'], item['reference']) for item in output_data['allocated']] == \
+           [("Заказ-031", "Бухта-031"), ("Заказ-033", "Бухта-031"), ("Заказ-032", "Бухта-031")]
+    assert [json.loads(line)['order_id'] for line in output_data['out_of_stock']] == ["Заказ-034"]
+    # Моделирование не изменяет базу данных
+    assert allocation_coil_after == allocation_coil_before
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_simulate_allocation_raise_validation_error():
+    client = APIClient()
+    # quantity имеет отрицательное значение
+    lines_data = [{"order_id": "Заказ-035", "line_item": "Позиция-001", "product_id": "АВВГ_2х6", "quantity": -5}]
+
+    # Моделирование размещения товарных позиций с помощью POST запроса
+    response = client.post('/v1/allocate/simulate', data=lines_data, format='json')
+    output_data = json.loads(response.data)
+
+    assert response.status_code == 400
+    assert 'validation error' in output_data['message']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_allocate_a_line_through_queue(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухт и товарных позиций в базу данных с помощью POST запросов
+    for coil_data in three_coils_and_lines['three_coils']:
+        client.post('/v1/coils', data=coil_data, format='json')
+    for line_data in three_coils_and_lines['three_lines']:
+        client.post('/v1/orderlines', data=line_data, format='json')
+    # Создание заявок на размещение товарных позиций
+    responses = [client.post('/v1/allocate/queue', data=line_data, format='json')
+                 for line_data in three_coils_and_lines['three_lines']]
+    pending_ticket = json.loads(client.get(responses[0]['Location']).data)
+    # Обработка очереди заявок
+    call_command('process_allocation_queue')
+
+    tickets = [json.loads(client.get(response['Location']).data) for response in responses]
+
+    assert [response.status_code for response in responses] == [202, 202, 202]
+    assert pending_ticket['status'] == 'pending'
+    assert [(ticket['status'], ticket['reference']) for ticket in tickets] == [('allocated', 'Бухта-031')] * 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_allocate_a_line_through_queue_raise_not_exist_exception():
+    client = APIClient()
+    line_data = {"order_id": "Заказ-034", "line_item": "Позиция-001", "product_id": "АВВГ_2х6", "quantity": 35}
+
+    response = client.post('/v1/allocate/queue', data=line_data, format='json')
+    ticket_response = client.get('/v1/allocate/queue/00000000-0000-0000-0000-000000000000')
+
+    assert response.status_code == 404
+    assert ticket_response.status_code == 404
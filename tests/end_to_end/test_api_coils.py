@@ -165,6 +165,34 @@ def test_api_update_a_coil(three_coils_and_lines):
                                                       ("Заказ-033", "Позиция-002")}
 
 
+@pytest.mark.django_db(transaction=True)
+def test_api_update_a_coil_with_optimization():
+    client = APIClient()
+    # Добавление бухты в базу данных с помощью POST запроса
+    coil_data_1 = {"reference": "Бухта-034", "product_id": "АВВГ_2х6",
+                   "quantity": 60, "recommended_balance": 10, "acceptable_loss": 3}
+    client.post('/v1/coils', data=coil_data_1, format='json')
+    # Добавление товарных позиций в базу данных и дальнейшее размещение с помощью POST запросов
+    for line_item in ("Позиция-001", "Позиция-002", "Позиция-003"):
+        line_data = {"order_id": "Заказ-034", "line_item": line_item, "product_id": "АВВГ_2х6", "quantity": 6}
+        client.post('/v1/orderlines', data=line_data, format='json')
+        client.post('/v1/allocate', data=line_data, format='json')
+
+    # Обновление бухты с уменьшением quantity и оптимизацией переразмещения с помощью PUT запроса
+    coil_data_2 = {"reference": "Бухта-034", "product_id": "АВВГ_2х6",
+                   "quantity": 20, "recommended_balance": 10, "acceptable_loss": 3}
+    response = client.put(f"/v1/coils/{coil_data_1['reference']}?optimize=true", data=coil_data_2, format='json')
+    output_data = json.loads(response.data)
+    # Получение обновленной бухты с помощью GET запроса
+    response_2 = client.get(f"/v1/coils/{coil_data_1['reference']}")
+    output_coil = json.loads(response_2.data)
+
+    assert response.status_code == 200
+    # Все товарные позиции останутся размещенными, т.к. остаток материала в пределах приемлемых потерь
+    assert output_data == []
+    assert len(output_coil['allocations']) == 3
+
+
 @pytest.mark.django_db(transaction=True)
 def test_api_update_a_coil_raise_validation_error():
     client = APIClient()
@@ -230,6 +258,67 @@ def test_api_delete_a_coil(three_coils_and_lines):
            {("Заказ-031", "Позиция-005"), ("Заказ-032", "Позиция-004"), ("Заказ-033", "Позиция-002")}
 
 
+@pytest.mark.django_db(transaction=True)
+def test_api_update_a_coil_and_reallocate(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухты в базу данных с помощью POST запроса
+    coil_data_1 = {"reference": "Бухта-040", "product_id": "АВВГ_2х6",
+                   "quantity": 85, "recommended_balance": 10, "acceptable_loss": 3}
+    client.post('/v1/coils', data=coil_data_1, format='json')
+    # Добавление товарных позиций в базу данных и дальнейшее размещение с помощью POST запросов
+    for line_data in three_coils_and_lines['three_lines']:
+        client.post('/v1/orderlines', data=line_data, format='json')
+        client.post('/v1/allocate', data=line_data, format='json')
+    # Добавление бухты, в которой будет размещена товарная позиция после обновления первой бухты
+    coil_data_2 = {"reference": "Бухта-041", "product_id": "АВВГ_2х6",
+                   "quantity": 100, "recommended_balance": 10, "acceptable_loss": 3}
+    client.post('/v1/coils', data=coil_data_2, format='json')
+
+    # Обновление бухты с уменьшением quantity и переразмещением с помощью PUT запроса
+    coil_data_3 = {"reference": "Бухта-040", "product_id": "АВВГ_2х6",
+                   "quantity": 60, "recommended_balance": 10, "acceptable_loss": 3}
+    response = client.put(f"/v1/coils/{coil_data_1['reference']}?reallocate=true", data=coil_data_3, format='json')
+    output_data = json.loads(response.data)
+    # Получение бухты, в которой размещена товарная позиция, с помощью GET запроса
+    response_2 = client.get('/v1/allocate/Заказ-031/Позиция-005')
+    output_coil = json.loads(response_2.data)
+
+    assert response.status_code == 200
+    # Товарная позиция ("Заказ-031", "Позиция-005") будет размещена в бухте Бухта-041
+    assert [(json.loads(item['line'])['order_id'], item['reference']) for item in output_data['allocated']] == \
+           [("Заказ-031", "Бухта-041")]
+    assert output_data['out_of_stock'] == []
+    assert output_coil['reference'] == "Бухта-041"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_delete_a_coil_and_reallocate(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухты в базу данных с помощью POST запроса
+    coil_data_1 = {"reference": "Бухта-042", "product_id": "АВВГ_2х6",
+                   "quantity": 85, "recommended_balance": 10, "acceptable_loss": 3}
+    client.post('/v1/coils', data=coil_data_1, format='json')
+    # Добавление товарных позиций в базу данных и дальнейшее размещение с помощью POST запросов
+    for line_data in three_coils_and_lines['three_lines']:
+        client.post('/v1/orderlines', data=line_data, format='json')
+        client.post('/v1/allocate', data=line_data, format='json')
+    # Добавление бухты, в которой поместятся только две товарные позиции
+    coil_data_2 = {"reference": "Бухта-043", "product_id": "АВВГ_2х6",
+                   "quantity": 70, "recommended_balance": 10, "acceptable_loss": 3}
+    client.post('/v1/coils', data=coil_data_2, format='json')
+
+    # Удаление бухты с переразмещением с помощью DELETE запроса
+    response = client.delete(f"/v1/coils/{coil_data_1['reference']}?reallocate=true")
+    output_data = json.loads(response.data)
+    allocated_lines_order_id = {json.loads(item['line'])['order_id'] for item in output_data['allocated']}
+    out_of_stock_lines_order_id = {json.loads(line)['order_id'] for line in output_data['out_of_stock']}
+
+    assert response.status_code == 200
+    # Товарные позиции размещаются в порядке убывания количества материала: 35, 30, 10
+    assert allocated_lines_order_id == {"Заказ-031", "Заказ-033"}
+    assert out_of_stock_lines_order_id == {"Заказ-032"}
+
+
 @pytest.mark.django_db(transaction=True)
 def test_api_delete_a_coil_raise_not_exist_exception():
     client = APIClient()
@@ -247,3 +336,38 @@ def test_api_delete_a_coil_raise_not_exist_exception():
     assert response.status_code == 404
     # Удаление бухты по несуществующему route вызовет исключение DBCoilRecordDoesNotExist
     assert output_data['message'] == exceptions.DBCoilRecordDoesNotExist(wrong_reference).message
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_get_feasible_coils(three_coils_and_lines):
+    client = APIClient()
+    # Добавление бухт в базу данных с помощью POST запросов
+    for coil_data in three_coils_and_lines['three_coils']:
+        client.post('/v1/coils', data=coil_data, format='json')
+
+    # Получение бухт, в которых может быть размещена товарная позиция, с помощью GET запроса
+    response_1 = client.get('/v1/stock/АВВГ_2х6/feasible?quantity=90')
+    # Размещение товарной позиции с quantity=35 в Бухта-031 уменьшит ее доступное количество материала до 60
+    line_data = three_coils_and_lines['three_lines'][0]
+    client.post('/v1/orderlines', data=line_data, format='json')
+    client.post('/v1/allocate', data=line_data, format='json')
+    response_2 = client.get('/v1/stock/АВВГ_2х6/feasible?quantity=60')
+
+    assert response_1.status_code == 200
+    # В Бухта-031 останется 5, что меньше recommended_balance и больше acceptable_loss
+    assert json.loads(response_1.data) == [{"reference": "Бухта-032", "available_quantity": 105},
+                                           {"reference": "Бухта-033", "available_quantity": 120}]
+    # Бухты упорядочены по возрастанию доступного количества материала, как при размещении
+    assert json.loads(response_2.data) == [{"reference": "Бухта-031", "available_quantity": 60},
+                                           {"reference": "Бухта-032", "available_quantity": 105},
+                                           {"reference": "Бухта-033", "available_quantity": 120}]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('query', ['', '?quantity=0', '?quantity=abc'])
+def test_api_get_feasible_coils_raise_validation_error(query):
+    client = APIClient()
+
+    response = client.get(f'/v1/stock/АВВГ_2х6/feasible{query}')
+
+    assert response.status_code == 400
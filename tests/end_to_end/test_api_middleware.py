@@ -0,0 +1,88 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core import checks
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+
+
+def wsgi_request(application, path, method='get', **headers):
+    """Выполняет запрос к приложению WSGI, возвращает код ответа и заголовки."""
+    environ = getattr(RequestFactory(), method)(path, **headers).environ
+    responses = []
+    body = application(environ, lambda status, response_headers: responses.append((status, response_headers)))
+    body.close()
+    status, response_headers = responses[0]
+    return int(status.split()[0]), dict(response_headers)
+
+
+def asgi_request(application, path):
+    """Выполняет запрос GET к приложению ASGI, возвращает код ответа и заголовки."""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': [],
+             'server': ('testserver', 80)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+    return messages[0]['status'], {name.decode(): value.decode() for name, value in messages[0]['headers']}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_requests_skip_admin_middleware():
+    """Запросы API обрабатываются без middleware сессий и CSRF, /admin/ - с полным набором."""
+    application = WSGIHandler()
+
+    api_status, api_headers = wsgi_request(application, '/v1/coils/Coil-404', HTTP_COOKIE='sessionid=abc')
+    admin_status, admin_headers = wsgi_request(application, '/admin/login/')
+
+    assert api_status == 404
+    assert 'Cookie' not in api_headers.get('Vary', '')
+    assert 'Set-Cookie' not in api_headers
+    assert admin_status == 200
+    assert admin_headers['X-Frame-Options'] == 'DENY'
+    assert 'csrftoken' in admin_headers['Set-Cookie']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_api_requests_skip_admin_middleware():
+    """Под ASGI сервером middleware административного интерфейса также не выполняются для запросов API."""
+    application = ASGIHandler()
+
+    api_status, api_headers = asgi_request(application, '/v1/coils/Coil-404')
+    admin_status, admin_headers = asgi_request(application, '/admin/login/')
+
+    assert api_status == 404
+    assert 'Cookie' not in api_headers.get('Vary', '')
+    assert admin_status == 200
+    assert admin_headers['X-Frame-Options'] == 'DENY'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_swagger_ui_keeps_clickjacking_protection():
+    """Страница Swagger UI, которая обрабатывается как запрос API, не может быть встроена в чужой фрейм."""
+    application = WSGIHandler()
+
+    status, headers = wsgi_request(application, '/v1/schema/swagger-ui/')
+
+    assert status == 200
+    assert headers['X-Frame-Options'] == 'DENY'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_admin_keeps_csrf_protection():
+    """Запрос POST к административному интерфейсу без токена CSRF отклоняется."""
+    status, _ = wsgi_request(WSGIHandler(), '/admin/login/', method='post')
+
+    assert status == 403
+
+
+def test_admin_checks_accept_api_middleware():
+    """Проверки административного интерфейса находят middleware сессий, аутентификации и сообщений."""
+    errors = checks.run_checks(tags=[checks.Tags.admin])
+
+    assert errors == []
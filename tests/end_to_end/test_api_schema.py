@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from drf_spectacular import generators
+from rest_framework.test import APIClient
+
+from coils_and_wires import api_schema
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache():
+    """Каждый тест получает схему API без схемы, сохраненной в памяти процесса предыдущими тестами."""
+    api_schema.CachedSpectacularAPIView.clear()
+    yield
+    api_schema.CachedSpectacularAPIView.clear()
+
+
+def test_api_schema_contains_view_descriptions():
+    """Схема API содержит описания представлений, заданные декораторами extend_schema."""
+    client = APIClient()
+
+    response = client.get('/v1/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+    assert response.status_code == 200
+    assert response.json()['paths']['/v1/coils']['post']['description'] == 'Создать в базе данных новую бухту'
+
+
+def test_api_schema_describes_simulate_request_as_array():
+    """Тело запроса моделирования размещения описано в схеме API как массив товарных позиций."""
+    client = APIClient()
+
+    response = client.get('/v1/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+    request_schema = response.json()['paths']['/v1/allocate/simulate']['post']['requestBody']
+    schema = request_schema['content']['application/json']['schema']
+    assert schema['type'] == 'array'
+    assert schema['items']['properties']['quantity'] == {
+        'title': 'Quantity', 'type': 'integer', 'minimum': 0, 'exclusiveMinimum': True,
+    }
+
+
+def test_api_schema_is_generated_once(monkeypatch, settings):
+    """Схема API создается при первом запросе, повторные запросы в любом формате используют ее из памяти."""
+    calls = []
+    get_schema = generators.SchemaGenerator.get_schema
+
+    def counting_get_schema(self, *args, **kwargs):
+        calls.append(1)
+        return get_schema(self, *args, **kwargs)
+
+    monkeypatch.setattr(generators.SchemaGenerator, 'get_schema', counting_get_schema)
+    client = APIClient()
+
+    first_response = client.get('/v1/schema/')
+    second_response = client.get('/v1/schema/')
+    json_response = client.get('/v1/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+    assert len(calls) == 1
+    assert first_response.content == second_response.content
+    assert first_response['Content-Type'] == second_response['Content-Type'] == \
+           'application/vnd.oai.openapi; charset=utf-8'
+    assert first_response['Content-Disposition'] == second_response['Content-Disposition']
+    assert json_response.json()['info']['title'] == 'Coils and wires'
+
+
+def test_api_schema_cache_depends_on_version_and_lang(settings):
+    """Параметры version и lang запроса схемы API входят в ключ схемы и ответа, хранящихся в памяти."""
+    client = APIClient()
+    accept = 'application/vnd.oai.openapi+json'
+
+    default_response = client.get('/v1/schema/', HTTP_ACCEPT=accept)
+    version_response = client.get('/v1/schema/?version=2.0', HTTP_ACCEPT=accept)
+    lang_response = client.get('/v1/schema/?lang=en', HTTP_ACCEPT=accept)
+
+    assert 'version' not in default_response['Content-Disposition']
+    assert '(2.0)' in version_response['Content-Disposition']
+    assert set(api_schema.CachedSpectacularAPIView.responses) == \
+           {(accept, '', ''), (accept, '2.0', ''), (accept, '', 'en')}
+    assert set(api_schema.CachedSchemaGenerator.schemas) == {(None, 'ru'), ('2.0', 'ru'), (None, 'en')}
+    assert lang_response.status_code == 200
+
+
+def test_schema_is_not_loaded_when_disabled():
+    """
+    При API_SCHEMA_ENABLED=0 приложение drf_spectacular, представления схемы API, описания и примеры
+    представлений API не загружаются.
+    """
+    code = (
+        'import sys, django; django.setup()\n'
+        'from django.urls import Resolver404, resolve\n'
+        'resolve("/v1/coils")\n'
+        'try:\n'
+        '    resolve("/v1/schema/")\n'
+        'except Resolver404:\n'
+        '    from django.apps import apps\n'
+        '    print(apps.is_installed("drf_spectacular"), "drf_spectacular.views" in sys.modules,\n'
+        '          "drf_spectacular.utils" in sys.modules, "coils_and_wires.drf_spectacular" in sys.modules)\n'
+    )
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='coils_and_wires.settings', API_SCHEMA_ENABLED='0')
+
+    result = subprocess.run([sys.executable, '-c', code], env=env, cwd=Path(__file__).parents[2],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == 'False False False False'
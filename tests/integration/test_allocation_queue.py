@@ -0,0 +1,128 @@
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from allocation.adapters import allocation_queue
+from allocation.domain import domain_logic
+from allocation.exceptions import exceptions
+from allocation.services import services, unit_of_work
+
+
+def add_coil(reference, product_id, quantity):
+    services.add_a_coil(reference, product_id, quantity, 10, 2, unit_of_work.DjangoUnitOfWork())
+
+
+def get_ticket(ticket):
+    return services.get_a_ticket(ticket, unit_of_work.DjangoUnitOfWork())
+
+
+def enqueue_line(order_id, product_id, quantity):
+    services.add_a_line(order_id, 'Позиция-001', product_id, quantity, unit_of_work.DjangoUnitOfWork())
+    return services.enqueue_allocation(order_id, 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queued_lines_are_allocated_in_batches_by_product():
+    """Заявки обрабатываются пакетами с материалом самой ранней ожидающей заявки."""
+    add_coil('Бухта-060', 'АВВГ_2х2,5', 100)
+    add_coil('Бухта-061', 'АВВГ_3х1,5', 100)
+    first_ticket = enqueue_line('Заказ-060', 'АВВГ_2х2,5', 30)
+    enqueue_line('Заказ-061', 'АВВГ_3х1,5', 30)
+    third_ticket = enqueue_line('Заказ-062', 'АВВГ_2х2,5', 30)
+
+    first_batch = services.allocate_queued(unit_of_work.DjangoUnitOfWork())
+    second_batch = services.allocate_queued(unit_of_work.DjangoUnitOfWork())
+
+    assert [ticket.ticket for ticket in first_batch] == [first_ticket.ticket, third_ticket.ticket]
+    assert [(ticket.order_id, ticket.status, ticket.reference) for ticket in second_batch] == \
+           [('Заказ-061', allocation_queue.ALLOCATED, 'Бухта-061')]
+    assert services.allocate_queued(unit_of_work.DjangoUnitOfWork()) == []
+    assert len(services.get_a_coil('Бухта-060').allocations) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queued_line_results_are_saved():
+    """Состояние заявки сохраняется: недостаточно материала, товарная позиция удалена, повторная заявка."""
+    add_coil('Бухта-062', 'АВВГ_2х2,5', 100)
+    enqueue_line('Заказ-063', 'АВВГ_2х2,5', 70)
+    repeated_ticket = services.enqueue_allocation('Заказ-063', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+    out_of_stock_ticket = enqueue_line('Заказ-064', 'АВВГ_2х2,5', 70)
+    deleted_ticket = enqueue_line('Заказ-065', 'АВВГ_2х2,5', 10)
+    services.delete_a_line('Заказ-065', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+
+    services.allocate_queued(unit_of_work.DjangoUnitOfWork())
+
+    assert get_ticket(repeated_ticket.ticket).status == allocation_queue.ALLOCATED
+    assert get_ticket(out_of_stock_ticket.ticket).status == allocation_queue.OUT_OF_STOCK
+    assert get_ticket(deleted_ticket.ticket).status == allocation_queue.NOT_FOUND
+    assert len(services.get_a_coil('Бухта-062').allocations) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_queued_batch_uses_constant_number_of_queries():
+    """Количество запросов обработки пакета не зависит от количества заявок в нем."""
+    queries_counts = []
+    for product_id, tickets_count in (('АВВГ_2х2,5', 2), ('АВВГ_3х1,5', 6)):
+        add_coil(f'Бухта-{product_id}', product_id, 100)
+        for number in range(tickets_count):
+            enqueue_line(f'Заказ-{product_id}-{number}', product_id, 10)
+        with CaptureQueriesContext(connection) as context:
+            assert len(services.allocate_queued(unit_of_work.DjangoUnitOfWork())) == tickets_count
+        queries_counts.append(len(context.captured_queries))
+
+    assert queries_counts[0] == queries_counts[1]
+
+
+@pytest.fixture
+def failing_line(monkeypatch):
+    """Размещение пакета с товарной позицией заказа 'Заказ-081' вызывает исключение."""
+    allocate = domain_logic.allocate_lines_to_list_of_coils
+
+    def allocate_lines_to_list_of_coils(lines, list_of_coils):
+        if any(line.order_id == 'Заказ-081' for line in lines):
+            raise RuntimeError('Ошибка размещения')
+        return allocate(lines, list_of_coils)
+
+    monkeypatch.setattr(domain_logic, 'allocate_lines_to_list_of_coils', allocate_lines_to_list_of_coils)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_batch_records_attempt(failing_line):
+    """Ошибка обработки пакета отменяет его изменения и сохраняет неудачную попытку обработки заявок."""
+    add_coil('Бухта-064', 'АВВГ_2х2,5', 100)
+    tickets = [enqueue_line(f'Заказ-08{number}', 'АВВГ_2х2,5', 10) for number in range(3)]
+
+    with pytest.raises(RuntimeError):
+        services.allocate_queued(unit_of_work.DjangoUnitOfWork())
+
+    assert [(get_ticket(ticket.ticket).status, get_ticket(ticket.ticket).attempts) for ticket in tickets] == \
+           [(allocation_queue.PENDING, 1)] * 3
+    assert services.get_a_coil('Бухта-064').allocations == set()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failing_ticket_does_not_block_queue(failing_line):
+    """
+    Заявки пакета с ошибкой обрабатываются по одной: остальные заявки размещаются,
+    заявка с ошибкой после MAX_ATTEMPTS попыток получает состояние FAILED, обработчик не останавливается.
+    """
+    add_coil('Бухта-065', 'АВВГ_2х2,5', 100)
+    tickets = [enqueue_line(f'Заказ-08{number}', 'АВВГ_2х2,5', 10) for number in range(3)]
+    later_ticket = enqueue_line('Заказ-089', 'АВВГ_2х2,5', 10)
+
+    call_command('process_allocation_queue', stderr=open(os.devnull, 'w'))
+
+    assert [get_ticket(ticket.ticket).status for ticket in tickets + [later_ticket]] == [
+        allocation_queue.ALLOCATED, allocation_queue.FAILED, allocation_queue.ALLOCATED, allocation_queue.ALLOCATED]
+    assert get_ticket(tickets[1].ticket).attempts == allocation_queue.MAX_ATTEMPTS
+    assert not services.has_queued(unit_of_work.DjangoUnitOfWork())
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('ticket', ['00000000-0000-0000-0000-000000000000', 'Заявка-001'])
+def test_get_a_ticket_raises_for_missing_ticket(ticket):
+    with pytest.raises(exceptions.AllocationTicketDoesNotExist):
+        get_ticket(ticket)
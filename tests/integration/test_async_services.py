@@ -0,0 +1,220 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from allocation.domain import domain_logic
+from allocation.exceptions import exceptions
+from allocation.services import async_services, unit_of_work
+from tests.integration.test_services import FakeCoilRepository, FakeOrderLineRepository
+
+
+class FakeAsyncCoilRepository:
+    """
+    "Поддельная" асинхронная версия репозитория для бухт,
+    которая использует в качестве хранилища "поддельный" синхронный репозиторий.
+    """
+    def __init__(self):
+        self._repo = FakeCoilRepository()
+
+    async def get(self, reference):
+        return self._repo.get(reference)
+
+    async def add(self, coil):
+        self._repo.add(coil)
+
+    async def update(self, coil):
+        self._repo.update(coil)
+
+    async def delete(self, reference):
+        return self._repo.delete(reference)
+
+    async def coils_list(self, product_ids=None):
+        return self._repo.coils_list(product_ids)
+
+    async def snapshot(self, product_ids, order_ids):
+        return self._repo.snapshot(product_ids, order_ids)
+
+    async def coil_pool(self, product_id):
+        return self._repo.coil_pool(product_id)
+
+    async def candidate_coils(self, line, limit=5):
+        return self._repo.candidate_coils(line, limit)
+
+    def collect_events(self):
+        return self._repo.collect_events()
+
+
+class FakeAsyncOrderLineRepository:
+    """
+    "Поддельная" асинхронная версия репозитория для товарных позиций,
+    которая использует в качестве хранилища "поддельный" синхронный репозиторий.
+    """
+    def __init__(self):
+        self._repo = FakeOrderLineRepository()
+
+    async def get(self, order_id, line_item):
+        return self._repo.get(order_id, line_item)
+
+    async def add(self, line):
+        self._repo.add(line)
+
+    async def update(self, line):
+        self._repo.update(line)
+
+    async def delete(self, order_id, line_item):
+        self._repo.delete(order_id, line_item)
+
+    async def order_lines_list(self, order_id=None):
+        return self._repo.order_lines_list(order_id)
+
+
+class FakeAsyncUnitOfWork:
+    """
+    "Поддельная" асинхронная версия класса, реализующего паттерн "Unit of Work",
+    которая создает "поддельные" версии асинхронных репозиториев при тестировании.
+    """
+    def __init__(self):
+        self.coil_repo = FakeAsyncCoilRepository()
+        self.line_repo = FakeAsyncOrderLineRepository()
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def run(service, *args, **kwargs):
+    """Выполняет асинхронную функцию сервисного слоя из синхронного теста."""
+    return async_to_sync(service)(*args, **kwargs)
+
+
+def test_async_service_add_and_get_a_coil():
+    uow = FakeAsyncUnitOfWork()
+
+    # Добавление бухты в хранилище и ее получение
+    run(async_services.add_a_coil, 'Бухта-040', 'АВВГ_2х2,5', 200, 15, 3, uow)
+    saved_coil = run(async_services.get_a_coil, 'Бухта-040', uow)
+
+    assert saved_coil.product_id == 'АВВГ_2х2,5'
+    assert uow.committed
+
+
+def test_async_service_delete_a_coil_and_reallocate():
+    """Удаление бухты переразмещает ее товарные позиции в других бухтах."""
+    uow = FakeAsyncUnitOfWork()
+    # Добавление бухт и товарных позиций в хранилище и их размещение в бухте
+    run(async_services.add_a_coil, 'Бухта-057', 'АВВГ_2х6', 100, 10, 3, uow)
+    run(async_services.add_a_coil, 'Бухта-058', 'АВВГ_2х6', 60, 10, 3, uow)
+    run(async_services.add_a_coil, 'Бухта-059', 'АВВГ_2х6', 40, 10, 3, uow)
+    run(async_services.add_a_line, 'Заказ-063', 'Позиция-001', 'АВВГ_2х6', 45, uow)
+    run(async_services.add_a_line, 'Заказ-063', 'Позиция-002', 'АВВГ_2х6', 25, uow)
+    run(async_services.allocate_an_order, 'Заказ-063', uow, prefer_locality=True)
+
+    batch_allocation = run(async_services.delete_a_coil_and_reallocate, 'Бухта-057', uow)
+
+    assert {(line.line_item, coil.reference) for line, coil in batch_allocation.allocated.items()} == \
+           {('Позиция-001', 'Бухта-058'), ('Позиция-002', 'Бухта-059')}
+    assert run(async_services.get_a_coil, 'Бухта-058', uow).available_quantity == 15
+    assert run(async_services.get_a_coil, 'Бухта-059', uow).available_quantity == 15
+
+
+def test_async_service_update_a_line():
+    """
+    Увеличение количества материала в товарной позиции при обновлении
+    приведет к ее переразмещению.
+    """
+    uow = FakeAsyncUnitOfWork()
+    run(async_services.add_a_coil, 'Бухта-055', 'АВВГ_2х2,5', 80, 15, 2, uow)
+    run(async_services.add_a_coil, 'Бухта-056', 'АВВГ_2х2,5', 120, 15, 2, uow)
+    run(async_services.add_a_line, 'Заказ-008', 'Позиция-002', 'АВВГ_2х2,5', 24, uow)
+    run(async_services.allocate, 'Заказ-008', 'Позиция-002', uow)
+
+    allocation_coil = run(async_services.update_a_line, 'Заказ-008', 'Позиция-002', 'АВВГ_2х2,5', 90, uow)
+
+    assert allocation_coil.reference == 'Бухта-056'
+    assert allocation_coil.available_quantity == 30
+    assert run(async_services.get_a_coil, 'Бухта-055', uow).available_quantity == 80
+
+
+def test_async_service_delete_a_line_and_deallocate():
+    uow = FakeAsyncUnitOfWork()
+    run(async_services.add_a_coil, 'Бухта-056', 'АВВГ_2х2,5', 100, 15, 2, uow)
+    run(async_services.add_a_line, 'Заказ-007', 'Позиция-004', 'АВВГ_2х2,5', 24, uow)
+    run(async_services.add_a_line, 'Заказ-007', 'Позиция-005', 'АВВГ_2х2,5', 30, uow)
+    run(async_services.allocate, 'Заказ-007', 'Позиция-004', uow)
+    run(async_services.allocate, 'Заказ-007', 'Позиция-005', uow)
+
+    deallocation_coil = run(async_services.deallocate, 'Заказ-007', 'Позиция-005', uow)
+    allocation_coil = run(async_services.delete_a_line, 'Заказ-007', 'Позиция-004', uow)
+    fake_coil = run(async_services.get_an_allocation_coil, 'Заказ-007', 'Позиция-005', uow)
+
+    assert deallocation_coil.reference == 'Бухта-056'
+    assert allocation_coil.reference == 'Бухта-056'
+    assert fake_coil.reference == 'fake'
+    assert run(async_services.get_a_coil, 'Бухта-056', uow).available_quantity == 100
+
+
+def test_async_service_allocate_an_order():
+    uow = FakeAsyncUnitOfWork()
+    run(async_services.add_a_coil, 'Бухта-043', 'АВВГ_2х6', 100, 10, 3, uow)
+    run(async_services.add_a_coil, 'Бухта-044', 'АВВГ_3х1,5', 50, 10, 3, uow)
+    run(async_services.add_a_line, 'Заказ-059', 'Позиция-001', 'АВВГ_2х6', 30, uow)
+    run(async_services.add_a_line, 'Заказ-059', 'Позиция-002', 'АВВГ_3х1,5', 20, uow)
+    run(async_services.add_a_line, 'Заказ-059', 'Позиция-003', 'АВВГ_3х1,5', 45, uow)
+
+    batch_allocation = run(async_services.allocate_an_order, 'Заказ-059', uow)
+
+    assert {(line.line_item, coil.reference) for line, coil in batch_allocation.allocated.items()} == \
+           {('Позиция-001', 'Бухта-043'), ('Позиция-002', 'Бухта-044')}
+    assert {line.line_item for line in batch_allocation.out_of_stock} == {'Позиция-003'}
+    assert run(async_services.get_a_coil, 'Бухта-043', uow).available_quantity == 70
+    assert run(async_services.get_a_coil, 'Бухта-044', uow).available_quantity == 30
+
+
+def test_async_service_allocate_an_order_raise_not_exist_exception():
+    uow = FakeAsyncUnitOfWork()
+
+    with pytest.raises(exceptions.DBOrderRecordsDoNotExist):
+        run(async_services.allocate_an_order, 'Заказ-061', uow)
+
+
+def test_async_service_simulate_allocation_and_get_feasible_coils():
+    uow = FakeAsyncUnitOfWork()
+    run(async_services.add_a_coil, 'Бухта-045', 'АВВГ_2х6', 70, 15, 3, uow)
+    run(async_services.add_a_coil, 'Бухта-046', 'АВВГ_2х6', 50, 15, 3, uow)
+    lines = [domain_logic.OrderLine('Заказ-062', 'Позиция-001', 'АВВГ_2х6', 30),
+             domain_logic.OrderLine('Заказ-062', 'Позиция-002', 'АВВГ_2х6', 30)]
+
+    result = run(async_services.simulate_allocation, lines, uow)
+    feasible_coils = run(async_services.get_feasible_coils, 'АВВГ_2х6', 35, uow)
+
+    assert [result.allocated[line] for line in lines] == ['Бухта-046', 'Бухта-045']
+    assert feasible_coils == [('Бухта-046', 50), ('Бухта-045', 70)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_services_with_django_uow():
+    """Асинхронные функции сервисного слоя работают с базой данных через AsyncDjangoUnitOfWork."""
+    run(async_services.add_a_coil, 'Бухта-060', 'АВВГ_2х6', 100, 10, 3, unit_of_work.AsyncDjangoUnitOfWork())
+    run(async_services.add_a_coil, 'Бухта-061', 'АВВГ_2х6', 60, 10, 3, unit_of_work.AsyncDjangoUnitOfWork())
+    for line_item, quantity in (('Позиция-001', 45), ('Позиция-002', 25)):
+        run(async_services.add_a_line, 'Заказ-064', line_item, 'АВВГ_2х6', quantity,
+            unit_of_work.AsyncDjangoUnitOfWork())
+
+    batch_allocation = run(async_services.allocate_an_order, 'Заказ-064', unit_of_work.AsyncDjangoUnitOfWork())
+    allocation_coil = run(async_services.get_an_allocation_coil, 'Заказ-064', 'Позиция-002',
+                          unit_of_work.AsyncDjangoUnitOfWork())
+
+    assert batch_allocation.out_of_stock == set()
+    assert allocation_coil.reference == batch_allocation.allocated[
+        domain_logic.OrderLine('Заказ-064', 'Позиция-002', 'АВВГ_2х6', 25)].reference
+    # Размещение товарных позиций зафиксировано в базе данных
+    assert sum(run(async_services.get_a_coil, reference, unit_of_work.AsyncDjangoUnitOfWork()).available_quantity
+               for reference in ('Бухта-060', 'Бухта-061')) == 90
@@ -0,0 +1,62 @@
+import io
+import sqlite3
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from allocation import models as django_models
+from allocation.adapters import db_router
+from allocation.services import services, unit_of_work
+
+
+def test_replica_alias_is_used_if_replica_is_configured():
+    assert db_router.replica_alias({'default': {}, 'replica': {}}) == 'replica'
+    assert db_router.replica_alias({'default': {}}) == 'default'
+
+
+def test_router_reads_from_replica_only_inside_replica_reads(monkeypatch):
+    monkeypatch.setattr(db_router, 'replica_alias', lambda: 'replica')
+    router = db_router.PrimaryReplicaRouter()
+
+    assert router.db_for_read(django_models.CoilDB) == 'default'
+    with db_router.replica_reads():
+        assert router.db_for_read(django_models.CoilDB) == 'replica'
+        assert router.db_for_write(django_models.CoilDB) == 'default'
+    assert router.db_for_read(django_models.CoilDB) == 'default'
+    assert not router.allow_migrate('replica', 'allocation')
+
+
+def test_router_reads_from_default_if_replica_is_not_configured():
+    router = db_router.PrimaryReplicaRouter()
+
+    with db_router.replica_reads() as alias:
+        assert alias == 'default'
+        assert router.db_for_read(django_models.CoilDB) == 'default'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_only_uow_reads_coil():
+    services.add_a_coil('Бухта-062', 'АВВГ_2х6', 100, 10, 3, unit_of_work.DjangoUnitOfWork())
+
+    coil = services.get_a_coil('Бухта-062', unit_of_work.ReadOnlyUnitOfWork())
+
+    assert coil.initial_quantity == 100
+
+
+def test_sync_replica_copies_database(tmp_path):
+    source_name, replica_name = tmp_path / 'db.sqlite3', tmp_path / 'replica.sqlite3'
+    with sqlite3.connect(source_name) as source:
+        source.execute('CREATE TABLE coil (reference TEXT)')
+        source.execute("INSERT INTO coil VALUES ('Бухта-001')")
+    source.close()
+
+    call_command('sync_replica', source=str(source_name), replica=str(replica_name), stdout=io.StringIO())
+
+    replica = sqlite3.connect(replica_name)
+    assert replica.execute('SELECT reference FROM coil').fetchall() == [('Бухта-001',)]
+    replica.close()
+
+
+def test_sync_replica_raise_error_if_replica_is_not_configured():
+    with pytest.raises(CommandError):
+        call_command('sync_replica')
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from allocation.api import event_stream
+from allocation.services import services, unit_of_work
+
+
+@pytest.fixture(autouse=True)
+def broadcaster(monkeypatch):
+    """Каждый тест использует отдельный EventBroadcaster и короткий интервал проверки новых событий."""
+    monkeypatch.setattr(event_stream, 'broadcaster', event_stream.EventBroadcaster())
+    monkeypatch.setattr(event_stream, 'POLL_INTERVAL', 0.01)
+    return event_stream.broadcaster
+
+
+def add_allocated_line(reference, product_id, order_id):
+    services.add_a_coil(reference, product_id, 150, 10, 2, unit_of_work.DjangoUnitOfWork())
+    services.add_a_line(order_id, 'Позиция-001', product_id, 40, unit_of_work.DjangoUnitOfWork())
+    services.allocate(order_id, 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+
+
+class FakeClient:
+    """Клиент приложения ASGI, который отключается после появления в теле ответа строки until."""
+    def __init__(self, until):
+        self.until = until
+        self.status = None
+        self.body = ''
+        self.stopped = asyncio.Event()
+
+    async def receive(self):
+        await self.stopped.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+        else:
+            self.body += message.get('body', b'').decode()
+            if self.until in self.body:
+                self.stopped.set()
+
+
+def request_stream(query_string, headers=(), method='GET', until='event:', action=None):
+    """
+    Отправляет запрос приложению ASGI потока событий и возвращает код ответа и тело ответа,
+    полученное до появления в нем строки until. Функция action выполняется после начала потока.
+    """
+    async def scenario():
+        client = FakeClient(until)
+        scope = {'type': 'http', 'method': method, 'path': event_stream.EVENT_STREAM_PATH,
+                 'query_string': query_string, 'headers': list(headers)}
+        stream = asyncio.ensure_future(event_stream.with_event_stream(None)(scope, client.receive, client.send))
+        if action is not None:
+            while 'retry:' not in client.body:
+                await asyncio.sleep(0.01)
+            await sync_to_async(action)()
+        await asyncio.wait_for(stream, timeout=5)
+        # Ожидание остановки чтения событий после отключения подписчика
+        while event_stream.broadcaster.is_polling():
+            await asyncio.sleep(0.01)
+        return client.status, client.body
+
+    return async_to_sync(scenario)()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_sends_missed_events_after_last_event_id():
+    """Клиент с заголовком Last-Event-ID получает пропущенные события своей бухты."""
+    add_allocated_line('Бухта-050', 'АВВГ_2х2,5', 'Заказ-050')
+    add_allocated_line('Бухта-051', 'АВВГ_3х1,5', 'Заказ-051')
+
+    status, body = request_stream(b'coil=%D0%91%D1%83%D1%85%D1%82%D0%B0-050', headers=[(b'last-event-id', b'0')])
+
+    assert status == 200
+    assert 'event: Allocated\ndata: {"type":"Allocated","order_id":"Заказ-050"' in body
+    assert 'Бухта-051' not in body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_sends_new_events_for_product():
+    """Подписчик получает события, созданные после подключения, только для своего материала."""
+    def allocate_lines():
+        add_allocated_line('Бухта-052', 'АВВГ_3х1,5', 'Заказ-052')
+        add_allocated_line('Бухта-053', 'АВВГ_2х2,5', 'Заказ-053')
+
+    status, body = request_stream('product_id=АВВГ_2х2,5'.encode(), until='event: Allocated', action=allocate_lines)
+
+    assert status == 200
+    assert body.count('event: ') == 2
+    assert body.count('"reference":"Бухта-053"') == 2
+    assert 'Бухта-052' not in body
+
+
+@pytest.mark.parametrize('method, headers, status',
+                         [('POST', [], 405), ('GET', [(b'last-event-id', b'abc')], 400)],
+                         ids=['method', 'last-event-id'])
+def test_stream_rejects_invalid_requests(method, headers, status):
+    """Поток не открывается для запросов, отличных от GET, и при некорректном Last-Event-ID."""
+    response_status, _ = request_stream(b'', headers=headers, method=method, until='')
+
+    assert response_status == status
+
+
+def test_other_requests_are_passed_to_application():
+    """Запросы, не относящиеся к потоку событий, передаются основному приложению ASGI."""
+    scopes = []
+
+    async def application(scope, receive, send):
+        scopes.append(scope)
+
+    async_to_sync(event_stream.with_event_stream(application))({'type': 'http', 'path': '/v1/coils/'}, None, None)
+
+    assert scopes == [{'type': 'http', 'path': '/v1/coils/'}]
@@ -0,0 +1,196 @@
+import http.server
+import json
+import threading
+from collections import defaultdict
+from unittest import mock
+
+import pytest
+
+from allocation import models as django_models
+from allocation.adapters import webhook
+from allocation.domain import domain_logic, events
+from allocation.services import messagebus, services, unit_of_work
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Обработчики событий, зарегистрированные в тесте, удаляются после его завершения."""
+    monkeypatch.setattr(messagebus, 'HANDLERS', defaultdict(list))
+    return messagebus.HANDLERS
+
+
+def add_allocated_line():
+    """Добавляет бухту и товарную позицию и размещает товарную позицию в бухте."""
+    services.add_a_coil('Бухта-040', 'АВВГ_2х2,5', 150, 10, 2, unit_of_work.DjangoUnitOfWork())
+    services.add_a_line('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, unit_of_work.DjangoUnitOfWork())
+    services.allocate('Заказ-040', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_committed_changes_write_events_to_outbox():
+    """События, возникшие при изменении бухт, записываются в таблицу OutboxEventDB при фиксации изменений."""
+    add_allocated_line()
+    services.update_a_coil('Бухта-040', 'АВВГ_2х2,5', 30, 10, 2, unit_of_work.DjangoUnitOfWork())
+
+    payloads = list(django_models.OutboxEventDB.objects.order_by('id').values_list('payload', flat=True))
+
+    assert [events.from_dict(payload) for payload in payloads] == [
+        events.CoilAdded('Бухта-040', 'АВВГ_2х2,5', 150, 10, 2),
+        events.Allocated('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-040'),
+        events.CoilQuantityChanged('Бухта-040', 'АВВГ_2х2,5', 30),
+        events.CoilUpdated('Бухта-040', 'АВВГ_2х2,5', 30, 10, 2),
+        events.Deallocated('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-040'),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_changes_do_not_write_events():
+    """При отмене изменений события не записываются, в том числе при последующей фиксации изменений."""
+    services.add_a_coil('Бухта-041', 'АВВГ_2х2,5', 150, 10, 2, unit_of_work.DjangoUnitOfWork())
+    services.add_a_line('Заказ-041', 'Позиция-001', 'АВВГ_2х2,5', 40, unit_of_work.DjangoUnitOfWork())
+    events_count = django_models.OutboxEventDB.objects.count()
+    uow = unit_of_work.DjangoUnitOfWork()
+
+    with uow:
+        line = uow.line_repo.get('Заказ-041', 'Позиция-001')
+        coil = uow.coil_repo.get('Бухта-041')
+        coil.allocate(line)
+        uow.coil_repo.update(coil)
+        uow.rollback()
+        uow.commit()
+
+    assert django_models.OutboxEventDB.objects.count() == events_count
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_rolled_back_changes_do_not_write_events():
+    """
+    События, возникшие во вложенном блоке with, изменения которого отменены, не записываются
+    при фиксации изменений внешнего блока, события внешнего блока записываются.
+    """
+    services.add_a_line('Заказ-042', 'Позиция-001', 'АВВГ_2х2,5', 40, unit_of_work.DjangoUnitOfWork())
+    services.add_a_line('Заказ-042', 'Позиция-002', 'АВВГ_2х2,5', 50, unit_of_work.DjangoUnitOfWork())
+    uow = unit_of_work.DjangoUnitOfWork()
+
+    with uow:
+        coil = domain_logic.Coil('Бухта-042', 'АВВГ_2х2,5', 150, 10, 2)
+        coil.record_creation()
+        uow.coil_repo.add(coil)
+        line = uow.line_repo.get('Заказ-042', 'Позиция-001')
+        coil.allocate(line)
+        uow.coil_repo.update(coil)
+        # Выход из вложенного блока без фиксации изменений
+        with uow:
+            coil.allocate(uow.line_repo.get('Заказ-042', 'Позиция-002'))
+            uow.coil_repo.update(coil)
+            new_coil = domain_logic.Coil('Бухта-043', 'АВВГ_2х2,5', 150, 10, 2)
+            new_coil.record_creation()
+            uow.coil_repo.add(new_coil)
+        # Отмена изменений во вложенном блоке
+        with uow:
+            coil.deallocate(line)
+            uow.rollback()
+        uow.commit()
+    payloads = list(django_models.OutboxEventDB.objects.order_by('id').values_list('payload', flat=True))
+
+    assert [events.from_dict(payload) for payload in payloads] == [
+        events.CoilAdded('Бухта-042', 'АВВГ_2х2,5', 150, 10, 2),
+        events.Allocated('Заказ-042', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-042'),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_delivers_batches_and_marks_events(handlers):
+    """Недоставленные события передаются обработчикам пакетами и отмечаются как доставленные."""
+    received = []
+    messagebus.register(events.Allocated, received.append)
+    add_allocated_line()
+
+    assert messagebus.dispatch_pending() == 2
+    assert messagebus.dispatch_pending() == 0
+    assert received == [[events.Allocated('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-040')]]
+    assert not django_models.OutboxEventDB.objects.filter(dispatched_at__isnull=True).exists()
+
+
+def add_reallocated_line():
+    """Размещает товарную позицию, отменяет ее размещение и размещает ее повторно."""
+    add_allocated_line()
+    services.deallocate('Заказ-040', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+    services.allocate('Заказ-040', 'Позиция-001', unit_of_work.DjangoUnitOfWork())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_keeps_order_of_events_of_different_types(handlers):
+    """Обработчик нескольких классов событий получает их одним вызовом в порядке возникновения."""
+    received = []
+    messagebus.register(events.Allocated, received.append)
+    messagebus.register(events.Deallocated, received.append)
+    add_reallocated_line()
+
+    messagebus.dispatch_pending()
+
+    allocated = events.Allocated('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-040')
+    deallocated = events.Deallocated('Заказ-040', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-040')
+    assert received == [[allocated, deallocated, allocated]]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failed_handler_leaves_events_pending(handlers):
+    """При ошибке обработчика события остаются недоставленными и будут доставлены повторно."""
+    def failing_handler(batch):
+        raise RuntimeError('Обработчик недоступен')
+
+    messagebus.register(events.Allocated, failing_handler)
+    add_allocated_line()
+
+    with pytest.raises(RuntimeError):
+        messagebus.dispatch_pending()
+
+    assert django_models.OutboxEventDB.objects.filter(dispatched_at__isnull=True).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_webhook_handler_posts_batch_as_json(handlers):
+    """Обработчик WebhookHandler отправляет пакет событий запросом POST в виде списка JSON."""
+    received = []
+
+    class RequestHandler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            received.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(('127.0.0.1', 0), RequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        messagebus.register(events.Allocated, webhook.WebhookHandler(f'http://127.0.0.1:{server.server_port}/'))
+        add_allocated_line()
+        messagebus.dispatch_pending()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert received == [[{'type': 'Allocated', 'order_id': 'Заказ-040', 'line_item': 'Позиция-001',
+                          'product_id': 'АВВГ_2х2,5', 'quantity': 40, 'reference': 'Бухта-040'}]]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_webhook_handler_posts_one_request_per_batch(handlers):
+    """Обработчик WebhookHandler, подписанный на все классы событий, отправляет пакет одним запросом."""
+    handler = webhook.WebhookHandler('http://127.0.0.1/')
+    for event_type in events.EVENT_TYPES.values():
+        messagebus.register(event_type, handler)
+    add_reallocated_line()
+
+    with mock.patch('urllib.request.urlopen') as urlopen:
+        messagebus.dispatch_pending()
+
+    assert urlopen.call_count == 1
+    request = urlopen.call_args.args[0]
+    assert [event['type'] for event in json.loads(request.data)] == [
+        'CoilAdded', 'Allocated', 'Deallocated', 'Allocated',
+    ]
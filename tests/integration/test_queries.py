@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from allocation.adapters import queries, repository
+from allocation.api import serializers
+from allocation.domain.domain_logic import Coil, OrderLine
+from allocation.exceptions import exceptions
+
+
+def add_coil_with_lines(reference: str, lines_count: int) -> Coil:
+    """Добавляет в базу данных бухту и размещенные в ней товарные позиции."""
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    coil = Coil(reference, 'АВВГ_2х6', 200, 10, 2)
+    repo_coil.add(coil)
+    for number in range(lines_count):
+        line = OrderLine(f'Заказ-{reference}', f'Позиция-{number:03}', 'АВВГ_2х6', 10 + number)
+        repo_line.add(line)
+        coil.allocate(line)
+    repo_coil.update(coil)
+    return coil
+
+
+def decode_coil(output_data: str) -> dict:
+    """Декодирует объект JSON с бухтой, заменяя список размещенных товарных позиций множеством."""
+    coil_data = json.loads(output_data)
+    coil_data['allocations'] = set(coil_data['allocations'])
+    return coil_data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('lines_count', [0, 3])
+def test_queries_coil_matches_domain_serialization(lines_count):
+    """Бухта, полученная запросом на чтение, сериализуется так же, как экземпляр класса Coil."""
+    coil = add_coil_with_lines('Бухта-060', lines_count)
+
+    output_data = serializers.serialize_coil_row_to_json(queries.coil('Бухта-060'))
+
+    assert decode_coil(output_data) == decode_coil(serializers.serialize_coil_domain_instance_to_json(coil))
+
+
+@pytest.mark.django_db
+def test_queries_order_line_matches_domain_serialization():
+    line = OrderLine('Заказ-060', 'Позиция-001', 'АВВГ_2х6', 25)
+    repository.DjangoOrderLineRepository().add(line)
+
+    output_data = serializers.serialize_order_line_row_to_json(queries.order_line('Заказ-060', 'Позиция-001'))
+
+    assert output_data == serializers.serialize_order_line_domain_instance_to_json(line)
+
+
+@pytest.mark.django_db
+def test_queries_allocation_coil(django_assert_num_queries):
+    """Бухта, в которой размещена товарная позиция, получается двумя запросами независимо от количества бухт."""
+    add_coil_with_lines('Бухта-061', 2)
+    add_coil_with_lines('Бухта-062', 3)
+    repository.DjangoOrderLineRepository().add(OrderLine('Заказ-061', 'Позиция-001', 'АВВГ_2х6', 5))
+
+    with django_assert_num_queries(2):
+        coil_row = queries.allocation_coil('Заказ-Бухта-062', 'Позиция-001')
+    not_allocated_coil_row = queries.allocation_coil('Заказ-061', 'Позиция-001')
+
+    assert coil_row['reference'] == 'Бухта-062'
+    assert len(coil_row['allocations']) == 3
+    # Товарная позиция не размещена, что приведет к возврату "поддельной" бухты
+    assert not_allocated_coil_row == queries.FAKE_COIL
+
+
+@pytest.mark.django_db
+def test_queries_raise_not_exist_exceptions():
+    with pytest.raises(exceptions.DBCoilRecordDoesNotExist):
+        queries.coil('Бухта-063')
+    with pytest.raises(exceptions.DBOrderLineRecordDoesNotExist):
+        queries.order_line('Заказ-062', 'Позиция-001')
+    with pytest.raises(exceptions.DBOrderLineRecordDoesNotExist):
+        queries.allocation_coil('Заказ-062', 'Позиция-001')
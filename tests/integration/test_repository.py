@@ -1,7 +1,11 @@
+import random
+
 import pytest
 
-from allocation.adapters import repository
-from allocation.domain.domain_logic import Coil, OrderLine
+from allocation import models as django_models
+from allocation.adapters import coil_pool_cache, repository
+from allocation.domain.domain_logic import Coil, OrderLine, allocate_to_list_of_coils
+from allocation.exceptions import exceptions
 
 
 @pytest.mark.django_db
@@ -158,3 +162,168 @@ def test_repository_get_a_list_of_lines():
     list_of_lines = repo.order_lines_list()
 
     assert list_of_lines == [line_1, line_2]
+
+
+@pytest.mark.django_db
+def test_repository_order_lines_by_keys(django_assert_num_queries):
+    """Товарные позиции получаются одним запросом по парам идентификаторов, отсутствующие пропускаются."""
+    repo = repository.DjangoOrderLineRepository()
+    line_1 = OrderLine('Заказ-039', 'Позиция-001', 'АВВГ_2х6', 10)
+    line_2 = OrderLine('Заказ-040', 'Позиция-002', 'АВВГ_2х6', 20)
+    # Товарная позиция с order_id первой и line_item второй позиции не входит в результат
+    line_3 = OrderLine('Заказ-039', 'Позиция-002', 'АВВГ_2х6', 30)
+    for line in (line_1, line_2, line_3):
+        repo.add(line)
+
+    with django_assert_num_queries(1):
+        lines = repo.order_lines_by_keys({('Заказ-039', 'Позиция-001'), ('Заказ-040', 'Позиция-002'),
+                                          ('Заказ-041', 'Позиция-001')})
+
+    assert lines == {('Заказ-039', 'Позиция-001'): line_1, ('Заказ-040', 'Позиция-002'): line_2}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('seed', range(20))
+def test_repository_candidate_coils_match_allocate_to_list_of_coils(seed):
+    """
+    Наилучшая бухта-кандидат, отобранная на стороне базы данных, совпадает с бухтой,
+    которую выбирает функция allocate_to_list_of_coils для того же набора бухт.
+    """
+    rnd = random.Random(seed)
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    # Добавление в базу данных бухт двух материалов и размещение в них части товарных позиций
+    for number in range(rnd.randint(1, 12)):
+        coil = Coil(f'Бухта-{number:03}', rnd.choice(['АВВГ_2х6', 'АВВГ_3х1,5']), rnd.randint(20, 120),
+                    rnd.randint(1, 15), rnd.randint(0, 5))
+        repo_coil.add(coil)
+        for item in range(rnd.randint(0, 4)):
+            line = OrderLine(f'Заказ-{number:03}', f'Позиция-{item:03}', coil.product_id, rnd.randint(1, 30))
+            repo_line.add(line)
+            coil.allocate(line)
+        repo_coil.update(coil)
+    new_line = OrderLine('Заказ-999', 'Позиция-001', rnd.choice(['АВВГ_2х6', 'АВВГ_3х1,5']), rnd.randint(1, 60))
+
+    candidates = repo_coil.candidate_coils(new_line)
+    try:
+        expected_coil = allocate_to_list_of_coils(new_line, repo_coil.coils_list())
+    except exceptions.OutOfStock:
+        assert candidates == []
+    else:
+        assert candidates[0].reference == expected_coil.reference
+        assert all(coil.can_allocate(new_line) for coil in candidates)
+        assert candidates == sorted(candidates)
+
+
+@pytest.mark.django_db
+def test_repository_candidate_coils_return_allocation_coil():
+    """Если товарная позиция уже размещена, то список бухт-кандидатов состоит из бухты, где она размещена."""
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    coil_1 = Coil('Бухта-024', 'АВВГ_2х6', 100, 10, 2)
+    coil_2 = Coil('Бухта-025', 'АВВГ_2х6', 50, 10, 2)
+    repo_coil.add(coil_1)
+    repo_coil.add(coil_2)
+    line = OrderLine('Заказ-039', 'Позиция-001', 'АВВГ_2х6', 20)
+    repo_line.add(line)
+    coil_1.allocate(line)
+    repo_coil.update(coil_1)
+
+    candidates = repo_coil.candidate_coils(line)
+
+    assert [coil.reference for coil in candidates] == ['Бухта-024']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('coils_count', [1, 10])
+def test_repository_coils_list_uses_constant_number_of_queries(coils_count, django_assert_num_queries):
+    """Количество запросов при получении списка бухт не зависит от количества бухт и товарных позиций."""
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    for number in range(coils_count):
+        coil = Coil(f'Бухта-{number:03}', 'АВВГ_2х6', 100, 10, 2)
+        repo_coil.add(coil)
+        line = OrderLine(f'Заказ-{number:03}', 'Позиция-001', 'АВВГ_2х6', 20)
+        repo_line.add(line)
+        coil.allocate(line)
+        repo_coil.update(coil)
+
+    # Запросы для бухт, размещений и товарных позиций
+    with django_assert_num_queries(3):
+        list_of_coils = repo_coil.coils_list(['АВВГ_2х6'])
+
+    assert len(list_of_coils) == coils_count
+    assert all(coil.available_quantity == 80 for coil in list_of_coils)
+
+
+@pytest.mark.django_db
+def test_repository_update_removes_only_deallocated_lines():
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    coil = Coil('Бухта-025', 'АВВГ_2х6', 120, 10, 1)
+    repo_coil.add(coil)
+    line_1 = OrderLine('Заказ-041', 'Позиция-001', 'АВВГ_2х6', 30)
+    line_2 = OrderLine('Заказ-042', 'Позиция-001', 'АВВГ_2х6', 35)
+    line_3 = OrderLine('Заказ-043', 'Позиция-001', 'АВВГ_2х6', 20)
+    for line in (line_1, line_2, line_3):
+        repo_line.add(line)
+    coil.allocate(line_1)
+    coil.allocate(line_2)
+    repo_coil.update(coil)
+
+    # Отмена размещения одной товарной позиции и размещение другой
+    coil.deallocate(line_1)
+    coil.allocate(line_3)
+    repo_coil.update(coil)
+
+    assert repo_coil.get(reference=coil.reference).allocations == {line_2, line_3}
+
+
+@pytest.mark.django_db
+def test_repository_update_raises_for_missing_line():
+    repo_coil = repository.DjangoCoilRepository()
+    coil = Coil('Бухта-026', 'АВВГ_2х6', 120, 10, 1)
+    repo_coil.add(coil)
+    coil.allocate(OrderLine('Заказ-044', 'Позиция-001', 'АВВГ_2х6', 30))
+
+    with pytest.raises(exceptions.DBOrderLineRecordDoesNotExist):
+        repo_coil.update(coil)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('lines_count', [1, 10])
+def test_repository_update_uses_constant_number_of_queries(lines_count, django_assert_num_queries):
+    """Количество запросов при обновлении бухты не зависит от количества размещаемых товарных позиций."""
+    repo_coil = repository.DjangoCoilRepository()
+    repo_line = repository.DjangoOrderLineRepository()
+    coil = Coil('Бухта-027', 'АВВГ_2х6', 1000, 10, 2)
+    repo_coil.add(coil)
+    for number in range(lines_count):
+        line = OrderLine(f'Заказ-{number:03}', 'Позиция-001', 'АВВГ_2х6', 20)
+        repo_line.add(line)
+        coil.allocate(line)
+
+    # Запросы для бухты, ее обновления, существующих размещений, товарных позиций и создания размещений
+    with django_assert_num_queries(5):
+        repo_coil.update(coil)
+
+    assert len(repo_coil.get(reference=coil.reference).allocations) == lines_count
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ttl, expected_quantity', [(60, 150), (0, 90)])
+def test_repository_coil_pool_staleness_is_bounded_by_ttl(settings, ttl, expected_quantity):
+    """
+    Изменение, зафиксированное другим процессом (без сброса кэша этого процесса), учитывается в пуле бухт
+    после истечения COIL_POOL_CACHE_TTL, при COIL_POOL_CACHE_TTL=0 - сразу.
+    """
+    settings.COIL_POOL_CACHE_TTL = ttl
+    coil_pool_cache.invalidate()
+    repo = repository.DjangoCoilRepository()
+    repo.add(Coil('Бухта-090', 'АВВГ_2х6', 150, 3, 1))
+    repo.coil_pool('АВВГ_2х6')
+
+    django_models.CoilDB.objects.filter(reference='Бухта-090').update(quantity=90)
+
+    assert list(repo.coil_pool('АВВГ_2х6').initial_quantities) == [expected_quantity]
+    coil_pool_cache.invalidate()
@@ -1,4 +1,8 @@
-from allocation.domain import domain_logic
+import pytest
+
+from allocation.domain import domain_logic, events, simulation
+from allocation.domain.coil_pool import CoilPool
+from allocation.exceptions import exceptions
 from allocation.services import services
 
 
@@ -29,8 +33,36 @@ class FakeCoilRepository:
         self.coils.discard(discarded_coil)
         return deallocated_lines
 
-    def coils_list(self) -> list[domain_logic.Coil]:
-        return list(self.coils)
+    def coils_list(self, product_ids=None) -> list[domain_logic.Coil]:
+        if product_ids is None:
+            return list(self.coils)
+        return [coil for coil in self.coils if coil.product_id in set(product_ids)]
+
+    def snapshot(self, product_ids, order_ids) -> simulation.WarehouseSnapshot:
+        warehouse_snapshot = simulation.WarehouseSnapshot()
+        for coil in self.coils:
+            if coil.product_id in product_ids:
+                warehouse_snapshot.add_coil(coil.reference, coil.product_id, coil.available_quantity,
+                                            coil.recommended_balance, coil.acceptable_loss)
+            for line in coil.allocations:
+                if line.order_id in order_ids:
+                    warehouse_snapshot.allocations[(line.order_id, line.line_item)] = coil.reference
+        return warehouse_snapshot
+
+    def coil_pool(self, product_id: str) -> CoilPool:
+        return CoilPool.from_coils(product_id, sorted(self.coils, key=lambda coil: coil.reference))
+
+    def candidate_coils(self, line: domain_logic.OrderLine, limit: int = 5) -> list[domain_logic.Coil]:
+        for coil in self.coils:
+            if line in coil.allocations:
+                return [coil]
+        return sorted(coil for coil in self.coils if coil.can_allocate(line))[:limit]
+
+    def collect_events(self) -> list[events.Event]:
+        collected_events = [event for coil in self.coils for event in coil.events]
+        for coil in self.coils:
+            coil.events.clear()
+        return collected_events
 
 
 class FakeOrderLineRepository:
@@ -61,8 +93,8 @@ class FakeOrderLineRepository:
                               and o_line.line_item == line_item)
         self.lines.discard(discarded_line)
 
-    def order_lines_list(self) -> list[domain_logic.OrderLine]:
-        return list(self.lines)
+    def order_lines_list(self, order_id=None) -> list[domain_logic.OrderLine]:
+        return [line for line in self.lines if order_id is None or line.order_id == order_id]
 
 
 class FakeUnitOfWork:
@@ -139,6 +171,28 @@ def test_service_update_a_coil():
     assert uow.committed
 
 
+def test_service_update_a_coil_with_optimization():
+    """
+    Обновление бухты с оптимизацией переразмещения оставит размещенными товарные позиции
+    с наибольшим суммарным количеством материала.
+    """
+    uow = FakeUnitOfWork()
+    # Добавление бухты в хранилище
+    services.add_a_coil('Бухта-053', 'АВВГ_2х2,5', 60, 10, 3, uow)
+    # Добавление товарных позиций в хранилище и их размещение в бухте
+    for line_item in ('Позиция-001', 'Позиция-002', 'Позиция-003'):
+        services.add_a_line('Заказ-056', line_item, 'АВВГ_2х2,5', 6, uow)
+        services.allocate('Заказ-056', line_item, uow)
+
+    # Без оптимизации после обновления размещенной останется только одна товарная позиция,
+    # с оптимизацией - все три, т.к. остаток материала будет в пределах приемлемых потерь
+    deallocated_lines = services.update_a_coil('Бухта-053', 'АВВГ_2х2,5', 20, 10, 3, uow, optimize=True)
+
+    assert deallocated_lines == set()
+    assert services.get_a_coil('Бухта-053', uow).available_quantity == 2
+    assert uow.committed
+
+
 def test_service_delete_a_coil():
     """Удаление бухты возвращает множество товарных позиций, которые перестанут быть размещенными"""
     uow = FakeUnitOfWork()
@@ -162,6 +216,56 @@ def test_service_delete_a_coil():
     assert uow.committed
 
 
+def test_service_update_a_coil_and_reallocate():
+    """
+    Обновление бухты с переразмещением разместит товарные позиции, которые перестанут
+    быть размещенными в бухте, в других бухтах с тем же материалом.
+    """
+    uow = FakeUnitOfWork()
+    # Добавление бухт в хранилище
+    services.add_a_coil('Бухта-054', 'АВВГ_2х2,5', 100, 20, 3, uow)
+    services.add_a_coil('Бухта-055', 'АВВГ_2х2,5', 200, 20, 3, uow)
+    # Добавление товарных позиций в хранилище и их размещение в бухте Бухта-054
+    services.add_a_line('Заказ-057', 'Позиция-001', 'АВВГ_2х2,5', 40, uow)
+    services.add_a_line('Заказ-057', 'Позиция-002', 'АВВГ_2х2,5', 35, uow)
+    services.allocate('Заказ-057', 'Позиция-001', uow)
+    services.allocate('Заказ-057', 'Позиция-002', uow)
+
+    batch_allocation = services.update_a_coil_and_reallocate('Бухта-054', 'АВВГ_2х2,5', 80, 20, 3, uow)
+
+    assert {(line.line_item, coil.reference) for line, coil in batch_allocation.allocated.items()} == \
+           {('Позиция-001', 'Бухта-055')}
+    assert batch_allocation.out_of_stock == set()
+    assert services.get_a_coil('Бухта-054', uow).available_quantity == 45
+    assert services.get_a_coil('Бухта-055', uow).available_quantity == 160
+    assert uow.committed
+
+
+def test_service_delete_a_coil_and_reallocate():
+    """
+    Удаление бухты с переразмещением разместит товарные позиции, которые перестанут быть размещенными,
+    в других бухтах с тем же материалом, или вернет их как неразмещенные.
+    """
+    uow = FakeUnitOfWork()
+    # Добавление бухт в хранилище
+    services.add_a_coil('Бухта-056', 'АВВГ_2х6', 150, 20, 5, uow)
+    # Добавление товарных позиций в хранилище и их размещение в бухте Бухта-056
+    services.add_a_line('Заказ-058', 'Позиция-001', 'АВВГ_2х6', 50, uow)
+    services.add_a_line('Заказ-058', 'Позиция-002', 'АВВГ_2х6', 64, uow)
+    services.allocate('Заказ-058', 'Позиция-002', uow)
+    services.allocate('Заказ-058', 'Позиция-001', uow)
+    # Добавление бухты, в которой поместится только одна из товарных позиций
+    services.add_a_coil('Бухта-057', 'АВВГ_2х6', 70, 10, 6, uow)
+
+    batch_allocation = services.delete_a_coil_and_reallocate('Бухта-056', uow)
+
+    assert {(line.line_item, coil.reference) for line, coil in batch_allocation.allocated.items()} == \
+           {('Позиция-002', 'Бухта-057')}
+    assert {line.line_item for line in batch_allocation.out_of_stock} == {'Позиция-001'}
+    assert services.get_a_coil('Бухта-057', uow).available_quantity == 6
+    assert uow.committed
+
+
 def test_service_get_a_line():
     uow = FakeUnitOfWork()
     # Добавление товарных позиций в хранилище
@@ -280,6 +384,72 @@ def test_service_allocate_a_line_and_return_allocation_coil():
     assert services.get_a_coil('Бухта-042', uow).available_quantity == 24
 
 
+def test_service_allocate_an_order():
+    """
+    Размещение заказа размещает все его неразмещенные товарные позиции
+    и возвращает товарные позиции, которые не удалось разместить.
+    """
+    uow = FakeUnitOfWork()
+    # Добавление бухт в хранилище
+    services.add_a_coil('Бухта-043', 'АВВГ_2х6', 100, 10, 3, uow)
+    services.add_a_coil('Бухта-044', 'АВВГ_3х1,5', 50, 10, 3, uow)
+    # Добавление товарных позиций заказа в хранилище и размещение одной из них
+    services.add_a_line('Заказ-059', 'Позиция-001', 'АВВГ_2х6', 30, uow)
+    services.add_a_line('Заказ-059', 'Позиция-002', 'АВВГ_2х6', 40, uow)
+    services.add_a_line('Заказ-059', 'Позиция-003', 'АВВГ_3х1,5', 45, uow)
+    services.add_a_line('Заказ-060', 'Позиция-001', 'АВВГ_2х6', 10, uow)
+    services.allocate('Заказ-059', 'Позиция-001', uow)
+
+    batch_allocation = services.allocate_an_order('Заказ-059', uow, prefer_locality=True)
+
+    assert {(line.line_item, coil.reference) for line, coil in batch_allocation.allocated.items()} == \
+           {('Позиция-001', 'Бухта-043'), ('Позиция-002', 'Бухта-043')}
+    assert {line.line_item for line in batch_allocation.out_of_stock} == {'Позиция-003'}
+    assert services.get_a_coil('Бухта-043', uow).available_quantity == 30
+    assert uow.committed
+
+
+def test_service_allocate_an_order_raise_not_exist_exception():
+    """Размещение заказа без товарных позиций вызовет исключение."""
+    uow = FakeUnitOfWork()
+
+    with pytest.raises(exceptions.DBOrderRecordsDoNotExist):
+        services.allocate_an_order('Заказ-061', uow)
+
+
+def test_service_simulate_allocation():
+    """Моделирование размещения товарных позиций не изменяет бухты в хранилище."""
+    uow = FakeUnitOfWork()
+    # Добавление бухт в хранилище
+    services.add_a_coil('Бухта-045', 'АВВГ_2х6', 70, 15, 3, uow)
+    services.add_a_coil('Бухта-046', 'АВВГ_2х6', 50, 15, 3, uow)
+    lines = [domain_logic.OrderLine('Заказ-062', 'Позиция-001', 'АВВГ_2х6', 30),
+             domain_logic.OrderLine('Заказ-062', 'Позиция-002', 'АВВГ_2х6', 30),
+             domain_logic.OrderLine('Заказ-062', 'Позиция-003', 'АВВГ_2х6', 30)]
+    uow.committed = False
+
+    result = services.simulate_allocation(lines, uow)
+
+    assert [result.allocated[line] for line in lines[:2]] == ['Бухта-046', 'Бухта-045']
+    assert result.out_of_stock == [lines[2]]
+    assert services.get_a_coil('Бухта-045', uow).available_quantity == 70
+    assert not uow.committed
+
+
+def test_service_get_feasible_coils():
+    uow = FakeUnitOfWork()
+    # Добавление бухт в хранилище
+    services.add_a_coil('Бухта-047', 'АВВГ_2х6', 70, 15, 3, uow)
+    services.add_a_coil('Бухта-048', 'АВВГ_2х6', 50, 15, 3, uow)
+    services.add_a_coil('Бухта-049', 'АВВГ_2х6', 45, 15, 3, uow)
+    services.add_a_coil('Бухта-050', 'АВВГ_3х1,5', 100, 15, 3, uow)
+
+    # В Бухта-049 останется 10, что меньше recommended_balance и больше acceptable_loss
+    feasible_coils = services.get_feasible_coils('АВВГ_2х6', 35, uow)
+
+    assert feasible_coils == [('Бухта-048', 50), ('Бухта-047', 70)]
+
+
 def test_service_deallocate_a_line_and_return_allocation_coil():
     """Отмена размещения товарной позиции возвращает бухту, в которой она была размещена."""
     uow = FakeUnitOfWork()
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.parametrize('env_variable', ['DJANGO_SECRET_KEY', 'DJANGO_ALLOWED_HOSTS'])
+def test_settings_require_variables_in_production(env_variable):
+    """В производственном окружении настройки не загружаются, если не задан секретный ключ или имена хоста."""
+    env = dict(os.environ, DJANGO_ENV='production', DJANGO_SECRET_KEY='key', DJANGO_ALLOWED_HOSTS='localhost')
+    del env[env_variable]
+    env.pop('DJANGO_DEBUG', None)
+
+    result = subprocess.run([sys.executable, '-c', 'import coils_and_wires.settings'], env=env,
+                            cwd=Path(__file__).parents[2], capture_output=True, text=True)
+
+    assert result.returncode != 0
+    assert f'ImproperlyConfigured: Переменная окружения {env_variable}' in result.stderr
+
+
+def test_settings_allow_development_defaults_without_variables():
+    """Без переменных окружения, например при запуске manage.py, включены режим отладки, ключ разработки
+    и любые имена хоста."""
+    env = {name: value for name, value in os.environ.items()
+           if name not in ('DJANGO_ENV', 'DJANGO_DEBUG', 'DJANGO_SECRET_KEY', 'DJANGO_ALLOWED_HOSTS')}
+    code = 'from coils_and_wires import settings; print(settings.DEBUG, settings.ALLOWED_HOSTS)'
+
+    result = subprocess.run([sys.executable, '-c', code], env=env, cwd=Path(__file__).parents[2],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "True ['*']"
+
+
+def test_manage_check_runs_without_variables():
+    """Команда check выполняется без переменных окружения."""
+    env = {name: value for name, value in os.environ.items()
+           if name not in ('DJANGO_ENV', 'DJANGO_DEBUG', 'DJANGO_SECRET_KEY', 'DJANGO_ALLOWED_HOSTS',
+                           'DJANGO_SETTINGS_MODULE')}
+
+    result = subprocess.run([sys.executable, 'manage.py', 'check'], env=env, cwd=Path(__file__).parents[2],
+                            capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_gunicorn_config_sets_production_environment():
+    """Конфигурация gunicorn задает производственное окружение, если оно не задано."""
+    env = {name: value for name, value in os.environ.items() if name != 'DJANGO_ENV'}
+    code = 'import os, runpy; runpy.run_path("gunicorn.conf.py"); print(os.environ["DJANGO_ENV"])'
+
+    result = subprocess.run([sys.executable, '-c', code], env=env, cwd=Path(__file__).parents[2],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == 'production'
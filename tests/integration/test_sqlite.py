@@ -0,0 +1,34 @@
+import pytest
+from django.db import connection
+
+from allocation.adapters import sqlite
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_are_set_for_new_connection(settings):
+    """При открытии соединения с базой данных выполняются инструкции PRAGMA из настройки SQLITE_PRAGMAS."""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        busy_timeout = cursor.fetchone()[0]
+        cursor.execute('PRAGMA cache_size')
+        cache_size = cursor.fetchone()[0]
+
+    assert busy_timeout == int(settings.SQLITE_PRAGMAS['busy_timeout'])
+    assert cache_size == int(settings.SQLITE_PRAGMAS['cache_size'])
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_with_empty_value_are_skipped(settings):
+    settings.SQLITE_PRAGMAS = {'busy_timeout': '1234', 'cache_size': ''}
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA cache_size = -2000')
+
+    sqlite.set_sqlite_pragmas(sender=None, connection=connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        busy_timeout = cursor.fetchone()[0]
+        cursor.execute('PRAGMA cache_size')
+        cache_size = cursor.fetchone()[0]
+    assert busy_timeout == 1234
+    assert cache_size == -2000
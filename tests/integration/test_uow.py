@@ -1,7 +1,10 @@
 import pytest
+from asgiref.sync import async_to_sync
+from django.db import transaction
 
 from allocation.domain import domain_logic
-from allocation.services import unit_of_work
+from allocation.exceptions import exceptions
+from allocation.services import services, unit_of_work
 
 
 @pytest.mark.django_db(transaction=True)
@@ -34,3 +37,93 @@ def test_uow_roll_back_uncommitted_coil():
     coils_list = uow.coil_repo.coils_list()
 
     assert coils_list == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_uow_roll_back_uncommitted_coil():
+    """
+    При неиспользовании метода commit() асинхронной версии Unit of Work
+    изменения будут отменены при выходе из блока async with.
+    """
+    uow = unit_of_work.AsyncDjangoUnitOfWork()
+    coil = domain_logic.Coil('Бухта-022', 'АВВГ_2х2,5', 150, 10, 2)
+
+    async def add_coil():
+        async with uow:
+            await uow.coil_repo.add(coil)
+        return await uow.coil_repo.coils_list()
+
+    assert async_to_sync(add_coil)() == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_only_uow_does_not_open_transaction():
+    """Unit of Work только для чтения не отключает автокоммит и не открывает транзакцию."""
+    services.add_a_coil('Бухта-023', 'АВВГ_2х2,5', 150, 10, 2, unit_of_work.DjangoUnitOfWork())
+    uow = unit_of_work.ReadOnlyUnitOfWork()
+
+    with uow:
+        coil = uow.coil_repo.get('Бухта-023')
+        autocommit = transaction.get_autocommit()
+
+    assert coil.initial_quantity == 150
+    assert autocommit
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_only_uow_with_snapshot_reads_in_one_transaction():
+    uow = unit_of_work.ReadOnlyUnitOfWork(snapshot=True)
+
+    with uow:
+        in_atomic_block = transaction.get_connection().in_atomic_block
+
+    assert in_atomic_block
+    assert not transaction.get_connection().in_atomic_block
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_only_uow_rejects_writes_and_commit():
+    uow = unit_of_work.ReadOnlyUnitOfWork()
+
+    with uow:
+        with pytest.raises(exceptions.ReadOnlyUnitOfWorkViolation):
+            uow.coil_repo.add(domain_logic.Coil('Бухта-024', 'АВВГ_2х2,5', 150, 10, 2))
+        with pytest.raises(exceptions.ReadOnlyUnitOfWorkViolation):
+            uow.line_repo.delete('Заказ-001', 'Позиция-001')
+        with pytest.raises(exceptions.ReadOnlyUnitOfWorkViolation):
+            uow.ticket_repo.claim_batch(10)
+        with pytest.raises(exceptions.ReadOnlyUnitOfWorkViolation):
+            uow.commit()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_uow_commit_is_kept_until_outer_exit():
+    """
+    Изменения, сохраненные во вложенном блоке with, фиксируются только вместе с транзакцией
+    внешнего блока и отменяются, если во внешнем блоке не был запущен метод commit().
+    """
+    uow = unit_of_work.DjangoUnitOfWork()
+
+    with uow:
+        with uow:
+            uow.coil_repo.add(domain_logic.Coil('Бухта-025', 'АВВГ_2х2,5', 150, 10, 2))
+            uow.commit()
+        autocommit = transaction.get_autocommit()
+        coils_in_transaction = uow.coil_repo.coils_list()
+
+    assert not autocommit
+    assert [coil.reference for coil in coils_in_transaction] == ['Бухта-025']
+    assert uow.coil_repo.coils_list() == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_nested_uow_exit_rolls_back_only_nested_changes():
+    uow = unit_of_work.DjangoUnitOfWork()
+
+    with uow:
+        uow.coil_repo.add(domain_logic.Coil('Бухта-026', 'АВВГ_2х2,5', 150, 10, 2))
+        with uow:
+            uow.coil_repo.add(domain_logic.Coil('Бухта-027', 'АВВГ_2х2,5', 150, 10, 2))
+        uow.commit()
+
+    assert [coil.reference for coil in uow.coil_repo.coils_list()] == ['Бухта-026']
@@ -0,0 +1,10 @@
+"""
+Настройки для тестов: переменные окружения, обязательные без режима отладки,
+задаются значениями для тестов, если они не заданы, см. coils_and_wires/settings.py.
+"""
+import os
+
+os.environ.setdefault('DJANGO_SECRET_KEY', 'tests-secret-key')
+os.environ.setdefault('DJANGO_ALLOWED_HOSTS', 'testserver,localhost')
+
+from coils_and_wires.settings import *  # noqa: E402, F401, F403
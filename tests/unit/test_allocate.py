@@ -1,6 +1,6 @@
 import pytest
 
-from allocation.domain.domain_logic import Coil, OrderLine, allocate_to_list_of_coils
+from allocation.domain.domain_logic import Coil, OrderLine, allocate_lines_to_list_of_coils, allocate_to_list_of_coils
 from allocation.exceptions import exceptions
 
 
@@ -82,3 +82,59 @@ def test_raise_out_of_stock_exception_if_cannot_allocate():
 
     with pytest.raises(exceptions.OutOfStock):
         allocate_to_list_of_coils(line, [coil])
+
+
+def test_allocate_lines_prefers_smaller_coils_and_reports_out_of_stock():
+    """
+    При размещении нескольких товарных позиций каждая из них, начиная с наибольшей,
+    размещается в бухте с наименьшим подходящим доступным количеством материала.
+    Товарные позиции, которые не удалось разместить, возвращаются отдельно.
+    """
+    smaller_coil = Coil('Бухта-010', 'АВВГ_2х6', 40, 5, 1)
+    bigger_coil = Coil('Бухта-011', 'АВВГ_2х6', 60, 5, 1)
+    other_product_coil = Coil('Бухта-012', 'АВВГ_3х1,5', 100, 5, 1)
+    line_1 = OrderLine('Заказ-015', 'Позиция-001', 'АВВГ_2х6', 30)
+    line_2 = OrderLine('Заказ-015', 'Позиция-002', 'АВВГ_2х6', 35)
+    line_3 = OrderLine('Заказ-015', 'Позиция-003', 'АВВГ_2х6', 50)
+
+    batch_allocation = allocate_lines_to_list_of_coils([line_1, line_2, line_3],
+                                                       [bigger_coil, other_product_coil, smaller_coil])
+
+    assert batch_allocation.allocated == {line_3: bigger_coil, line_2: smaller_coil}
+    assert batch_allocation.out_of_stock == {line_1}
+    assert smaller_coil.available_quantity == 5
+    assert bigger_coil.available_quantity == 10
+    assert other_product_coil.available_quantity == 100
+
+
+def test_allocate_lines_matches_allocate_to_list_of_coils():
+    """Размещение одной товарной позиции совпадает с результатом функции allocate_to_list_of_coils."""
+    coils = [Coil('Бухта-013', 'АВВГ_2х6', 95, 10, 3), Coil('Бухта-014', 'АВВГ_2х6', 105, 7, 2),
+             Coil('Бухта-015', 'АВВГ_2х6', 120, 3, 1)]
+    line = OrderLine('Заказ-016', 'Позиция-001', 'АВВГ_2х6', 30)
+
+    batch_allocation = allocate_lines_to_list_of_coils([line], coils)
+
+    assert batch_allocation.allocated[line] == allocate_to_list_of_coils(line, coils)
+
+
+def test_allocate_lines_with_locality_uses_fewer_coils():
+    """
+    При размещении нескольких товарных позиций с предпочтением локальности товарные позиции
+    с одинаковым материалом размещаются в одной бухте, если это возможно.
+    """
+    lines = [OrderLine('Заказ-017', 'Позиция-001', 'АВВГ_2х6', 30),
+             OrderLine('Заказ-017', 'Позиция-002', 'АВВГ_2х6', 20),
+             OrderLine('Заказ-017', 'Позиция-003', 'АВВГ_2х6', 40)]
+    smaller_coil = Coil('Бухта-016', 'АВВГ_2х6', 50, 5, 1)
+    bigger_coil = Coil('Бухта-017', 'АВВГ_2х6', 100, 5, 1)
+    other_smaller_coil = Coil('Бухта-016', 'АВВГ_2х6', 50, 5, 1)
+    other_bigger_coil = Coil('Бухта-017', 'АВВГ_2х6', 100, 5, 1)
+
+    batch_allocation = allocate_lines_to_list_of_coils(lines, [smaller_coil, bigger_coil])
+    local_batch_allocation = allocate_lines_to_list_of_coils(lines, [other_smaller_coil, other_bigger_coil],
+                                                             prefer_locality=True)
+
+    assert len({coil.reference for coil in batch_allocation.allocated.values()}) == 2
+    assert {coil.reference for coil in local_batch_allocation.allocated.values()} == {'Бухта-017'}
+    assert other_bigger_coil.available_quantity == 10
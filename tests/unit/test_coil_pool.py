@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from allocation.domain.coil_pool import CoilPool
+from allocation.domain.domain_logic import Coil, OrderLine, allocate_to_list_of_coils
+from allocation.exceptions import exceptions
+
+
+def make_coils(rnd: random.Random) -> list[Coil]:
+    """Создает список бухт со случайными атрибутами и размещенными товарными позициями."""
+    coils = []
+    for number in range(rnd.randint(1, 15)):
+        coil = Coil(f'Бухта-{number:03}', 'АВВГ_2х6', rnd.randint(20, 150), rnd.randint(0, 20), rnd.randint(0, 6))
+        for item in range(rnd.randint(0, 3)):
+            coil.allocate(OrderLine(f'Заказ-{number:03}', f'Позиция-{item:03}', 'АВВГ_2х6', rnd.randint(1, 40)))
+        coils.append(coil)
+    return coils
+
+
+def test_coil_pool_keeps_only_coils_with_the_product():
+    coil_1 = Coil('Бухта-001', 'АВВГ_2х6', 50, 5, 1)
+    coil_2 = Coil('Бухта-002', 'АВВГ_3х1,5', 50, 5, 1)
+
+    pool = CoilPool.from_coils('АВВГ_2х6', [coil_1, coil_2])
+
+    assert pool.references == ['Бухта-001']
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_coil_pool_round_trip(seed):
+    """Преобразование бухт в пул и обратно сохраняет атрибуты бухт и размещенные товарные позиции."""
+    coils = make_coils(random.Random(seed))
+
+    restored_coils = CoilPool.from_coils('АВВГ_2х6', coils).to_coils()
+
+    assert [(coil.reference, coil.initial_quantity, coil.recommended_balance, coil.acceptable_loss)
+            for coil in restored_coils] == \
+           [(coil.reference, coil.initial_quantity, coil.recommended_balance, coil.acceptable_loss)
+            for coil in coils]
+    assert [coil.allocations for coil in restored_coils] == [coil.allocations for coil in coils]
+    assert [coil.available_quantity for coil in restored_coils] == [coil.available_quantity for coil in coils]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_coil_pool_can_allocate_matches_coils(seed):
+    """Векторизованная проверка возможности размещения совпадает с методом Coil.can_allocate."""
+    rnd = random.Random(seed)
+    coils = make_coils(rnd)
+    pool = CoilPool.from_coils('АВВГ_2х6', coils)
+
+    for quantity in range(0, 160, 7):
+        line = OrderLine('Заказ-999', 'Позиция-001', 'АВВГ_2х6', quantity)
+        assert pool.can_allocate(quantity) == [coil.can_allocate(line) for coil in coils]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_coil_pool_allocate_matches_allocate_to_list_of_coils(seed):
+    """Последовательное размещение в пуле совпадает с последовательным вызовом allocate_to_list_of_coils."""
+    rnd = random.Random(seed)
+    coils = make_coils(rnd)
+    pool = CoilPool.from_coils('АВВГ_2х6', coils)
+    lines = [OrderLine(f'Заказ-{rnd.randint(0, 20):03}', f'Позиция-{rnd.randint(0, 3):03}', 'АВВГ_2х6',
+                       rnd.randint(1, 60))
+             for _ in range(30)]
+
+    for line in lines:
+        index = pool.allocate(line)
+        try:
+            expected_coil = allocate_to_list_of_coils(line, coils)
+        except exceptions.OutOfStock:
+            assert index is None
+        else:
+            assert pool.references[index] == expected_coil.reference
+
+    assert [coil.allocations for coil in pool.to_coils()] == [coil.allocations for coil in coils]
+
+
+def test_coil_pool_deallocate():
+    coil = Coil('Бухта-001', 'АВВГ_2х6', 100, 5, 1)
+    line_1 = OrderLine('Заказ-001', 'Позиция-001', 'АВВГ_2х6', 30)
+    line_2 = OrderLine('Заказ-001', 'Позиция-002', 'АВВГ_2х6', 20)
+    coil.allocate(line_1)
+    coil.allocate(line_2)
+    pool = CoilPool.from_coils('АВВГ_2х6', [coil])
+
+    assert pool.deallocate('Заказ-001', 'Позиция-001') == 0
+    assert pool.deallocate('Заказ-001', 'Позиция-001') is None
+    assert pool.available_quantities().tolist() == [80]
+    assert pool.to_coils()[0].allocations == {line_2}
+    # Освободившееся количество материала снова доступно для размещения
+    assert pool.best_fit(80) == 0
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_coil_pool_feasible_matches_allocation_order(seed):
+    """Бухты, в которых может быть размещена товарная позиция, упорядочены так же, как при размещении."""
+    rnd = random.Random(seed)
+    coils = make_coils(rnd)
+    pool = CoilPool.from_coils('АВВГ_2х6', coils)
+
+    for quantity in range(0, 160, 7):
+        line = OrderLine('Заказ-999', 'Позиция-001', 'АВВГ_2х6', quantity)
+        expected_references = [coil.reference for coil in sorted(coils) if coil.can_allocate(line)]
+        assert [pool.references[index] for index in pool.feasible(quantity)] == expected_references
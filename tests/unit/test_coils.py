@@ -133,3 +133,23 @@ def test_orderlines_equivalence(not_an_orderline):
     result = (line_1 == line_2)
 
     assert result is False
+
+
+def test_orderlines_with_equal_ids_have_equal_hashes():
+    """Товарные позиции с одинаковыми order_id и line_item равны и имеют одинаковый хэш."""
+    line_1 = OrderLine('Заказ-005', 'Позиция-002', 'АВВГ_3х1,5', 70)
+    line_2 = OrderLine('Заказ-005', 'Позиция-002', 'АВВГ_2х6', 30)
+
+    assert line_1 == line_2
+    assert hash(line_1) == hash(line_2)
+    assert len({line_1, line_2}) == 1
+
+
+def test_orderlines_with_concatenation_equal_ids_are_different():
+    """Товарные позиции, у которых совпадает только конкатенация order_id и line_item, различаются."""
+    line_1 = OrderLine('Заказ-0051', 'Позиция-002', 'АВВГ_3х1,5', 70)
+    line_2 = OrderLine('Заказ-005', '1Позиция-002', 'АВВГ_3х1,5', 70)
+
+    assert line_1 != line_2
+    assert hash(line_1) != hash(line_2)
+    assert len({line_1, line_2}) == 2
@@ -0,0 +1,70 @@
+from allocation.domain import events
+from allocation.domain.domain_logic import Coil, OrderLine
+
+
+def test_allocating_adds_allocated_event():
+    """Размещение товарной позиции добавит в бухту событие Allocated."""
+    coil = Coil('Бухта-001', 'АВВГ_2х2,5', 150, 5, 1)
+    line = OrderLine('Заказ-001', 'Позиция-001', 'АВВГ_2х2,5', 40)
+
+    coil.allocate(line)
+
+    assert coil.events == [events.Allocated('Заказ-001', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-001')]
+
+
+def test_impossible_allocation_does_not_add_event():
+    """Если размещение товарной позиции невозможно, то событие не будет добавлено."""
+    coil = Coil('Бухта-002', 'АВВГ_2х2,5', 30, 5, 1)
+    line = OrderLine('Заказ-002', 'Позиция-001', 'АВВГ_2х2,5', 40)
+
+    coil.allocate(line)
+
+    assert coil.events == []
+
+
+def test_deallocating_adds_deallocated_event_only_for_allocated_line():
+    """Отмена размещения добавит событие Deallocated, только если товарная позиция была размещена в бухте."""
+    coil = Coil('Бухта-003', 'АВВГ_2х2,5', 150, 5, 1)
+    line = OrderLine('Заказ-003', 'Позиция-001', 'АВВГ_2х2,5', 40)
+    other_line = OrderLine('Заказ-003', 'Позиция-002', 'АВВГ_2х2,5', 20)
+    coil.allocate(line)
+
+    coil.deallocate(line)
+    coil.deallocate(other_line)
+
+    assert coil.events[1:] == [events.Deallocated('Заказ-003', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-003')]
+
+
+def test_event_survives_conversion_to_dict_and_back():
+    """Событие, преобразованное в словарь функцией to_dict, восстанавливается функцией from_dict."""
+    event = events.CoilQuantityChanged('Бухта-004', 'АВВГ_2х2,5', 120)
+
+    data = events.to_dict(event)
+
+    assert data == {'type': 'CoilQuantityChanged', 'reference': 'Бухта-004', 'product_id': 'АВВГ_2х2,5',
+                    'quantity': 120}
+    assert events.from_dict(data) == event
+
+
+def test_updating_adds_events_only_for_changed_attributes():
+    """Обновление бухты добавит CoilQuantityChanged при изменении количества материала и CoilUpdated."""
+    previous = Coil('Бухта-005', 'АВВГ_2х2,5', 150, 5, 1)
+    same_quantity = Coil('Бухта-005', 'АВВГ_2х2,5', 150, 10, 1)
+    same_attributes = Coil('Бухта-005', 'АВВГ_2х2,5', 150, 5, 1)
+
+    same_quantity.record_update(previous)
+    same_attributes.record_update(previous)
+
+    assert same_quantity.events == [events.CoilUpdated('Бухта-005', 'АВВГ_2х2,5', 150, 10, 1)]
+    assert same_attributes.events == []
+
+
+def test_deletion_adds_deallocated_events_and_coil_deleted():
+    """Удаление бухты добавит события Deallocated для размещенных товарных позиций и событие CoilDeleted."""
+    coil = Coil('Бухта-006', 'АВВГ_2х2,5', 150, 5, 1)
+    coil.allocate(OrderLine('Заказ-006', 'Позиция-001', 'АВВГ_2х2,5', 40))
+
+    coil.record_deletion()
+
+    assert coil.events[1:] == [events.Deallocated('Заказ-006', 'Позиция-001', 'АВВГ_2х2,5', 40, 'Бухта-006'),
+                               events.CoilDeleted('Бухта-006', 'АВВГ_2х2,5')]
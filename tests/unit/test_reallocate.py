@@ -1,4 +1,10 @@
-from allocation.domain.domain_logic import Coil
+import random
+from copy import deepcopy
+from itertools import combinations
+
+import pytest
+
+from allocation.domain.domain_logic import Coil, OrderLine, optimal_reallocation
 
 
 def test_can_reallocate_enough_orderlines(dict_of_orderlines):
@@ -47,3 +53,87 @@ def test_cannot_reallocate_two_orderlines(dict_of_orderlines):
     reallocated_lines_quantities = {line.quantity for line in reallocated_lines}
 
     assert reallocated_lines_quantities == quantities_of_set_0
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_reallocate_matches_allocating_to_a_copy_of_coil(seed):
+    """
+    Результат переразмещения совпадает с последовательным размещением товарных позиций,
+    упорядоченных по возрастанию количества материала, в копии новой бухты.
+    """
+    rnd = random.Random(seed)
+    coil = Coil('Бухта-001', 'АВВГ_3х1,5', 200, 15, 3)
+    coil.allocations = {OrderLine('Заказ-001', f'Позиция-{number:03}', rnd.choice(['АВВГ_3х1,5', 'АВВГ_2х6']),
+                                  rnd.randint(1, 40)) for number in range(rnd.randint(0, 12))}
+    new_coil = Coil('Бухта-001', 'АВВГ_3х1,5', rnd.randint(1, 200), rnd.randint(1, 20), rnd.randint(0, 6))
+    copied_coil = deepcopy(new_coil)
+    for line in sorted(coil.allocations, key=lambda x: x.quantity):
+        copied_coil.allocate(line)
+
+    reallocated_lines = coil.reallocate(new_coil)
+
+    assert reallocated_lines == copied_coil.allocations
+    assert new_coil.allocations == set()
+
+
+def test_optimized_reallocation_keeps_more_material():
+    """
+    Оптимальное переразмещение оставляет размещенными все товарные позиции,
+    если остаток материала после их размещения находится в пределах приемлемых потерь,
+    в то время как последовательный перебор оставляет размещенной только одну из них.
+    """
+    coil = Coil('Бухта-001', 'АВВГ_3х1,5', 60, 15, 3)
+    coil.allocations = {OrderLine('Заказ-001', f'Позиция-00{number}', 'АВВГ_3х1,5', 6) for number in range(3)}
+
+    new_coil = Coil('Бухта-001', 'АВВГ_3х1,5', 20, 10, 3)
+
+    assert len(coil.reallocate(new_coil)) == 1
+    assert coil.reallocate(new_coil, optimize=True) == coil.allocations
+
+
+def test_optimized_reallocation_falls_back_to_greedy_when_time_budget_exceeded(dict_of_orderlines):
+    """При превышении ограничения времени используется последовательный перебор товарных позиций."""
+    coil = Coil('Бухта-001', 'АВВГ_3х1,5', 60, 15, 3)
+    coil.allocations = dict_of_orderlines['set_0'] | dict_of_orderlines['set_1'] | dict_of_orderlines['set_2']
+    new_coil = Coil('Бухта-001', 'АВВГ_3х1,5', 60, 17, 2)
+
+    assert optimal_reallocation(coil.allocations, new_coil, time_budget=0) is None
+    assert coil.reallocate(new_coil, optimize=True, time_budget=0) == coil.reallocate(new_coil)
+
+
+def test_optimized_reallocation_falls_back_to_greedy_for_large_quantity():
+    """Для бухты с большим количеством материала битовые маски не создаются, используется последовательный перебор."""
+    coil = Coil('Бухта-002', 'АВВГ_3х1,5', 2 * 10 ** 9, 15, 3)
+    coil.allocations = {OrderLine(f'Заказ-{number:03}', 'Позиция-001', 'АВВГ_3х1,5', 10 ** 7 + number)
+                        for number in range(50)}
+    new_coil = Coil('Бухта-002', 'АВВГ_3х1,5', 2 * 10 ** 9 - 1, 15, 3)
+
+    assert optimal_reallocation(coil.allocations, new_coil) is None
+    assert coil.reallocate(new_coil, optimize=True) == coil.reallocate(new_coil)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_optimized_reallocation_is_best_subset(seed):
+    """
+    Оптимальное переразмещение совпадает по суммарному количеству материала с лучшим
+    из всех подмножеств товарных позиций и не уступает последовательному перебору.
+    """
+    rnd = random.Random(seed)
+    coil = Coil('Бухта-001', 'АВВГ_3х1,5', 200, 15, 3)
+    coil.allocations = {OrderLine('Заказ-001', f'Позиция-{number:03}', 'АВВГ_3х1,5', rnd.randint(1, 40))
+                        for number in range(rnd.randint(0, 10))}
+    new_coil = Coil('Бухта-001', 'АВВГ_3х1,5', rnd.randint(1, 150), rnd.randint(1, 20), rnd.randint(0, 6))
+
+    def is_acceptable(lines):
+        balance = new_coil.initial_quantity - sum(line.quantity for line in lines)
+        return balance >= new_coil.recommended_balance or new_coil.acceptable_loss >= balance >= 0
+
+    best_total = max(sum(line.quantity for line in subset)
+                     for size in range(len(coil.allocations) + 1)
+                     for subset in combinations(coil.allocations, size) if not subset or is_acceptable(subset))
+    optimal_lines = coil.reallocate(new_coil, optimize=True, time_budget=10)
+    optimal_total = sum(line.quantity for line in optimal_lines)
+
+    assert not optimal_lines or is_acceptable(optimal_lines)
+    assert optimal_total == best_total
+    assert optimal_total >= sum(line.quantity for line in coil.reallocate(new_coil))
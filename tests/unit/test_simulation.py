@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from allocation.domain.domain_logic import Coil, OrderLine, allocate_to_list_of_coils
+from allocation.domain.simulation import WarehouseSnapshot, simulate_allocation
+from allocation.exceptions import exceptions
+
+
+def make_snapshot(coils: list[Coil]) -> WarehouseSnapshot:
+    """Создает снимок состояния склада из списка бухт."""
+    snapshot = WarehouseSnapshot()
+    for coil in coils:
+        snapshot.add_coil(coil.reference, coil.product_id, coil.available_quantity,
+                          coil.recommended_balance, coil.acceptable_loss)
+        for line in coil.allocations:
+            snapshot.allocations[(line.order_id, line.line_item)] = coil.reference
+    return snapshot
+
+
+def test_simulation_does_not_change_coils():
+    """Моделирование размещения возвращает бухты и неразмещенные товарные позиции, не изменяя бухты."""
+    coil = Coil('Бухта-001', 'АВВГ_2х6', 50, 5, 1)
+    line_1 = OrderLine('Заказ-001', 'Позиция-001', 'АВВГ_2х6', 30)
+    line_2 = OrderLine('Заказ-001', 'Позиция-002', 'АВВГ_2х6', 30)
+
+    result = simulate_allocation([line_1, line_2], make_snapshot([coil]))
+
+    assert result.allocated == {line_1: 'Бухта-001'}
+    assert result.out_of_stock == [line_2]
+    assert coil.available_quantity == 50
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_simulation_matches_allocate_to_list_of_coils(seed):
+    """Результат моделирования совпадает с последовательным размещением товарных позиций."""
+    rnd = random.Random(seed)
+    coils = []
+    for number in range(rnd.randint(1, 15)):
+        coil = Coil(f'Бухта-{number:03}', rnd.choice(['АВВГ_2х6', 'АВВГ_3х1,5']), rnd.randint(20, 150),
+                    rnd.randint(1, 15), rnd.randint(0, 5))
+        coil.allocate(OrderLine(f'Заказ-{number:03}', 'Позиция-000', coil.product_id, rnd.randint(1, 30)))
+        coils.append(coil)
+    lines = [OrderLine(f'Заказ-{rnd.randint(0, 20):03}', f'Позиция-{rnd.randint(0, 3):03}',
+                       rnd.choice(['АВВГ_2х6', 'АВВГ_3х1,5', 'АВВГ_4х16']), rnd.randint(1, 60))
+             for _ in range(40)]
+
+    result = simulate_allocation(lines, make_snapshot(coils))
+
+    for line in lines:
+        try:
+            expected_reference = allocate_to_list_of_coils(line, coils).reference
+        except exceptions.OutOfStock:
+            assert line in result.out_of_stock
+        else:
+            assert result.allocated[line] == expected_reference